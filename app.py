@@ -1,8 +1,11 @@
 # app.py
 
+import gc
+
 from flask import Flask, render_template
-from config import Config
+from config import get_config
 
+from database import configure_engine, dispose_engines
 from models import db
 from models.product import Product
 
@@ -11,13 +14,36 @@ from routes.products import products_bp
 from routes.orders import orders_bp
 from routes.admin import admin_bp
 
+from utils.assets import assets
+from utils.auth import HashingBusy
+from utils.cache import page_cache, cached_page
+from utils.metrics import metrics
+from utils.query_budget import init_query_budget
+from utils.replicas import replica_reads
+
 
-def create_app():
+def create_app(config=None):
     app = Flask(__name__)
-    app.config.from_object(Config)
+    app.config.from_object(config or get_config())
 
     # --- Init DB ---
     db.init_app(app)
+    with app.app_context():
+        for engine in db.engines.values():     # primary + read replicas
+            configure_engine(engine, app.config.get("SQLITE_PRAGMAS"))
+
+    # --- Request / SQL / template timing, /metrics (registered first so
+    #     its timer wraps every other hook) ---
+    metrics.init_app(app)
+
+    # --- Fingerprinted static URLs + long-lived cache headers ---
+    assets.init_app(app)
+
+    # --- Page cache (anonymous catalog pages) ---
+    page_cache.init_app(app)
+
+    # --- Per-request SQL statement budget (N+1 guard) ---
+    init_query_budget(app)
 
     # --- Register Blueprints ---
     app.register_blueprint(users_bp)          # /login, /register, /dashboard, etc.
@@ -29,6 +55,8 @@ def create_app():
     # HOME PAGE  (Trending products)
     # ---------------------------
     @app.route("/")
+    @cached_page
+    @replica_reads
     def home():
         trending_products = (
             Product.query
@@ -54,11 +82,59 @@ def create_app():
     def server_error(e):
         return render_template("error.html", message="Something went wrong"), 500
 
+    @app.errorhandler(HashingBusy)
+    def hashing_busy(e):
+        # login storm: shed load instead of queueing behind the hash pool
+        return (
+            render_template("error.html", message="Too many sign-ins right now, please retry in a moment"),
+            503,
+            {"Retry-After": "2"},
+        )
+
     return app
 
 
-# Global app instance so create_db.py can do: from app import app
-app = create_app()
+# -----------------------------------------------------------
+# STARTUP
+# -----------------------------------------------------------
+def warm_up(app):
+    """
+    Load what workers would otherwise load on their first requests: the
+    recommender model (numpy + mmapped arrays), the configured ORM mappers
+    and every compiled template.
+    """
+    from sqlalchemy.orm import configure_mappers
+
+    from ml.recommender import recommender
+
+    recommender.load()
+    configure_mappers()
+    for name in app.jinja_env.list_templates():
+        app.jinja_env.get_template(name)
+
+
+def preload():
+    """
+    App for a preloading master (gunicorn --preload "app:preload()"):
+    built and warmed once, then shared copy-on-write by the forked workers.
+    Workers drop the master's DB connections after fork (database.dispose_engines).
+    """
+    app = create_app()
+    warm_up(app)
+    dispose_engines()
+    # keep the collector from touching (and so copying) the shared objects
+    gc.freeze()
+    return app
+
+
+def __getattr__(name):
+    # Global `app`, built on first access: `from app import app` and
+    # gunicorn "app:app" get one, importing create_app alone builds none
+    if name == "app":
+        globals()["app"] = instance = create_app()
+        return instance
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 if __name__ == "__main__":
-    app.run(debug=True)
+    create_app().run(debug=True)
@@ -0,0 +1,123 @@
+# benchmarks/asset_benchmark.py
+#
+# HTTP requests per page view with a simulated browser cache, without
+# and with fingerprinted assets (build_assets.py / utils/assets.py).
+# The browser model: a cached response still inside max-age is used
+# without a request; anything else is revalidated with If-None-Match
+# (304) or fetched. Runs on a scratch copy of static/.
+#
+#   python -m benchmarks.asset_benchmark --views 20
+
+import argparse
+import os
+import re
+import shutil
+import tempfile
+import time
+
+from benchmarks.common import use_scratch_database, product_rows
+
+ASSET = re.compile(r'(?:src|href)="(/static/[^"]+)"')
+
+
+class Browser:
+    def __init__(self, client):
+        self.client = client
+        self.cache = {}                 # url → (etag, fresh_until)
+        self.requests = 0
+        self.not_modified = 0
+        self.bytes = 0
+
+    def get(self, url):
+        etag, fresh_until = self.cache.get(url, (None, 0))
+        if time.time() < fresh_until:
+            return None
+
+        headers = {"If-None-Match": etag} if etag else {}
+        response = self.client.get(url, headers=headers)
+        self.requests += 1
+        self.bytes += len(response.data)
+        if response.status_code == 304:
+            self.not_modified += 1
+
+        max_age = response.cache_control.max_age if not response.cache_control.no_cache else None
+        self.cache[url] = (
+            response.headers.get("ETag", etag),
+            time.time() + max_age if max_age else 0,
+        )
+        return response
+
+    def view(self, page):
+        html = self.get(page).get_data(as_text=True)
+        for asset in ASSET.findall(html):
+            self.get(asset)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--views", type=int, default=20, help="repeat page views after the first")
+    args = parser.parse_args()
+
+    use_scratch_database("assets")
+
+    from app import app
+    from migrations import upgrade
+    from models import db, Product
+    from utils.assets import assets, build_manifest, DIST_DIR, MANIFEST_NAME
+    from utils.cache import page_cache
+
+    # scratch static folder with a few write-once uploads
+    static = os.path.join(tempfile.gettempdir(), "bench_static")
+    shutil.rmtree(static, ignore_errors=True)
+    shutil.copytree(app.static_folder, static, ignore=shutil.ignore_patterns("uploads", "dist"))
+    os.makedirs(os.path.join(static, "uploads", "images"))
+    app.static_folder = static
+
+    with app.app_context():
+        upgrade(verbose=False)
+        rows = list(product_rows(40))
+        for i, row in enumerate(rows):
+            name = f"{i:032x}.jpg"
+            with open(os.path.join(static, "uploads", "images", name), "wb") as f:
+                f.write(os.urandom(20_000))
+            row.update(image_filename=name, is_active=True)
+        db.session.execute(Product.__table__.insert(), rows)
+        db.session.commit()
+
+    pages = ["/", "/products", "/product/1", "/product/2"]
+
+    def run(label):
+        browser = Browser(app.test_client())
+        for page in pages:
+            browser.view(page)
+        first = browser.requests
+
+        browser.requests = browser.not_modified = browser.bytes = 0
+        for i in range(args.views):
+            browser.view(pages[i % len(pages)])
+
+        print(
+            f"{label:<22} first visit {first:>3} requests   "
+            f"repeat views {browser.requests / args.views:5.2f} requests/view "
+            f"({browser.not_modified / args.views:.2f} × 304, "
+            f"{browser.bytes / args.views / 1024:,.1f} KB/view)"
+        )
+        return browser.requests / args.views
+
+    page_cache.enabled = False       # count what a render emits
+
+    assets.enabled = False
+    before = run("plain /static URLs")
+
+    build_manifest(static)
+    assets.load(os.path.join(static, DIST_DIR, MANIFEST_NAME))
+    assets.enabled = True
+    after = run("fingerprinted assets")
+
+    print(f"  {'✅' if after <= 1.0 else '✖'} repeat views: {before:.2f} → {after:.2f} requests (HTML only)")
+    if after > 1.0:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+# benchmarks/cache_benchmark.py
+#
+# Anonymous catalog throughput with the page cache off vs on, then
+# invalidation across worker processes: two PageCache instances stand in
+# for two gunicorn workers.
+#
+#   python -m benchmarks.cache_benchmark --products 20000 --requests 2000 --threads 4
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.common import use_scratch_database, product_rows, summarize, CATEGORIES
+
+
+def run_load(app, urls, threads: int):
+    """Fire every url once across `threads` test clients. Returns (req/s, latencies)."""
+    latencies = []
+
+    def worker(chunk):
+        client = app.test_client()
+        local = []
+        for url in chunk:
+            start = time.perf_counter()
+            client.get(url)
+            local.append((time.perf_counter() - start) * 1000)
+        return local
+
+    chunks = [urls[i::threads] for i in range(threads)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(threads) as pool:
+        for result in pool.map(worker, chunks):
+            latencies.extend(result)
+    elapsed = time.perf_counter() - start
+
+    return len(urls) / elapsed, latencies
+
+
+def check_workers() -> bool:
+    """A write in worker A must invalidate worker B; unshared → cache refuses to run."""
+    from flask import Flask
+    from utils.cache import PageCache
+
+    path = os.path.join(tempfile.gettempdir(), "bench_page_cache.db")
+    if os.path.exists(path):
+        os.remove(path)
+
+    def worker(**config):
+        flask_app = Flask(__name__)
+        flask_app.config.update(PAGE_CACHE_ENABLED=True, WEB_CONCURRENCY=2, **config)
+        cache = PageCache()
+        cache.init_app(flask_app)
+        return cache
+
+    a, b = worker(PAGE_CACHE_SHARED_PATH=path), worker(PAGE_CACHE_SHARED_PATH=path)
+    before = b.generation()
+    a.invalidate()
+    shared_ok = b.generation() != before and a.enabled and b.enabled
+    unshared = worker(PAGE_CACHE_SHARED_PATH=None)
+
+    # preload_app: the backend is built in the master, workers are forked
+    master = a.shared._conn()
+    read, write = os.pipe()
+    if os.fork() == 0:
+        forked_ok = a.shared._conn() is not master and a.shared.incr("fork") == 1
+        os.write(write, b"1" if forked_ok else b"0")
+        os._exit(0)
+    os.wait()
+    fork_ok = os.read(read, 1) == b"1"
+
+    print(f"\n  {'✅' if shared_ok else '✖'} shared backend: a write in worker A invalidates worker B")
+    print(f"  {'✅' if fork_ok else '✖'} a forked worker opens its own SQLite connection")
+    print(f"  {'✅' if not unshared.enabled else '✖'} 2 workers, no shared backend → page cache off")
+    return shared_ok and fork_ok and not unshared.enabled
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--products", type=int, default=20_000)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=4)
+    args = parser.parse_args()
+
+    use_scratch_database("cache")
+
+    from app import app
+    from migrations import upgrade
+    from models import db
+    from models.product import Product
+    from utils.cache import page_cache
+
+    with app.app_context():
+        upgrade(verbose=False)
+        db.session.execute(Product.__table__.insert(), list(product_rows(args.products)))
+        db.session.commit()
+
+    # hot-set traffic: a few listing pages + a popular slice of product pages
+    rng = random.Random(11)
+    pages = ["/", "/products", "/products?sort=price_low"]
+    pages += [f"/products?category={c}" for c in CATEGORIES]
+    pages += [f"/product/{rng.randint(1, 500)}" for _ in range(100)]
+    urls = [rng.choice(pages) for _ in range(args.requests)]
+
+    for enabled in (False, True):
+        page_cache.enabled = enabled
+        page_cache.invalidate()
+        page_cache.hits.clear()
+        page_cache.misses.clear()
+
+        rps, latencies = run_load(app, urls, args.threads)
+        label = "cache ON " if enabled else "cache OFF"
+        summarize(f"{label} ({rps:,.0f} req/s)", latencies)
+
+        if enabled:
+            hits = sum(page_cache.hits.values())
+            misses = sum(page_cache.misses.values())
+            print(f"           hit ratio {hits / max(hits + misses, 1):.1%} ({hits} hits / {misses} misses)")
+
+    if not check_workers():
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# benchmarks/checkout_benchmark.py
+#
+# Buying a B-item basket: B single-product place_order() calls (one
+# transaction + commit each, the old Buy Now path) vs one checkout() of B
+# lines (one transaction). Reports latency and SQL statements per basket.
+#
+#   python -m benchmarks.checkout_benchmark --basket 20 --baskets 50
+
+import argparse
+import random
+
+from benchmarks.common import use_scratch_database, product_rows, time_calls, summarize
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--basket", type=int, default=20)
+    parser.add_argument("--baskets", type=int, default=50)
+    parser.add_argument("--products", type=int, default=2000)
+    args = parser.parse_args()
+
+    use_scratch_database("checkout")
+
+    from sqlalchemy import event
+    from app import app
+    from migrations import upgrade
+    from models import db, User, Product, Order
+    from utils import inventory
+
+    with app.app_context():
+        upgrade(verbose=False)
+        seller = User(name="Seller", email="seller@bench.local", role="seller")
+        buyer = User(name="Buyer", email="buyer@bench.local", role="customer")
+        seller.set_password("bench123")
+        buyer.set_password("bench123")
+        db.session.add_all([seller, buyer])
+        db.session.flush()
+
+        rows = list(product_rows(args.products))
+        for row in rows:
+            row.update(seller_id=seller.id, stock=10_000, is_active=True)
+        db.session.execute(Product.__table__.insert(), rows)
+        db.session.commit()
+        buyer_id = buyer.id
+
+        statements = [0]
+
+        @event.listens_for(db.engine, "before_cursor_execute")
+        def count(conn, cursor, statement, parameters, context, executemany):
+            statements[0] += 1
+
+        rng = random.Random(3)
+        baskets = [
+            {pid: rng.randint(1, 3) for pid in rng.sample(range(1, args.products + 1), args.basket)}
+            for _ in range(args.baskets)
+        ]
+
+        def one_by_one(basket):
+            for pid, quantity in basket.items():
+                inventory.place_order(buyer_id, pid, quantity)
+
+        def batched(basket):
+            inventory.checkout(buyer_id, basket)
+
+        for label, fn in ((f"{args.basket} × place_order", one_by_one), (f"checkout of {args.basket}", batched)):
+            statements[0] = 0
+            latencies = time_calls(fn, [(b,) for b in baskets])
+            summarize(label, latencies)
+            print(f"           {statements[0] / args.baskets:.1f} statements per basket")
+
+        expected = 2 * sum(sum(b.values()) for b in baskets)
+        ordered = db.session.query(db.func.sum(Order.quantity)).scalar()
+        assert ordered == expected, (ordered, expected)
+        print("  ✅ both paths ordered every unit")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+# benchmarks/common.py
+#
+# Shared helpers for the benchmark scripts. Every benchmark runs against a
+# scratch SQLite file so it never touches the real ecommerce.db.
+
+import os
+import random
+import tempfile
+import time
+
+# vocabulary shared with the bulk generator
+from utils.datagen import WORDS, brand_names
+
+
+def use_scratch_database(name: str) -> str:
+    """
+    Point the app at a fresh scratch DB. Must be called BEFORE importing
+    `app` / `config`, because Config reads DATABASE_URL at import time.
+    """
+    path = os.path.join(tempfile.gettempdir(), f"bench_{name}.db")
+    if os.path.exists(path):
+        os.remove(path)
+
+    os.environ["DATABASE_URL"] = "sqlite:///" + path
+    return path
+
+
+def percentile(values, pct: float) -> float:
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def time_calls(fn, args_list):
+    """Call fn(*args) for every args tuple, return latencies in ms."""
+    latencies = []
+    for args in args_list:
+        start = time.perf_counter()
+        fn(*args)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def summarize(label: str, latencies) -> dict:
+    stats = {
+        "label": label,
+        "n": len(latencies),
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+        "mean_ms": round(sum(latencies) / max(len(latencies), 1), 3),
+    }
+    print(
+        f"{label:<28} n={stats['n']:<6} "
+        f"p50={stats['p50_ms']:>9.3f}ms  p99={stats['p99_ms']:>9.3f}ms  "
+        f"mean={stats['mean_ms']:>9.3f}ms"
+    )
+    return stats
+
+
+# -----------------------------------------------------------
+# SYNTHETIC CATALOG
+# -----------------------------------------------------------
+CATEGORIES = ["Mobiles", "Laptops", "Clothing", "Electronics", "Shoes", "Home"]
+
+BRANDS = brand_names()
+
+
+def product_rows(count: int, seed: int = 42):
+    """Yield dicts ready for an executemany insert into `products`."""
+    from datetime import datetime, timedelta
+
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+
+    for i in range(count):
+        name = f"{rng.choice(BRANDS)} " + " ".join(rng.choice(WORDS) for _ in range(2))
+        yield {
+            "name": name.title(),
+            "category": rng.choice(CATEGORIES),
+            "price": round(rng.uniform(99, 99999), 2),
+            "stock": rng.randint(0, 100),
+            "description": " ".join(rng.choice(WORDS) for _ in range(12)),
+            "image_filename": None,
+            "is_active": rng.random() > 0.05,
+            "created_at": now - timedelta(minutes=i),
+            "seller_id": None,
+        }
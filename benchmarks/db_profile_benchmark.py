@@ -0,0 +1,127 @@
+# benchmarks/db_profile_benchmark.py
+#
+# Mixed read/write throughput per engine profile (config.PROFILES), plus an
+# untuned "legacy" profile (no engine options, no PRAGMAs, no write gate —
+# the old rollback-journal behaviour). Each profile gets a fresh scratch DB;
+# reader threads run catalog queries while writer threads place orders
+# through utils/inventory for a fixed duration.
+#
+#   python -m benchmarks.db_profile_benchmark --readers 4 --writers 2 --seconds 5
+
+import argparse
+import multiprocessing
+import random
+import time
+
+from benchmarks.common import use_scratch_database, product_rows, percentile
+
+
+def run_profile(name, config, args):
+    from app import create_app
+    from migrations import upgrade
+    from models import db, User, Product
+    from utils import inventory
+
+    class Profile(config):
+        SQLALCHEMY_DATABASE_URI = "sqlite:///" + use_scratch_database(f"profile_{name}")
+        PAGE_CACHE_ENABLED = False
+
+    app = create_app(Profile)
+
+    with app.app_context():
+        upgrade(verbose=False)
+        buyer = User(name="Buyer", email="buyer@bench.local", role="customer")
+        buyer.set_password("bench123")
+        db.session.add(buyer)
+        rows = list(product_rows(args.products))
+        for row in rows:
+            row.update(stock=1_000_000, is_active=True)
+        db.session.execute(Product.__table__.insert(), rows)
+        db.session.commit()
+        buyer_id = buyer.id
+        journal = db.session.execute(db.text("PRAGMA journal_mode")).scalar()
+        db.engine.dispose()   # no inherited connections in the children
+
+    # separate processes, like gunicorn workers: SQLite locking between
+    # processes is what the profiles change (threads would mostly measure
+    # the GIL). Each child builds its own app / engine after the fork.
+    ctx = multiprocessing.get_context("fork")
+    queue = ctx.Queue()
+    deadline = time.time() + 1 + args.seconds
+
+    def worker(kind, seed):
+        child = create_app(Profile)
+        rng = random.Random(seed)
+        latencies, errors = [], 0
+
+        with child.app_context():
+            while time.time() < deadline - args.seconds:
+                time.sleep(0.001)   # line up the start
+
+            while time.time() < deadline:
+                start = time.perf_counter()
+                try:
+                    if kind == "reads":
+                        (
+                            Product.query.filter_by(is_active=True)
+                            .order_by(Product.created_at.desc())
+                            .limit(20)
+                            .all()
+                        )
+                        db.session.get(Product, rng.randint(1, args.products))
+                        db.session.rollback()
+                    else:
+                        inventory.place_order(buyer_id, rng.randint(1, args.products), 1)
+                except Exception:
+                    db.session.rollback()
+                    errors += 1
+                latencies.append((time.perf_counter() - start) * 1000)
+
+        queue.put((kind, latencies, errors))
+
+    processes = [ctx.Process(target=worker, args=("reads", i)) for i in range(args.readers)]
+    processes += [ctx.Process(target=worker, args=("writes", 100 + i)) for i in range(args.writers)]
+    for p in processes:
+        p.start()
+
+    results = {"reads": [], "writes": [], "errors": [0]}
+    for _ in processes:
+        kind, latencies, errors = queue.get()
+        results[kind].extend(latencies)
+        results["errors"][0] += errors
+    for p in processes:
+        p.join()
+
+    reads, writes = results["reads"], results["writes"]
+    print(
+        f"{name:<12} journal={journal:<7} "
+        f"reads {len(reads) / args.seconds:>7,.0f}/s (p99 {percentile(reads, 99):6.1f}ms)  "
+        f"writes {len(writes) / args.seconds:>6,.0f}/s (p99 {percentile(writes, 99):6.1f}ms)  "
+        f"errors {results['errors'][0]}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--products", type=int, default=5000)
+    args = parser.parse_args()
+
+    use_scratch_database("profile_import")
+
+    from config import Config, PROFILES
+
+    class Legacy(Config):
+        SQLALCHEMY_ENGINE_OPTIONS = {}
+        SQLITE_PRAGMAS = {}
+        SQLITE_WRITE_GATE = False
+
+    profiles = {"legacy": Legacy, **PROFILES}
+    for name, config in profiles.items():
+        run_profile(name, config, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+# benchmarks/image_benchmark.py
+#
+# Product image pipeline (utils/image_handler.py):
+#   - add-product request latency with variants made inline vs queued
+#     for the job worker (the request only streams + hashes the upload)
+#   - dedupe: N uploads of the same photo → one stored original
+#   - bytes per listing-grid image: original vs the 400px WebP variant
+#   - EXIF is gone from the variants
+#   - a corrupt upload fails its job (retried, error kept); a deleted one
+#     is simply done
+# Uploads go to a scratch folder, never static/uploads.
+#
+#   python -m benchmarks.image_benchmark --uploads 20 --size 3000x2000
+
+import argparse
+import io
+import os
+import random
+import shutil
+import tempfile
+import time
+
+from benchmarks.common import use_scratch_database, summarize
+
+
+def photo(width, height, seed):
+    """A noisy JPEG with EXIF, roughly the size of a phone photo."""
+    from PIL import Image
+
+    rng = random.Random(seed)
+    img = Image.effect_noise((width // 4, height // 4), 60).convert("RGB").resize((width, height))
+    img.paste((rng.randrange(256), rng.randrange(256), rng.randrange(256)), (0, 0, width // 3, height // 3))
+
+    exif = Image.Exif()
+    exif[0x010F] = "BenchCam"          # Make
+    exif[0x8298] = "secret owner"      # Copyright
+    out = io.BytesIO()
+    img.save(out, "JPEG", quality=90, exif=exif)
+    return out.getvalue()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--uploads", type=int, default=20)
+    parser.add_argument("--size", default="3000x2000")
+    args = parser.parse_args()
+    width, height = (int(v) for v in args.size.split("x"))
+
+    use_scratch_database("images")
+
+    from PIL import Image
+    from app import app
+    from migrations import upgrade
+    from models import db, User, Product
+    from utils import image_handler
+    from utils.jobs import Worker, enqueue
+    from models.job import Job
+
+    folder = os.path.join(tempfile.gettempdir(), "bench_uploads")
+    shutil.rmtree(folder, ignore_errors=True)
+    image_handler.UPLOAD_FOLDER = folder
+
+    with app.app_context():
+        upgrade(verbose=False)
+        seller = User(name="Seller", email="seller@bench.local", role="seller")
+        seller.set_password("bench123")
+        db.session.add(seller)
+        db.session.commit()
+        seller_id = seller.id
+
+    client = app.test_client()
+    with client.session_transaction() as s:
+        s.update(logged_in=True, user_id=seller_id, role="seller")
+
+    photos = [photo(width, height, seed) for seed in range(args.uploads)]
+
+    def upload(data, name):
+        start = time.perf_counter()
+        client.post("/seller/products/add", data={
+            "name": name, "category": "Bench", "price": "100", "stock": "5",
+            "image": (io.BytesIO(data), "photo.jpg"),
+        }, content_type="multipart/form-data")
+        return (time.perf_counter() - start) * 1000
+
+    # ---------- request latency ----------
+    worker = Worker(app)
+
+    def drain():
+        start = time.perf_counter()
+        worker.run_until_empty()
+        return (time.perf_counter() - start) * 1000
+
+    # variants made before the response (what the route did originally)
+    summarize("inline variants", [upload(p, f"inline {i}") + drain() for i, p in enumerate(photos)])
+
+    shutil.rmtree(folder)
+    latencies = [upload(p, f"async {i}") for i, p in enumerate(photos)]
+    summarize("queued job", latencies)
+    print(f"           worker drained the queue in {drain():.0f}ms after the last upload")
+
+    # ---------- dedupe ----------
+    originals = lambda: [f for f in os.listdir(folder) if f.endswith(".jpg")]
+    before = len(originals())
+    for i in range(5):
+        upload(photos[0], f"duplicate {i}")
+    print(f"5 re-uploads of one photo → {len(originals()) - before} new stored originals")
+
+    # ---------- variants ----------
+    with app.app_context():
+        products = Product.query.filter(Product.name.like("async%")).all()
+        missing = [p.id for p in products if not p.image_variants]
+        original = sum(os.path.getsize(os.path.join(folder, p.image_filename)) for p in products)
+        grid = sum(os.path.getsize(os.path.join(folder, p.image_for(400))) for p in products)
+        with Image.open(os.path.join(folder, products[0].image_for(400))) as variant:
+            has_exif = bool(variant.getexif())
+
+    print(f"listing grid bytes per image: original {original / len(products) / 1024:,.0f} KB "
+          f"→ 400px WebP {grid / len(products) / 1024:,.1f} KB")
+
+    ok = not missing and not has_exif and len(originals()) == before
+    print(f"  {'✅' if ok else '✖'} variants for every product: {not missing}, "
+          f"EXIF stripped: {not has_exif}, duplicates shared: {len(originals()) == before}")
+
+    # ---------- failures ----------
+    with open(os.path.join(folder, "corrupt.jpg"), "wb") as f:
+        f.write(b"not a jpeg")
+    app.config["JOB_RETRY_BACKOFF"] = 0
+    with app.app_context():
+        enqueue("images.process", {"filename": "corrupt.jpg"}, max_attempts=2)
+        enqueue("images.process", {"filename": "deleted.jpg"})
+        db.session.commit()
+    app.logger.disabled = True          # the expected tracebacks
+    drain()
+    app.logger.disabled = False
+    with app.app_context():
+        jobs = {
+            job.payload["filename"]: job
+            for job in Job.query.filter_by(name="images.process")
+            if job.payload["filename"] in ("corrupt.jpg", "deleted.jpg")
+        }
+        corrupt, deleted = jobs["corrupt.jpg"], jobs["deleted.jpg"]
+        failures_ok = (
+            corrupt.status == "failed" and corrupt.attempts == 2 and bool(corrupt.last_error)
+            and deleted.status == "done"
+        )
+        print(f"  {'✅' if failures_ok else '✖'} corrupt upload → {corrupt.status} after "
+              f"{corrupt.attempts} attempts ({(corrupt.last_error or '').splitlines()[-1][:60]}), "
+              f"deleted file → {deleted.status}")
+    ok = ok and failures_ok
+    if not ok:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
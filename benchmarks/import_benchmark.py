@@ -0,0 +1,173 @@
+# benchmarks/import_benchmark.py
+#
+# Seller bulk import throughput (utils/catalog_import.py) vs adding the
+# same products one at a time the way the add-product form does.
+#
+#   1. per-row ORM baseline: Product + index_product + refresh_categories
+#      + commit per row, on a --baseline sample
+#   2. CSV import of --rows new products (streamed from a temp file)
+#   3. NDJSON re-import of the same skus with new prices → all updates
+#   4. the same file through the /seller/products/import form, with a few
+#      broken rows that must come back as per-row errors
+# then checks counts, search index and category facets.
+#
+#   python -m benchmarks.import_benchmark --rows 100000
+
+import argparse
+import csv
+import io
+import json
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.common import use_scratch_database, product_rows
+
+
+def write_feed(path: str, fmt: str, count: int, price_factor: float = 1.0) -> None:
+    fields = ("sku", "name", "category", "price", "stock", "description")
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fields, extrasaction="ignore") if fmt == "csv" else None
+        if writer:
+            writer.writeheader()
+        for i, row in enumerate(product_rows(count, seed=11)):
+            row.update(sku=f"SKU-{i:07d}", price=round(row["price"] * price_factor, 2))
+            if writer:
+                writer.writerow(row)
+            else:
+                f.write(json.dumps({k: row[k] for k in fields}) + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--baseline", type=int, default=1_000, help="rows for the per-row baseline")
+    parser.add_argument("--memory", action="store_true", help="report peak Python memory (slower)")
+    args = parser.parse_args()
+
+    use_scratch_database("import")
+    os.environ["SLOW_QUERY_MS"] = "100000"       # every batch is a "slow" statement
+
+    from app import create_app
+    from migrations import upgrade
+    from models import db, User, Product, Category
+    from utils.catalog_import import import_catalog
+    from utils.categories import refresh_categories
+    from utils.search import apply_search, index_product, rebuild_search_index
+
+    app = create_app()
+    workdir = tempfile.mkdtemp(prefix="bench_import_")
+    csv_path = os.path.join(workdir, "feed.csv")
+    ndjson_path = os.path.join(workdir, "feed.ndjson")
+    write_feed(csv_path, "csv", args.rows)
+    write_feed(ndjson_path, "ndjson", args.rows, price_factor=0.9)
+    print(f"📄 Feed: {args.rows} rows, {os.path.getsize(csv_path) / 1e6:.1f} MB CSV")
+
+    with app.app_context():
+        upgrade(verbose=False)
+        rebuild_search_index()
+        sellers = [User(name=f"Seller {i}", email=f"seller{i}@bench.local", role="seller") for i in range(3)]
+        for seller in sellers:
+            seller.set_password("bench123")
+        db.session.add_all(sellers)
+        db.session.commit()
+        baseline_seller, seller, web_seller = (s.id for s in sellers)
+
+        # ---------- 1. one product per transaction ----------
+        started = time.perf_counter()
+        for row in product_rows(args.baseline, seed=11):
+            product = Product(name=row["name"], category=row["category"], price=row["price"],
+                              stock=row["stock"], description=row["description"], seller_id=baseline_seller)
+            db.session.add(product)
+            db.session.flush()
+            index_product(product)
+            refresh_categories(product.category)
+            db.session.commit()
+        per_row = args.baseline / (time.perf_counter() - started)
+        print(f"🐢 per-row ORM inserts:   {per_row:>10,.0f} rows/s  ({args.baseline} rows)")
+
+        # ---------- 2. + 3. streamed bulk import ----------
+        runs = {}
+        for label, path, fmt in (("csv insert", csv_path, "csv"), ("ndjson upsert", ndjson_path, "ndjson")):
+            if args.memory:
+                tracemalloc.start()
+            with open(path, "rb") as stream:
+                result = import_catalog(stream, fmt, seller)
+            memory = ""
+            if args.memory:
+                memory = f", peak {tracemalloc.get_traced_memory()[1] / 1e6:.1f} MB"
+                tracemalloc.stop()
+            runs[label] = result
+            print(f"🚀 {label + ':':<22} {result.rows_per_sec:>10,.0f} rows/s  "
+                  f"(+{result.inserted} ~{result.updated} ✖{result.failed}{memory})")
+
+        ok = True
+
+        def check(condition, message):
+            nonlocal ok
+            print(f"  {'✅' if condition else '✖'} {message}")
+            ok = ok and condition
+
+        print()
+        check(runs["csv insert"].inserted == args.rows and runs["csv insert"].failed == 0, "first import inserted every row")
+        check(runs["ndjson upsert"].updated == args.rows and runs["ndjson upsert"].inserted == 0, "re-import updated every row")
+        check(Product.query.filter_by(seller_id=seller).count() == args.rows, "no duplicate products")
+
+        sample = Product.query.filter_by(seller_id=seller, sku="SKU-0000000").one()
+        first = next(product_rows(1, seed=11))
+        check(abs(sample.price - round(first["price"] * 0.9, 2)) < 0.01, "updated price stored")
+
+        query, rank = apply_search(Product.query.filter_by(is_active=True), sample.name)
+        hits = query.order_by(rank.asc(), Product.id.asc()).limit(24).all()
+        entries = db.session.execute(
+            db.text("SELECT COUNT(*) FROM products_fts WHERE rowid = :id"), {"id": sample.id}
+        ).scalar()
+        check(sample in hits and entries == 1, "search finds the product, indexed once")
+
+        indexed = db.session.execute(db.text("SELECT COUNT(*) FROM products_fts")).scalar()
+        active = Product.query.filter_by(is_active=True).count()
+        check(indexed == active, f"search index rows = active products ({indexed})")
+
+        facets = {c.name: c.active_count for c in Category.query.all()}
+        actual = dict(
+            db.session.query(Product.category, db.func.count())
+            .filter_by(is_active=True).group_by(Product.category).all()
+        )
+        check(facets == actual, "category facets match the products table")
+
+    # ---------- 4. web form, with broken rows ----------
+    body = io.BytesIO()
+    with open(csv_path, "rb") as f:
+        lines = f.read().splitlines(keepends=True)[: min(args.rows, 20_000) + 1]
+    rng = random.Random(3)
+    broken = sorted(rng.sample(range(2, len(lines)), 5))
+    for i in broken:
+        lines[i] = b"BAD-" + lines[i].split(b",", 1)[0] + b",,nowhere,free,-1,\r\n"
+    body.write(b"".join(lines))
+    body.seek(0)
+
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session.update(user_id=web_seller, role="seller")
+    started = time.perf_counter()
+    response = client.post(
+        "/seller/products/import",
+        data={"file": (body, "feed.csv"), "format": ""},
+        content_type="multipart/form-data",
+    )
+    elapsed = time.perf_counter() - started
+    html = response.get_data(as_text=True)
+    print(f"\n🌐 form upload: {len(lines) - 1} rows in {elapsed:.2f}s ({(len(lines) - 1) / elapsed:,.0f} rows/s)")
+    check(response.status_code == 200, "form upload → 200")
+    check(f"{len(lines) - 1 - len(broken)} added" in html and "5 skipped" in html, "result counts shown")
+    check(all(f"<td>{i + 1}</td>" in html for i in broken), "broken rows reported by line number")
+
+    print(f"\n  bulk import is {runs['csv insert'].rows_per_sec / per_row:,.0f}× the per-row path")
+    if not ok:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+# benchmarks/incremental_reco_benchmark.py
+#
+# Incremental recommender updates (ml/incremental_reco.py) vs a full
+# retrain, and their equivalence.
+#
+# Scratch DB, model / state / export dirs in a temp folder — nothing is
+# written under ml/. Orders arrive in --batches batches (new users, new
+# products, repeat purchases); after each one the incremental run is
+# compared, array for array, with build_neighbor_table() on a fresh
+# ml.data_preparation export of the whole orders table. Exits 1 on any
+# mismatch.
+#
+#   python -m benchmarks.incremental_reco_benchmark --orders 50000 --batches 5
+
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from benchmarks.common import use_scratch_database
+
+ML_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "ml")
+
+
+def ml_snapshot() -> dict:
+    """path → (size, mtime) of everything under ml/ except bytecode."""
+    files = {}
+    for root, dirs, names in os.walk(ML_DIR):
+        dirs[:] = [d for d in dirs if d != "__pycache__"]
+        for name in names:
+            stat = os.stat(os.path.join(root, name))
+            files[os.path.join(root, name)] = (stat.st_size, stat.st_mtime_ns)
+    return files
+
+
+def order_batch(rng, n: int, users: int, products: int) -> list:
+    """Zipf-popular products, a few heavy buyers (repeat pairs included)."""
+    product_ids = (rng.zipf(1.3, n) - 1) % products + 1
+    user_ids = (rng.pareto(1.5, n) * users / 20).astype(np.int64) % users + 1
+    return [
+        {"user_id": int(u), "product_id": int(p), "quantity": 1, "status": "Pending"}
+        for u, p in zip(user_ids, product_ids)
+    ]
+
+
+def same_tables(a, b) -> bool:
+    return all(
+        np.array_equal(np.asarray(getattr(a, name)), np.asarray(getattr(b, name)))
+        for name in ("product_ids", "offsets", "neighbors", "scores")
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--customers", type=int, default=5_000)
+    parser.add_argument("--products", type=int, default=5_000)
+    parser.add_argument("--orders", type=int, default=50_000, help="first batch")
+    parser.add_argument("--batches", type=int, default=5, help="incremental batches after the first")
+    parser.add_argument("--batch-orders", type=int, default=2_000)
+    parser.add_argument("--top-k", type=int, default=10)
+    args = parser.parse_args()
+
+    db_path = use_scratch_database("incremental_reco")
+    url = "sqlite:///" + db_path
+    before = ml_snapshot()
+
+    import logging
+    from app import create_app
+    from migrations import upgrade
+    from models import db
+    from models.order import Order
+    from ml.data_preparation import export_interactions, load_interactions
+    from ml.incremental_reco import run_incremental
+    from ml.model_store import load_table
+    from ml.train_reco import build_neighbor_table
+    from utils.datagen import generate
+
+    work = tempfile.mkdtemp(prefix="bench_incremental_reco_")
+    state_path = os.path.join(work, "reco_state.npz")
+    model_dir = os.path.join(work, "reco_model")
+    export_dir = os.path.join(work, "interactions")
+
+    app = create_app()
+    app.logger.setLevel(logging.ERROR)
+    rng = np.random.default_rng(5)
+
+    with app.app_context():
+        upgrade(verbose=False)
+        generate(db.engine, args.customers, 50, args.products, 0, log=lambda *_: None)
+
+    ok = True
+    rows = []
+    # the last batch brings customers and products that had no orders yet
+    sizes = [args.orders] + [args.batch_orders] * args.batches
+    for i, size in enumerate(sizes):
+        users = args.customers if i < len(sizes) - 1 else args.customers + 50
+        products = args.products // 2 if i == 0 else args.products
+
+        with app.app_context():
+            db.session.execute(Order.__table__.insert(), order_batch(rng, size, users, products))
+            db.session.commit()
+
+        start = time.perf_counter()
+        run_incremental(args.top_k, url=url, state_path=state_path, model_dir=model_dir)
+        incremental = time.perf_counter() - start
+
+        start = time.perf_counter()
+        export_interactions(out_dir=export_dir, url=url)
+        user_ids, product_ids = load_interactions(export_dir)
+        full = build_neighbor_table(user_ids, product_ids, top_k=args.top_k)
+        retrain = time.perf_counter() - start
+
+        same = same_tables(load_table(model_dir, mmap=False), full)
+        ok = ok and same
+        rows.append((i, size, incremental, retrain, same))
+
+    print(f"\n{'batch':>5} {'orders':>8} {'incremental':>12} {'export+retrain':>15}  equal")
+    for i, size, incremental, retrain, same in rows:
+        print(f"{i:>5} {size:>8,} {incremental * 1000:>10.0f}ms {retrain * 1000:>13.0f}ms  {'✅' if same else '✖'}")
+
+    untouched = ml_snapshot() == before
+    print(f"\n  {'✅' if ok else '✖'} incremental model == full retrain after every batch")
+    print(f"  {'✅' if untouched else '✖'} nothing written under ml/")
+    if not (ok and untouched):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
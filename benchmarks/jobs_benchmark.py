@@ -0,0 +1,147 @@
+# benchmarks/jobs_benchmark.py
+#
+# Background job queue (utils/jobs.py) on a scratch DB:
+#   - enqueue + drain throughput of no-op jobs
+#   - debounce: a burst of enqueues with one dedup_key → one job
+#   - retry with a twin: a job fails while a duplicate of it was enqueued
+#     (a checkout during a recommender update) → the failed one is closed
+#     as superseded, the twin runs, nothing violates ux_jobs_dedup
+#   - a queue statement that fails (database locked) doesn't stop
+#     run_forever()
+#
+#   python -m benchmarks.jobs_benchmark --jobs 2000
+
+import argparse
+import time
+
+from benchmarks.common import use_scratch_database
+
+calls = []
+
+
+# tasks (JOB_TASKS points at these)
+def noop_task(n=0):
+    calls.append(("noop", n))
+
+
+def flaky_task(key="twin"):
+    """Fails the first time, after a duplicate of itself was enqueued."""
+    from flask import current_app
+    from models import db
+    from utils.jobs import enqueue
+
+    calls.append(("flaky", key))
+    if calls.count(("flaky", key)) == 1:
+        enqueue("flaky", {"key": key}, dedup_key=key)
+        db.session.commit()
+        raise RuntimeError("first attempt fails")
+    current_app.config["flaky_done"] = True
+
+
+def stop_task():
+    calls.append(("stop",))
+    WORKER.stopping = True
+
+
+WORKER = None
+
+
+def main():
+    global WORKER
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--jobs", type=int, default=2000)
+    args = parser.parse_args()
+
+    use_scratch_database("jobs")
+
+    from sqlalchemy.exc import OperationalError
+    from app import create_app
+    from migrations import upgrade
+    from models import db
+    from models.job import Job
+    from utils.jobs import Worker, enqueue
+
+    app = create_app()
+    app.config["JOB_TASKS"] = {
+        "noop": f"{__name__}:noop_task",
+        "flaky": f"{__name__}:flaky_task",
+        "stop": f"{__name__}:stop_task",
+    }
+    app.config["JOB_RETRY_BACKOFF"] = 0
+    with app.app_context():
+        upgrade(verbose=False)
+
+    WORKER = worker = Worker(app)
+    worker.poll_interval = 0.01
+    ok = True
+
+    def check(condition, message):
+        nonlocal ok
+        print(f"  {'✅' if condition else '✖'} {message}")
+        ok = ok and condition
+
+    # ---------- throughput ----------
+    with app.app_context():
+        started = time.perf_counter()
+        for n in range(args.jobs):
+            enqueue("noop", {"n": n})
+        db.session.commit()
+        enqueued = time.perf_counter() - started
+
+    started = time.perf_counter()
+    worker.run_until_empty()
+    drained = time.perf_counter() - started
+    print(f"📥 enqueue: {args.jobs / enqueued:>8,.0f} jobs/s")
+    print(f"👷 drain:   {args.jobs / drained:>8,.0f} jobs/s (claim + run + finish, one worker)\n")
+    check(sorted(n for name, n in calls if name == "noop") == list(range(args.jobs)), "every job ran once")
+
+    # ---------- debounce ----------
+    with app.app_context():
+        for _ in range(100):
+            enqueue("noop", {"n": -1}, dedup_key="burst", delay=60)
+        db.session.commit()
+        check(Job.query.filter_by(dedup_key="burst").count() == 1, "100 enqueues with one dedup_key → 1 queued job")
+
+    # ---------- retry with a queued twin ----------
+    with app.app_context():
+        enqueue("flaky", {"key": "twin"}, dedup_key="twin")
+        db.session.commit()
+    try:
+        worker.run_until_empty()
+        survived = True
+    except Exception as e:
+        print(f"  ✖ worker crashed: {e!r}"[:300])
+        survived = False
+    check(survived, "failing job with a queued twin doesn't crash the worker")
+    with app.app_context():
+        statuses = sorted(status for (status,) in db.session.query(Job.status).filter_by(dedup_key="twin"))
+        superseded = Job.query.filter(Job.dedup_key == "twin", Job.last_error.like("superseded%")).count()
+    check(statuses == ["done", "done"] and superseded == 1, f"failed job superseded, twin ran ({statuses})")
+    check(app.config.get("flaky_done", False), "the twin did the work")
+
+    # ---------- run_forever survives a failing queue statement ----------
+    claim = worker.claim
+    failures = []
+
+    def locked_once():
+        if not failures:
+            failures.append(1)
+            raise OperationalError("UPDATE jobs ...", {}, Exception("database is locked"))
+        return claim()
+
+    worker.claim = locked_once
+    with app.app_context():
+        enqueue("stop")
+        db.session.commit()
+    app.logger.disabled = True          # the expected traceback
+    worker.run_forever()
+    app.logger.disabled = False
+    check(failures and ("stop",) in calls, "run_forever logged the locked claim and kept going")
+
+    if not ok:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,419 @@
+# benchmarks/load_test.py
+#
+# Load test for every blueprint (users, products, orders, admin).
+#
+# Seeds a synthetic dataset of a chosen --scale into a scratch DB, then
+# drives each route with --threads concurrent clients for --requests
+# requests. The dataset comes from utils/datagen.py (Zipf popularity,
+# skewed categories, power-law baskets). Each client is logged in as its
+# role through POST /login. The
+# clients are Flask test clients (in-process), or real HTTP against a
+# local threaded WSGI server with --http. Prints req/s and p50/p95/p99
+# per route and writes everything to benchmarks/results/<time>-<commit>.json.
+# --compare OLD.json prints the change per route and flags regressions.
+#
+#   python -m benchmarks.load_test --scale small --threads 4 --requests 200
+#   python -m benchmarks.load_test --only orders --compare benchmarks/results/<old>.json
+
+import argparse
+import http.cookiejar
+import json
+import os
+import random
+import subprocess
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, NamedTuple, Optional
+
+from benchmarks.common import use_scratch_database, percentile
+from utils.datagen import CATEGORY_TABLE, WORDS
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+SCALES = {
+    "small":  {"customers": 200,    "sellers": 20,   "products": 2_000,   "orders": 5_000},
+    "medium": {"customers": 2_000,  "sellers": 100,  "products": 20_000,  "orders": 50_000},
+    "large":  {"customers": 20_000, "sellers": 500,  "products": 200_000, "orders": 500_000},
+}
+
+PASSWORD = "bench123"
+STATUSES = ["Pending", "Shipped", "Delivered"]
+
+
+class Scenario(NamedTuple):
+    blueprint: str
+    name: str
+    role: Optional[str]                 # None → anonymous
+    method: str
+    url: str                            # format fields: see run_scenario.fields()
+    data: Optional[dict] = None         # form fields, same format fields
+    setup: Optional[Callable] = None    # setup(client, fields), untimed, before each request
+
+
+def fill_cart(client, fields):
+    for pid in fields["basket"]:
+        client.request("POST", f"/cart/add/{pid}", {"quantity": "1"})
+
+
+SCENARIOS = [
+    # ---------- users_bp ----------
+    Scenario("users", "login page", None, "GET", "/login"),
+    Scenario("users", "login", None, "POST", "/login", {"email": "{customer_email}", "password": PASSWORD}),
+    Scenario("users", "register page", None, "GET", "/register"),
+    Scenario("users", "register", None, "POST", "/register",
+             {"name": "New {n}", "email": "new{n}@bench.local", "password": PASSWORD}),
+    Scenario("users", "seller register page", None, "GET", "/seller/register"),
+    Scenario("users", "customer dashboard", "customer", "GET", "/dashboard"),
+    Scenario("users", "seller dashboard", "seller", "GET", "/dashboard"),
+    Scenario("users", "admin dashboard", "admin", "GET", "/dashboard"),
+    Scenario("users", "logout", "customer", "GET", "/logout"),
+
+    # ---------- products_bp (+ home) ----------
+    Scenario("products", "home", None, "GET", "/"),
+    Scenario("products", "list", None, "GET", "/products"),
+    Scenario("products", "list by category", None, "GET", "/products?category={category}&sort=price_low"),
+    Scenario("products", "search", None, "GET", "/products?q={word}"),
+    Scenario("products", "details", None, "GET", "/product/{product}"),
+    Scenario("products", "details (customer)", "customer", "GET", "/product/{product}"),
+    Scenario("products", "add product page", "seller", "GET", "/seller/products/add"),
+    Scenario("products", "add product", "seller", "POST", "/seller/products/add",
+             {"name": "Bench {word} {n}", "category": "{category}", "price": "499", "stock": "100", "description": "load test"}),
+    Scenario("products", "edit product page", "seller", "GET", "/seller/products/{seller_product}/edit"),
+    Scenario("products", "edit product", "seller", "POST", "/seller/products/{seller_product}/edit",
+             {"name": "Edited {word} {n}", "category": "{category}", "price": "599", "stock": "100000", "description": "edited"}),
+
+    # ---------- orders_bp ----------
+    Scenario("orders", "add to cart", "customer", "POST", "/cart/add/{product}", {"quantity": "1"}),
+    Scenario("orders", "view cart", "customer", "GET", "/cart", setup=fill_cart),
+    Scenario("orders", "update cart", "customer", "POST", "/cart/update/{product}", {"quantity": "2"}),
+    Scenario("orders", "remove from cart", "customer", "POST", "/cart/remove/{product}"),
+    Scenario("orders", "buy now", "customer", "POST", "/orders/place/{product}", {"quantity": "1"}),
+    Scenario("orders", "checkout", "customer", "POST", "/checkout", setup=fill_cart),
+    Scenario("orders", "my orders", "customer", "GET", "/orders/my"),
+    Scenario("orders", "seller orders", "seller", "GET", "/seller/orders"),
+    Scenario("orders", "update order status", "seller", "POST", "/seller/orders/{seller_order}/update", {"status": "{status}"}),
+
+    # ---------- admin_bp ----------
+    Scenario("admin", "dashboard", "admin", "GET", "/admin/admin/dashboard"),
+    Scenario("admin", "users", "admin", "GET", "/admin/admin/users"),
+    Scenario("admin", "products", "admin", "GET", "/admin/admin/products"),
+    Scenario("admin", "orders", "admin", "GET", "/admin/admin/orders"),
+    Scenario("admin", "change user role", "admin", "POST", "/admin/admin/users/{spare_user}/role", {"role": "{spare_role}"}),
+]
+
+# routes deliberately not driven (they destroy the data the others need)
+NOT_DRIVEN = {
+    "orders.delete_seller_order": "deletes orders",
+    "products.seller_delete_product": "deactivates products",
+    "products.import_products": "bulk writes (benchmarks/import_benchmark.py)",
+    "admin.admin_delete_user": "deletes users",
+    "users.secret_admin_register": "admin bootstrap page",
+    "metrics": "monitoring",
+    "static": "static files",
+}
+
+
+# -----------------------------------------------------------
+# DATASET
+# -----------------------------------------------------------
+def seed(db, sizes: dict, seed: int) -> dict:
+    """Load a synthetic dataset (utils/datagen.py); returns ids the scenarios pick from."""
+    from models import User, Product, Order
+    from utils.categories import rebuild_categories
+    from utils.datagen import generate
+    from utils.search import is_sqlite, rebuild_search_index
+    from utils.stats import rebuild_order_stats
+
+    generate(
+        db.engine, sizes["customers"], sizes["sellers"], sizes["products"], sizes["orders"],
+        seed=seed, password=PASSWORD, log=lambda *_: None,
+    )
+
+    # admin + spare users for role changes
+    probe = User()
+    probe.set_password(PASSWORD)
+    now = datetime.utcnow()
+    extra = [{"name": "Admin", "email": "admin@bench.local", "role": "admin"}]
+    extra += [{"name": f"Spare {i}", "email": f"spare{i}@bench.local", "role": "customer"} for i in range(50)]
+    for row in extra:
+        row.update(password_hash=probe.password_hash, created_at=now)
+    db.session.execute(User.__table__.insert(), extra)
+
+    # plenty of stock, so buy / checkout scenarios never sell out
+    db.session.execute(db.update(Product).values(stock=1_000_000))
+    rebuild_order_stats(db.session.connection())
+    rebuild_categories(db.session.connection())
+    db.session.commit()
+    if is_sqlite():
+        rebuild_search_index()
+
+    active = db.session.execute(db.select(Product.id).where(Product.is_active == True)).scalars().all()  # noqa: E712
+    # the biggest shop, so seller pages have real volume
+    seller_id = db.session.execute(
+        db.select(Product.seller_id).group_by(Product.seller_id).order_by(db.func.count().desc()).limit(1)
+    ).scalar()
+    seller_products = db.session.execute(
+        db.select(Product.id).where(Product.seller_id == seller_id, Product.is_active == True)  # noqa: E712
+    ).scalars().all()
+    seller_orders = db.session.execute(
+        db.select(Order.id).join(Product).where(Product.seller_id == seller_id).limit(10_000)
+    ).scalars().all()
+    emails = lambda query: db.session.execute(query).scalars().all()
+
+    return {
+        "active": active,
+        "seller_products": seller_products,
+        "seller_orders": seller_orders,
+        "seller_email": db.session.get(User, seller_id).email,
+        "customer_emails": emails(db.select(User.email).where(User.role == "customer").order_by(User.id).limit(256)),
+        "spare_users": emails(db.select(User.id).where(User.email.like("spare%@bench.local"))),
+    }
+
+
+# -----------------------------------------------------------
+# CLIENTS
+# -----------------------------------------------------------
+class TestClient:
+    """In-process Flask test client."""
+
+    def __init__(self, app):
+        self.client = app.test_client()
+
+    def request(self, method, url, data=None) -> int:
+        return self.client.open(url, method=method, data=data).status_code
+
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+class HttpClient:
+    """Real HTTP against the local WSGI server (cookies kept, redirects not followed)."""
+
+    def __init__(self, base_url):
+        self.base_url = base_url
+        self.opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()), _NoRedirect
+        )
+
+    def request(self, method, url, data=None) -> int:
+        body = urllib.parse.urlencode(data).encode() if data is not None else (b"" if method == "POST" else None)
+        req = urllib.request.Request(self.base_url + url, data=body, method=method)
+        try:
+            with self.opener.open(req) as response:
+                response.read()
+                return response.status
+        except urllib.error.HTTPError as exc:
+            exc.read()
+            return exc.code
+
+
+def login(client, role, index, ids):
+    email = {
+        "admin": "admin@bench.local",
+        "seller": ids["seller_email"],
+    }.get(role) or ids["customer_emails"][index % len(ids["customer_emails"])]
+    status = client.request("POST", "/login", {"email": email, "password": PASSWORD})
+    assert status in (200, 302), f"login as {email} failed ({status})"
+
+
+# -----------------------------------------------------------
+# RUNNER
+# -----------------------------------------------------------
+def run_scenario(scenario, make_client, ids, threads, requests, rng_seed):
+    counter = [0]
+    counter_lock = threading.Lock()
+
+    def fields(rng):
+        with counter_lock:
+            counter[0] += 1
+            n = counter[0]
+        return {
+            "n": f"{rng_seed}-{n}",
+            "product": rng.choice(ids["active"]),
+            "seller_product": rng.choice(ids["seller_products"]),
+            "seller_order": rng.choice(ids["seller_orders"]),
+            "spare_user": rng.choice(ids["spare_users"]),
+            "spare_role": rng.choice(["customer", "seller"]),
+            "status": rng.choice(STATUSES),
+            "category": rng.choice(CATEGORY_TABLE)[0],
+            "customer_email": rng.choice(ids["customer_emails"]),
+            "word": rng.choice(WORDS),
+            "basket": rng.sample(ids["active"], 3),
+        }
+
+    def worker(index):
+        rng = random.Random(rng_seed * 1000 + index)
+        client = make_client()
+        if scenario.role:
+            login(client, scenario.role, index, ids)
+
+        latencies, statuses = [], {}
+        for _ in range(requests // threads + (index < requests % threads)):
+            values = fields(rng)
+            if scenario.setup:
+                scenario.setup(client, values)
+            url = scenario.url.format(**values)
+            data = {k: v.format(**values) for k, v in scenario.data.items()} if scenario.data else None
+
+            start = time.perf_counter()
+            status = client.request(scenario.method, url, data)
+            latencies.append((time.perf_counter() - start) * 1000)
+            statuses[status] = statuses.get(status, 0) + 1
+        return latencies, statuses
+
+    start = time.perf_counter()
+    latencies, statuses = [], {}
+    with ThreadPoolExecutor(threads) as pool:
+        for lat, st in pool.map(worker, range(threads)):
+            latencies.extend(lat)
+            for code, count in st.items():
+                statuses[code] = statuses.get(code, 0) + count
+    elapsed = time.perf_counter() - start
+
+    return {
+        "blueprint": scenario.blueprint,
+        "method": scenario.method,
+        "url": scenario.url,
+        "role": scenario.role or "anon",
+        "requests": len(latencies),
+        "rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+        "mean_ms": round(sum(latencies) / max(len(latencies), 1), 3),
+        "statuses": {str(k): v for k, v in sorted(statuses.items())},
+        "errors": sum(v for k, v in statuses.items() if k >= 500),
+    }
+
+
+def coverage(app) -> list:
+    """Endpoints with no scenario and no NOT_DRIVEN reason."""
+    adapter = app.url_map.bind("localhost")
+    driven = set()
+    for s in SCENARIOS:
+        path = s.url.split("?")[0].format(product=1, seller_product=1, seller_order=1, spare_user=1)
+        driven.add(adapter.match(path, method=s.method)[0])
+    return sorted({r.endpoint for r in app.url_map.iter_rules()} - driven - set(NOT_DRIVEN))
+
+
+def compare(results: dict, old_path: str, threshold: float) -> int:
+    with open(old_path) as f:
+        old = json.load(f)["routes"]
+
+    print(f"\nvs {os.path.basename(old_path)} (regression: p50 or req/s {threshold:.0%} worse)")
+    regressions = 0
+    for name, new in results.items():
+        if name not in old:
+            continue
+        p50 = new["p50_ms"] / max(old[name]["p50_ms"], 1e-6) - 1
+        rps = new["rps"] / max(old[name]["rps"], 1e-6) - 1
+        bad = p50 > threshold or rps < -threshold
+        regressions += bad
+        print(f"  {'✖' if bad else ' '} {name:<38} p50 {p50:+7.1%}   req/s {rps:+7.1%}")
+    return regressions
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--scale", choices=SCALES, default="small")
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--requests", type=int, default=200, help="per route")
+    parser.add_argument("--only", help="comma-separated blueprints (users,products,orders,admin)")
+    parser.add_argument("--http", action="store_true", help="real HTTP against a local WSGI server")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", default=RESULTS_DIR)
+    parser.add_argument("--compare", help="earlier results JSON")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    args = parser.parse_args()
+
+    use_scratch_database("load_test")
+
+    import logging
+    from app import app
+    from migrations import upgrade
+    from models import db
+
+    app.logger.setLevel(logging.ERROR)        # query budget / slow query warnings
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)   # --http access log
+    sizes = SCALES[args.scale]
+
+    with app.app_context():
+        upgrade(verbose=False)
+        start = time.perf_counter()
+        ids = seed(db, sizes, args.seed)
+        print(f"🌱 Seeded {args.scale}: {sizes} in {time.perf_counter() - start:.1f}s")
+
+    missing = coverage(app)
+    if missing:
+        print(f"⚠ Routes without a scenario: {', '.join(missing)}")
+
+    server = None
+    if args.http:
+        from werkzeug.serving import make_server
+
+        server = make_server("127.0.0.1", 0, app, threaded=True)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base_url = f"http://127.0.0.1:{server.server_port}"
+        make_client = lambda: HttpClient(base_url)
+    else:
+        make_client = lambda: TestClient(app)
+
+    blueprints = set(args.only.split(",")) if args.only else None
+    results = {}
+    print(f"{'route':<40} {'req/s':>8} {'p50':>9} {'p95':>9} {'p99':>9}  statuses")
+    for scenario in SCENARIOS:
+        if blueprints and scenario.blueprint not in blueprints:
+            continue
+        name = f"{scenario.blueprint}: {scenario.name}"
+        result = run_scenario(scenario, make_client, ids, args.threads, args.requests, args.seed)
+        results[name] = result
+        print(
+            f"{name:<40} {result['rps']:>8,.0f} {result['p50_ms']:>7.2f}ms {result['p95_ms']:>7.2f}ms "
+            f"{result['p99_ms']:>7.2f}ms  {result['statuses']}"
+        )
+
+    if server:
+        server.shutdown()
+
+    commit = git_commit()
+    report = {
+        "commit": commit,
+        "timestamp": datetime.utcnow().isoformat(timespec="seconds"),
+        "scale": args.scale,
+        "sizes": sizes,
+        "threads": args.threads,
+        "requests_per_route": args.requests,
+        "mode": "http" if args.http else "test_client",
+        "routes": results,
+    }
+    os.makedirs(args.output, exist_ok=True)
+    path = os.path.join(args.output, f"{datetime.utcnow():%Y%m%d-%H%M%S}-{commit}.json")
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n💾 {path}")
+
+    errors = sum(r["errors"] for r in results.values())
+    regressions = compare(results, args.compare, args.threshold) if args.compare else 0
+    if errors or regressions:
+        print(f"\n✖ {errors} server errors, {regressions} regressions")
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
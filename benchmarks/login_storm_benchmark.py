@@ -0,0 +1,165 @@
+# benchmarks/login_storm_benchmark.py
+#
+# Password hashing isolation (utils/auth.py): catalog latency while a
+# burst of logins runs alongside it.
+#
+#   quiet        catalog browsing only
+#   storm inline logins hash in the request threads (PASSWORD_HASH_WORKERS=0)
+#   storm pool   logins hash in the low-priority process pool, at most
+#                PASSWORD_HASH_QUEUE admitted, the rest get 503
+# then checks that a pool whose hashing child is killed (OOM killer) is
+# replaced: the next login still succeeds, and that the hashing processes
+# don't come from fork() of the (threaded) worker.
+#
+# Browsers and login clients are threads with their own test client, so
+# they compete for the CPU like gunicorn threads in one worker.
+#
+#   python -m benchmarks.login_storm_benchmark --seconds 10 --logins 8
+
+import argparse
+import logging
+import os
+import random
+import signal
+import threading
+import time
+
+from benchmarks.common import use_scratch_database, product_rows, summarize, CATEGORIES
+
+PASSWORD = "bench123"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--products", type=int, default=2000)
+    parser.add_argument("--seconds", type=float, default=10.0, help="duration of each phase")
+    parser.add_argument("--browsers", type=int, default=2, help="catalog client threads")
+    parser.add_argument("--logins", type=int, default=8, help="login client threads")
+    args = parser.parse_args()
+
+    use_scratch_database("login_storm")
+
+    from app import create_app
+    from config import get_config
+    from migrations import upgrade
+    from models import db, Product, User
+    from utils import auth
+    from utils.auth import shutdown_pool
+
+    class Inline(get_config()):
+        PAGE_CACHE_ENABLED = False       # every catalog hit renders
+        QUERY_BUDGET_ENABLED = False
+        PASSWORD_HASH_WORKERS = 0
+
+    class Pool(Inline):
+        PASSWORD_HASH_WORKERS = 1
+        PASSWORD_HASH_QUEUE = 4
+        PASSWORD_HASH_WAIT = 1.0
+
+    seed_app = create_app(Inline)
+    with seed_app.app_context():
+        upgrade(verbose=False)
+        db.session.execute(Product.__table__.insert(), list(product_rows(args.products)))
+        users = [User(name=f"u{i}", email=f"u{i}@bench.local", role="customer") for i in range(args.logins)]
+        for user in users:
+            user.set_password(PASSWORD)
+        db.session.add_all(users)
+        db.session.commit()
+
+    rng = random.Random(21)
+    urls = [
+        rng.choice([
+            "/",
+            f"/products?category={rng.choice(CATEGORIES)}",
+            f"/product/{rng.randint(1, args.products)}",
+        ])
+        for _ in range(5000)
+    ]
+
+    def run_phase(label, config, storm):
+        app = create_app(config)
+        app.logger.setLevel(logging.ERROR)
+        stop = threading.Event()
+        catalog, logins, statuses = [], [], {}
+        lock = threading.Lock()
+
+        def browse(offset):
+            client = app.test_client()
+            i = offset
+            while not stop.is_set():
+                start = time.perf_counter()
+                client.get(urls[i % len(urls)])
+                elapsed = (time.perf_counter() - start) * 1000
+                with lock:
+                    catalog.append(elapsed)
+                i += 1
+
+        def login(n):
+            client = app.test_client()
+            while not stop.is_set():
+                start = time.perf_counter()
+                response = client.post("/login", data={"email": f"u{n}@bench.local", "password": PASSWORD})
+                elapsed = (time.perf_counter() - start) * 1000
+                with lock:
+                    statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+                    if response.status_code == 302:
+                        logins.append(elapsed)
+                if response.status_code == 503:
+                    time.sleep(0.05)      # a real client honours Retry-After
+
+        threads = [threading.Thread(target=browse, args=(i * 997,)) for i in range(args.browsers)]
+        if storm:
+            threads += [threading.Thread(target=login, args=(n,)) for n in range(args.logins)]
+        for t in threads:
+            t.start()
+        time.sleep(args.seconds)
+        stop.set()
+        for t in threads:
+            t.join()
+        shutdown_pool()
+
+        stats = summarize(label, catalog)
+        stats["rps"] = len(catalog) / args.seconds
+        if storm:
+            ok = statuses.get(302, 0)
+            print(f"{'':<28} logins ok={ok} ({ok / args.seconds:.1f}/s)  503={statuses.get(503, 0)}  "
+                  f"login p50={sorted(logins)[len(logins) // 2] if logins else 0:.0f}ms")
+        return stats
+
+    print(f"catalog latency, {args.browsers} browsers / {args.logins} login threads, {args.seconds:.0f}s per phase\n")
+    quiet = run_phase("quiet", Inline, storm=False)
+    inline = run_phase("storm inline", Inline, storm=True)
+    pooled = run_phase("storm pool", Pool, storm=True)
+
+    print(f"\ncatalog p99: quiet {quiet['p99_ms']:.1f}ms, inline storm {inline['p99_ms']:.1f}ms, "
+          f"pooled storm {pooled['p99_ms']:.1f}ms")
+    ok = pooled["p99_ms"] < inline["p99_ms"]
+    print(f"  {'✅' if ok else '✖'} pool keeps catalog p99 below the inline storm")
+
+    # ---------- a hashing child dies ----------
+    app = create_app(Pool)
+    app.logger.setLevel(logging.CRITICAL)
+    client = app.test_client()
+    form = {"email": "u0@bench.local", "password": PASSWORD}
+    before = client.post("/login", data=form).status_code
+    start_method = auth._pool._mp_context.get_start_method()
+    for pid in list(auth._pool._processes):
+        os.kill(pid, signal.SIGKILL)
+    time.sleep(0.2)
+    client.get("/logout")
+    after = client.post("/login", data=form).status_code
+    shutdown_pool()
+    recovered = before == after == 302
+    print(f"  {'✅' if recovered else '✖'} login after the hashing child was killed: {after}")
+    ok = ok and recovered
+
+    # the pool starts inside a threaded worker: fork() there can deadlock
+    print(f"  {'✅' if start_method != 'fork' else '✖'} hashing processes start via {start_method}, not fork()")
+    ok = ok and start_method != "fork"
+
+    if not ok:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+# benchmarks/metrics_benchmark.py
+#
+# Instrumentation check (utils/metrics.py): throughput of anonymous
+# catalog requests with METRICS_ENABLED off vs on, then shows a
+# Server-Timing header, the slow-query log (SLOW_QUERY_MS=0 logs
+# everything), a slice of GET /metrics, and that production never
+# serves /metrics without METRICS_TOKEN.
+#
+#   python -m benchmarks.metrics_benchmark --products 5000 --requests 1000
+
+import argparse
+import logging
+import random
+import time
+
+from benchmarks.common import use_scratch_database, product_rows, summarize, CATEGORIES
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--products", type=int, default=5000)
+    parser.add_argument("--requests", type=int, default=1000)
+    args = parser.parse_args()
+
+    use_scratch_database("metrics")
+
+    from app import create_app
+    from config import get_config
+    from migrations import upgrade
+    from models import db, Product
+    from utils.metrics import metrics
+
+    class Off(get_config()):
+        METRICS_ENABLED = False
+        PAGE_CACHE_ENABLED = False
+
+    class On(Off):
+        METRICS_ENABLED = True
+        SLOW_QUERY_MS = 0
+
+    seed_app = create_app(Off)
+    with seed_app.app_context():
+        upgrade(verbose=False)
+        db.session.execute(Product.__table__.insert(), list(product_rows(args.products)))
+        db.session.commit()
+
+    rng = random.Random(5)
+    urls = [
+        rng.choice([
+            "/",
+            f"/products?category={rng.choice(CATEGORIES)}",
+            f"/product/{rng.randint(1, args.products)}",
+        ])
+        for _ in range(args.requests)
+    ]
+
+    results = {}
+    for label, config in (("metrics off", Off), ("metrics on", On)):
+        app = create_app(config)
+        app.logger.setLevel(logging.ERROR)      # SLOW_QUERY_MS=0 → every statement is "slow"
+        client = app.test_client()
+        latencies = []
+        for url in urls:
+            start = time.perf_counter()
+            client.get(url)
+            latencies.append((time.perf_counter() - start) * 1000)
+        results[label] = summarize(label, latencies)
+
+    overhead = results["metrics on"]["mean_ms"] - results["metrics off"]["mean_ms"]
+    print(f"           overhead {overhead:+.3f}ms per request")
+
+    response = client.get("/product/1")
+    print(f"\nServer-Timing: {response.headers.get('Server-Timing')}")
+
+    print("\nslow-query log (top 3 by total time):")
+    top = sorted(metrics.slow_queries.items(), key=lambda kv: -kv[1]["seconds"])[:3]
+    for sql, entry in top:
+        print(f"  {entry['count']:>5} × max {entry['max'] * 1000:6.2f}ms  …{sql[sql.find(' FROM '):][:90]}")
+
+    body = client.get("/metrics").get_data(as_text=True)
+    print("\n/metrics (excerpt):")
+    for line in body.splitlines():
+        if 'endpoint="products.product_details"' in line and "_bucket" not in line:
+            print("  " + line)
+
+    ok = "Server-Timing" in response.headers and top and "app_request_duration_seconds_bucket" in body
+    print(f"\n  {'✅' if ok else '✖'} Server-Timing, slow-query log and /metrics populated")
+
+    # production: no METRICS_TOKEN → 403, never an anonymous scrape
+    class Production(get_config("production")):
+        PAGE_CACHE_ENABLED = False
+        PAGE_CACHE_SHARED_PATH = None       # no instance/page_cache.db
+
+    class Token(Production):
+        METRICS_TOKEN = "s3cret"
+
+    closed = create_app(Production)
+    closed.logger.setLevel(logging.ERROR)
+    guarded = create_app(Token).test_client()
+    statuses = (
+        closed.test_client().get("/metrics").status_code,
+        guarded.get("/metrics").status_code,
+        guarded.get("/metrics", headers={"Authorization": "Bearer s3cret"}).status_code,
+    )
+    access_ok = statuses == (403, 403, 200)
+    print(f"  {'✅' if access_ok else '✖'} production /metrics: no token / wrong / right → {statuses}")
+    ok = ok and access_ok
+    if not ok:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+# benchmarks/query_counts.py
+#
+# N+1 regression check.
+# Runs every GET route from benchmarks/query_plans.py with the query budget
+# in strict mode (utils/query_budget.py) against a scratch DB with hundreds
+# of orders and 40 sellers, so a lazy relationship touched per row blows
+# the budget.
+# Prints the statement count per route; exits 1 if any route is over.
+#
+#   python -m benchmarks.query_counts
+
+import os
+import sys
+
+from benchmarks.common import use_scratch_database
+from benchmarks.query_plans import ROUTES, seed
+
+EXTRA_ROUTES = [
+    ("admin", "/admin/admin/products?per_page=100"),
+    ("admin", "/admin/admin/orders?per_page=100"),
+]
+
+
+def main() -> int:
+    use_scratch_database("query_counts")
+    os.environ["QUERY_BUDGET_ENABLED"] = "1"
+    os.environ["QUERY_BUDGET_STRICT"] = "1"
+
+    from flask import g
+    from app import app
+    from models import db, Product, User, Order
+    from migrations import upgrade
+    from utils.query_budget import QueryBudgetExceeded
+
+    app.testing = True  # budget errors propagate to the test client
+
+    with app.app_context():
+        upgrade(verbose=False)
+        seed(db, Product, User, Order)
+
+    counts = {}
+
+    # registered after the budget check, so it runs before it
+    @app.after_request
+    def record(response):
+        counts["last"] = g.get("sql_statements", 0)
+        return response
+
+    client = app.test_client()
+    failures = 0
+
+    for role, url in ROUTES + EXTRA_ROUTES:
+        client.get("/logout")
+        if role:
+            client.post("/login", data={"email": f"{role}@bench.local", "password": "bench123"})
+
+        label = f"{role or 'anon':<8} {url}"
+        try:
+            response = client.get(url)
+        except QueryBudgetExceeded as exc:
+            failures += 1
+            print(f"✖ {label}\n    {exc}")
+            continue
+
+        if response.status_code != 200:
+            failures += 1
+            print(f"✖ {label} returned {response.status_code}")
+            continue
+
+        print(f"  {label:<50} {counts['last']:>3} statements")
+
+    if failures:
+        print(f"\n✖ {failures} routes over their query budget")
+        return 1
+
+    print(f"\n✅ all routes within budget (default {app.config['QUERY_BUDGET_DEFAULT']})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
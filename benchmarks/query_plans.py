@@ -0,0 +1,143 @@
+# benchmarks/query_plans.py
+#
+# Query-plan regression check.
+# Drives every GET route in routes/ through the Flask test client against a
+# migrated scratch DB, captures each SELECT the route issues and runs
+# EXPLAIN QUERY PLAN on it. Exits 1 if any query does a full table scan
+# (`SCAN <table>` without an index).
+#
+#   python -m benchmarks.query_plans
+
+import re
+import sys
+
+from benchmarks.common import use_scratch_database, product_rows
+
+# routes as (role, url); role None → anonymous
+ROUTES = [
+    (None, "/"),
+    (None, "/products"),
+    (None, "/products?sort=price_low"),
+    (None, "/products?sort=price_high"),
+    (None, "/products?category=Laptops"),
+    (None, "/products?category=Laptops&sort=price_low"),
+    (None, "/products?q=pro"),
+    (None, "/product/1"),
+    ("customer", "/dashboard"),
+    ("customer", "/orders/my"),
+    ("customer", "/cart"),
+    ("seller", "/dashboard"),
+    ("seller", "/seller/orders"),
+    ("admin", "/dashboard"),
+    ("admin", "/admin/admin/users"),
+    ("admin", "/admin/admin/products"),
+    ("admin", "/admin/admin/orders"),
+]
+
+ALLOWED = [
+    # whole-table aggregates are scans by definition (dashboard counters)
+    re.compile(r"^SELECT count\(\*\) AS count_1\s+FROM \(SELECT \w+\.id", re.S),
+    # search-index existence probe
+    re.compile(r"FROM sqlite_master"),
+]
+
+# materialized subqueries (anon_N) and constant rows are not table scans
+FULL_SCAN = re.compile(r"\bSCAN (?!CONSTANT ROW)(?!anon_\d)(\w+)\b(?! USING)(?!.*VIRTUAL TABLE)")
+
+
+def seed(db, Product, User, Order):
+    from utils.stats import rebuild_order_stats
+
+    users = [
+        User(name="Customer", email="customer@bench.local", role="customer"),
+        User(name="Seller", email="seller@bench.local", role="seller"),
+        User(name="Admin", email="admin@bench.local", role="admin"),
+    ]
+    # several sellers, so a lazy per-row relationship (product.seller)
+    # costs a statement per row instead of one identity-map hit
+    users += [User(name=f"Seller {i}", email=f"seller{i}@bench.local", role="seller") for i in range(2, 41)]
+    users[0].set_password("bench123")
+    for u in users:
+        u.password_hash = users[0].password_hash
+    db.session.add_all(users)
+    db.session.flush()
+
+    sellers = [u for u in users if u.role == "seller"]
+    rows = list(product_rows(2000))
+    for i, row in enumerate(rows):
+        row["seller_id"] = sellers[i % len(sellers)].id
+    db.session.execute(Product.__table__.insert(), rows)
+
+    db.session.execute(Order.__table__.insert(), [
+        {"product_id": 1 + i % 2000, "user_id": users[0].id, "quantity": 1, "status": "Pending"}
+        for i in range(500)
+    ])
+    rebuild_order_stats(db.session.connection())
+    db.session.commit()
+
+
+def main() -> int:
+    use_scratch_database("query_plans")
+
+    from sqlalchemy import event
+    from app import app
+    from models import db, Product, User, Order
+    from migrations import upgrade
+
+    captured = []
+    current_route = [None]
+
+    with app.app_context():
+        upgrade(verbose=False)
+        seed(db, Product, User, Order)
+
+        @event.listens_for(db.engine, "before_cursor_execute")
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith("SELECT"):
+                captured.append((current_route[0], statement, parameters))
+
+    client = app.test_client()
+
+    for role, url in ROUTES:
+        client.get("/logout")
+        if role:
+            client.post("/login", data={"email": f"{role}@bench.local", "password": "bench123"})
+
+        current_route[0] = url
+        response = client.get(url)
+        if response.status_code != 200:
+            print(f"✖ {url} returned {response.status_code}")
+            return 1
+
+    # lazy loads repeat the same statement per row — check each shape once
+    unique = {}
+    for url, statement, parameters in captured:
+        unique.setdefault((url, statement), parameters)
+
+    failures = 0
+    with app.app_context():
+        conn = db.session.connection()
+        for (url, statement), parameters in unique.items():
+            if any(p.search(statement) for p in ALLOWED):
+                continue
+
+            plan = conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters).fetchall()
+            details = [row[-1] for row in plan]
+            scans = [d for d in details if FULL_SCAN.search(d)]
+
+            if scans:
+                failures += 1
+                flat = " ".join(statement.split())
+                print(f"✖ {url}\n    {flat[:200]}\n    " + "\n    ".join(details))
+
+    checked = len(unique)
+    if failures:
+        print(f"\n✖ {failures} of {checked} route queries do a full table scan")
+        return 1
+
+    print(f"✅ {checked} route queries checked, all use an index")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+# benchmarks/recommender_benchmark.py
+#
+# Latency of the array-backed recommender vs the old pickle-dict path.
+#
+#   python -m benchmarks.recommender_benchmark --products 100000 --neighbors 20
+
+import argparse
+import random
+import tempfile
+
+import numpy as np
+
+from benchmarks.common import use_scratch_database, time_calls, summarize, product_rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--products", type=int, default=50_000)
+    parser.add_argument("--neighbors", type=int, default=20)
+    parser.add_argument("--lookups", type=int, default=2000)
+    args = parser.parse_args()
+
+    use_scratch_database("recommender")
+
+    from app import app
+    from migrations import upgrade
+    from models import db
+    from models.product import Product
+    from ml.model_store import NeighborTable, save_table
+    from ml.recommender import Recommender
+
+    rng = np.random.default_rng(3)
+    n, k = args.products, args.neighbors
+
+    table = NeighborTable(
+        product_ids=np.arange(1, n + 1, dtype=np.int32),
+        offsets=np.arange(0, n * k + 1, k, dtype=np.int64),
+        neighbors=rng.integers(1, n + 1, size=n * k, dtype=np.int32),
+        scores=np.sort(rng.random(n * k, dtype=np.float32))[::-1].copy(),
+    )
+    model_dir = tempfile.mkdtemp(prefix="reco_bench_")
+    save_table(table, model_dir)
+    legacy = table.as_dict()
+
+    with app.app_context():
+        upgrade(verbose=False)
+        db.session.execute(Product.__table__.insert(), list(product_rows(n)))
+        db.session.commit()
+
+        rec = Recommender(model_dir)
+        rec.top_k_ids(1)    # load + warm the active set
+
+        ids = [(random.randint(1, n),) for _ in range(args.lookups)]
+
+        def legacy_path(pid):
+            recommended = legacy.get(pid, [])
+            (
+                Product.query
+                .filter(Product.id.in_(recommended))
+                .filter_by(is_active=True)
+                .all()
+            )
+
+        summarize("top_k_ids (arrays only)", time_calls(lambda pid: rec.top_k_ids(pid, 6), ids))
+        summarize("top_k (arrays + 1 fetch)", time_calls(lambda pid: rec.top_k(pid, 6), ids))
+        summarize("legacy dict + IN fetch", time_calls(legacy_path, ids))
+
+
+if __name__ == "__main__":
+    main()
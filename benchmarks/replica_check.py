@@ -0,0 +1,102 @@
+# benchmarks/replica_check.py
+#
+# Read-replica routing check (database.RoutingSession, utils/replicas.py)
+# with a local SQLite copy as the replica:
+#   1. anonymous catalog pages read from the replica, not the primary
+#   2. a seller who just edited a product reads the primary (read-your-writes)
+#   3. other visitors see the replica's copy until it is synced (the sync
+#      also drops catalog pages cached from the stale replica)
+# Prints SQL statements per engine for each step.
+#
+#   python -m benchmarks.replica_check
+
+import os
+import tempfile
+
+from benchmarks.common import use_scratch_database, product_rows
+
+
+def main():
+    use_scratch_database("replica_primary")
+    replica_path = os.path.join(tempfile.gettempdir(), "bench_replica_1.db")
+    os.environ["DATABASE_REPLICA_URLS"] = "sqlite:///" + replica_path
+
+    from sqlalchemy import event
+    from app import app
+    from migrations import upgrade
+    from models import db, User, Product
+    from utils.replicas import sync_sqlite_replicas
+
+    with app.app_context():
+        upgrade(verbose=False)
+        seller = User(name="Seller", email="seller@bench.local", role="seller")
+        seller.set_password("bench123")
+        db.session.add(seller)
+        db.session.flush()
+        rows = list(product_rows(50))
+        for row in rows:
+            row.update(seller_id=seller.id, is_active=True)
+        db.session.execute(Product.__table__.insert(), rows)
+        db.session.commit()
+        seller_id = seller.id
+        original = db.session.get(Product, 1).name
+
+        sync_sqlite_replicas(app)
+
+        counts = {}
+        for key, engine in db.engines.items():
+            label = key or "primary"
+            counts[label] = 0
+
+            @event.listens_for(engine, "before_cursor_execute")
+            def count(conn, cursor, statement, parameters, context, executemany, label=label):
+                counts[label] += 1
+
+    def step(label, fn):
+        for key in counts:
+            counts[key] = 0
+        body = fn()
+        print(f"{label:<40} " + "  ".join(f"{k}={v}" for k, v in counts.items()))
+        return body
+
+    failures = []
+
+    def expect(ok, message):
+        print(f"           {'✅' if ok else '✖'} {message}")
+        if not ok:
+            failures.append(message)
+
+    visitor = app.test_client()
+    seller_client = app.test_client()
+    with seller_client.session_transaction() as s:
+        s.update(logged_in=True, user_id=seller_id, role="seller")
+
+    # 1. anonymous catalog reads
+    step("anonymous /products + /product/1", lambda: (visitor.get("/products"), visitor.get("/product/1")))
+    expect(counts["primary"] == 0 and counts["replica_0"] > 0, "catalog reads served by the replica")
+
+    # 2. seller edits, then reads back
+    step("seller edits product 1", lambda: seller_client.post(
+        "/seller/products/1/edit",
+        data={"name": "Renamed by seller", "category": "Bench", "description": "", "price": "10", "stock": "5"},
+    ))
+    body = step("seller GET /product/1", lambda: seller_client.get("/product/1").get_data(as_text=True))
+    expect(counts["replica_0"] == 0, "post-write reads go to the primary")
+    expect("Renamed by seller" in body, "seller sees their own edit")
+
+    # 3. other visitors: replica lag until sync
+    body = step("anonymous GET /product/1 (before sync)", lambda: visitor.get("/product/1").get_data(as_text=True))
+    expect(original in body, "replica still serves the old name (replication lag)")
+
+    with app.app_context():
+        sync_sqlite_replicas(app)
+
+    body = step("anonymous GET /product/1 (after sync)", lambda: visitor.get("/product/1").get_data(as_text=True))
+    expect("Renamed by seller" in body and counts["primary"] == 0, "replica caught up after sync")
+
+    if failures:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
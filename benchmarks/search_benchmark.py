@@ -0,0 +1,63 @@
+# benchmarks/search_benchmark.py
+#
+# Compare /products search latency: leading-wildcard ilike vs FTS5 index.
+#
+#   python -m benchmarks.search_benchmark --products 200000 --queries 200
+
+import argparse
+import random
+
+from benchmarks.common import use_scratch_database, time_calls, summarize, product_rows, BRANDS
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--products", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    use_scratch_database("search")
+
+    from app import app
+    from models import db
+    from models.product import Product
+    from utils.search import rebuild_search_index, apply_search
+
+    with app.app_context():
+        db.create_all()
+
+        print(f"📦 Seeding {args.products} products...")
+        rows = list(product_rows(args.products))
+        db.session.execute(Product.__table__.insert(), rows)
+        db.session.commit()
+
+        print("🔎 Building search index...")
+        rebuild_search_index()
+
+        rng = random.Random(7)
+        terms = [(rng.choice(BRANDS)[: rng.randint(4, 7)],) for _ in range(args.queries)]
+
+        def ilike_search(q):
+            (
+                Product.query
+                .filter_by(is_active=True)
+                .filter(Product.name.ilike(f"%{q}%"))
+                .order_by(Product.created_at.desc())
+                .limit(24)
+                .all()
+            )
+
+        def fts_search(q):
+            query, rank = apply_search(Product.query.filter_by(is_active=True), q)
+            query.order_by(rank.asc(), Product.id.asc()).limit(24).all()
+
+        # warm both paths once so page cache effects are equal
+        ilike_search("pro")
+        fts_search("pro")
+
+        summarize("ilike (old path)", time_calls(ilike_search, terms))
+        summarize("fts5 prefix + bm25", time_calls(fts_search, terms))
+
+
+if __name__ == "__main__":
+    main()
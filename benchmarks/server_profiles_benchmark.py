@@ -0,0 +1,122 @@
+# benchmarks/server_profiles_benchmark.py
+#
+# Throughput of each gunicorn.conf.py profile (sync / gthread / gevent)
+# on catalog and checkout routes, over real HTTP.
+#
+# Seeds one scratch DB (benchmarks/load_test.py dataset), then for every
+# profile starts `gunicorn -c gunicorn.conf.py` on it (APP_PROFILE=production,
+# i.e. WAL) and drives the load-test scenarios below with --clients
+# concurrent HTTP clients. gevent is skipped if it isn't installed.
+#
+#   python -m benchmarks.server_profiles_benchmark --clients 16 --requests 400
+
+import argparse
+import importlib.util
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+
+from benchmarks.common import use_scratch_database
+from benchmarks.load_test import SCENARIOS, SCALES, HttpClient, run_scenario, seed
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROFILES = ("sync", "gthread", "gevent")
+ROUTES = {
+    "catalog": ["products: list by category", "products: search", "products: details"],
+    "checkout": ["orders: buy now", "orders: checkout"],
+}
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(profile: str, port: int, workers=None):
+    env = dict(os.environ, GUNICORN_PROFILE=profile, GUNICORN_BIND=f"127.0.0.1:{port}",
+               APP_PROFILE="production", QUERY_BUDGET_ENABLED="0",
+               GUNICORN_MAX_REQUESTS="0")     # no recycling mid-run (see gunicorn.conf.py)
+    if workers:
+        env["GUNICORN_WORKERS"] = str(workers)
+    process = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "--log-level", "warning"],
+        cwd=ROOT, env=env,
+    )
+
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/login", timeout=1).read()
+            return process
+        except OSError:
+            time.sleep(0.2)
+    process.kill()
+    raise SystemExit(f"✖ gunicorn ({profile}) did not come up")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--scale", choices=SCALES, default="small")
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=400, help="per route")
+    parser.add_argument("--workers", type=int, help="override every profile's worker count")
+    args = parser.parse_args()
+
+    use_scratch_database("server_profiles")
+    os.environ["PAGE_CACHE_ENABLED"] = "0"       # measure the app, not the cache
+
+    import logging
+    from app import create_app
+    from migrations import upgrade
+    from models import db
+
+    os.environ["SLOW_QUERY_MS"] = "1000"         # lock waits are expected here
+    app = create_app()
+    app.logger.setLevel(logging.ERROR)
+    with app.app_context():
+        upgrade(verbose=False)
+        ids = seed(db, SCALES[args.scale], 7)
+        db.engine.dispose()
+
+    scenarios = {s.blueprint + ": " + s.name: s for s in SCENARIOS}
+    profiles = [p for p in PROFILES if p != "gevent" or importlib.util.find_spec("gevent")]
+    if "gevent" not in profiles:
+        print("⚠ gevent not installed, skipping that profile")
+
+    results = {}
+    for profile in profiles:
+        port = free_port()
+        server = start_server(profile, port, args.workers)
+        make_client = lambda: HttpClient(f"http://127.0.0.1:{port}")
+        try:
+            for group, names in ROUTES.items():
+                for name in names:
+                    r = run_scenario(scenarios[name], make_client, ids, args.clients, args.requests, 7)
+                    results[(profile, group, name)] = r
+                    print(f"{profile:<8} {name:<30} {r['rps']:>7,.0f} req/s  "
+                          f"p50={r['p50_ms']:>7.1f}ms  p99={r['p99_ms']:>7.1f}ms  {r['statuses']}")
+        finally:
+            server.terminate()
+            server.wait()
+
+    print(f"\nreq/s by profile ({args.clients} clients, {os.cpu_count()} CPU):")
+    print(f"{'':<10}" + "".join(f"{group:>12}" for group in ROUTES))
+    for profile in profiles:
+        row = []
+        for group, names in ROUTES.items():
+            runs = [results[(profile, group, name)] for name in names]
+            row.append(sum(r["requests"] for r in runs) / sum(r["requests"] / r["rps"] for r in runs))
+        print(f"{profile:<10}" + "".join(f"{rps:>12,.0f}" for rps in row))
+
+    errors = sum(r["errors"] for r in results.values())
+    print(f"\n  {'✅' if not errors else '✖'} {errors} server errors")
+    if errors:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+# benchmarks/startup_benchmark.py
+#
+# Cold start: import time and first-request latency, every phase in a
+# fresh interpreter (median of --runs).
+#
+#   eager import   import app + build the global app + numpy / recommender,
+#                  i.e. what `import app` used to do
+#   lazy import    import app (no app built, recommender not imported)
+#   cold worker    create_app(), then the first and second product page:
+#                  the first one loads numpy, maps the model, compiles templates
+#   preloaded      app.preload() in a "master", fork, first product page in
+#                  the child, i.e. a gunicorn --preload worker
+#
+#   python -m benchmarks.startup_benchmark --runs 5
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.common import use_scratch_database, product_rows
+
+PHASES = ("eager", "lazy", "cold", "preload")
+MODEL_DIR = os.path.join(tempfile.gettempdir(), "bench_startup_model")
+
+
+def ms(start: float) -> float:
+    return (time.perf_counter() - start) * 1000
+
+
+def first_requests(app) -> dict:
+    client = app.test_client()
+    start = time.perf_counter()
+    assert client.get("/product/1").status_code == 200
+    first = ms(start)
+    start = time.perf_counter()
+    client.get("/product/2")
+    return {"first_ms": first, "second_ms": ms(start)}
+
+
+def run_phase(phase: str) -> dict:
+    """Runs inside the child interpreter; returns the timings."""
+    start = time.perf_counter()
+    import app as app_module
+    result = {"import_ms": ms(start)}
+
+    if phase == "eager":
+        app_module.app                      # noqa: B018 (build the global app)
+        import ml.recommender               # noqa: F401
+        result["import_ms"] = ms(start)
+        return result
+
+    from ml.recommender import recommender
+
+    if phase == "cold":
+        app = app_module.create_app()
+        recommender.model_dir = MODEL_DIR
+        result.update(first_requests(app))
+        return result
+
+    if phase == "preload":
+        recommender.model_dir = MODEL_DIR
+        start = time.perf_counter()
+        app = app_module.preload()
+        result["preload_ms"] = ms(start)
+
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:                        # "worker"
+            os.close(read_fd)
+            os.write(write_fd, json.dumps(first_requests(app)).encode())
+            os._exit(0)
+        os.close(write_fd)
+        with os.fdopen(read_fd) as pipe:
+            result.update(json.loads(pipe.read()))
+        os.waitpid(pid, 0)
+
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--products", type=int, default=20_000)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--phase", choices=PHASES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.phase:
+        print(json.dumps(run_phase(args.phase)))
+        return
+
+    use_scratch_database("startup")
+    os.environ["PAGE_CACHE_ENABLED"] = "0"      # first request must render
+
+    import numpy as np
+
+    from app import create_app
+    from migrations import upgrade
+    from models import db, Product
+    from ml.model_store import NeighborTable, save_table
+
+    with create_app().app_context():
+        upgrade(verbose=False)
+        db.session.execute(Product.__table__.insert(), list(product_rows(args.products)))
+        db.session.commit()
+
+    n, k = args.products, 20
+    rng = np.random.default_rng(7)
+    save_table(NeighborTable(
+        product_ids=np.arange(1, n + 1, dtype=np.int32),
+        offsets=np.arange(0, n * k + 1, k, dtype=np.int64),
+        neighbors=rng.integers(1, n + 1, size=n * k, dtype=np.int32),
+        scores=np.sort(rng.random(n * k, dtype=np.float32))[::-1].copy(),
+    ), MODEL_DIR)
+
+    results = {}
+    for phase in PHASES:
+        runs = []
+        for _ in range(args.runs):
+            out = subprocess.run(
+                [sys.executable, "-m", "benchmarks.startup_benchmark", "--phase", phase],
+                capture_output=True, text=True, check=True,
+            )
+            runs.append(json.loads(out.stdout.strip().splitlines()[-1]))
+        results[phase] = {key: statistics.median(r[key] for r in runs) for key in runs[0]}
+
+    print(f"median of {args.runs} runs, {args.products} products\n")
+    for phase, timings in results.items():
+        print(f"{phase:<10}" + "  ".join(f"{key}={value:8.1f}" for key, value in timings.items()))
+
+    saved = results["eager"]["import_ms"] - results["lazy"]["import_ms"]
+    print(f"\nimport: {results['eager']['import_ms']:.0f}ms → {results['lazy']['import_ms']:.0f}ms "
+          f"({saved:+.0f}ms saved per script / CLI run)")
+    print(f"first product page: cold worker {results['cold']['first_ms']:.0f}ms, "
+          f"preloaded worker {results['preload']['first_ms']:.0f}ms "
+          f"(steady state {results['cold']['second_ms']:.0f}ms)")
+
+    ok = saved > 0 and results["preload"]["first_ms"] < results["cold"]["first_ms"]
+    print(f"  {'✅' if ok else '✖'} lazy import is cheaper and preloaded workers skip the cold first request")
+    if not ok:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
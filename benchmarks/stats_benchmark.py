@@ -0,0 +1,89 @@
+# benchmarks/stats_benchmark.py
+#
+# Seller dashboard stats latency as order history grows: live GROUP BY over
+# orders ⋈ products vs the order_stats rollup (utils/stats.py). Also checks
+# that both sources return the same numbers.
+#
+#   python -m benchmarks.stats_benchmark --orders 10000 100000 --products 200 --days 90
+
+import argparse
+import random
+from datetime import datetime, timedelta
+
+from benchmarks.common import use_scratch_database, product_rows, time_calls, summarize
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--orders", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--products", type=int, default=200)
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--calls", type=int, default=50)
+    args = parser.parse_args()
+
+    use_scratch_database("stats")
+
+    from app import app
+    from migrations import upgrade
+    from models import db, User, Product, Order, OrderStat, OrderDailyStat
+    from utils.stats import seller_stats, rebuild_order_stats
+
+    rng = random.Random(5)
+    start_day = datetime.utcnow() - timedelta(days=args.days)
+
+    with app.app_context():
+        upgrade(verbose=False)
+
+        seller = User(name="Seller", email="seller@bench.local", role="seller")
+        buyer = User(name="Buyer", email="buyer@bench.local", role="customer")
+        seller.set_password("bench123")
+        buyer.set_password("bench123")
+        db.session.add_all([seller, buyer])
+        db.session.flush()
+
+        rows = list(product_rows(args.products))
+        for row in rows:
+            row["seller_id"] = seller.id
+        db.session.execute(Product.__table__.insert(), rows)
+        db.session.commit()
+
+        inserted = 0
+        for target in sorted(args.orders):
+            batch = [
+                {
+                    "product_id": rng.randint(1, args.products),
+                    "user_id": buyer.id,
+                    "quantity": rng.randint(1, 3),
+                    "status": rng.choice(["Pending", "Shipped", "Delivered"]),
+                    "created_at": start_day + timedelta(seconds=rng.randint(0, args.days * 86400)),
+                }
+                for _ in range(target - inserted)
+            ]
+            db.session.execute(Order.__table__.insert(), batch)
+            rebuild_order_stats(db.session.connection())
+            db.session.commit()
+            inserted = target
+
+            print(
+                f"\n{inserted:,} orders, {OrderStat.query.count():,} rollup rows, "
+                f"{OrderDailyStat.query.count():,} daily rows"
+            )
+
+            results = {}
+            for enabled in (False, True):
+                app.config["STATS_ROLLUP_ENABLED"] = enabled
+                results[enabled] = seller_stats(seller.id)
+                latencies = time_calls(lambda: seller_stats(seller.id), [()] * args.calls)
+                summarize("rollup" if enabled else "live  ", latencies)
+
+            live, rollup = results[False], results[True]
+            assert live.order_count == rollup.order_count == inserted, (live, rollup)
+            assert live.units == rollup.units and live.by_status == rollup.by_status
+            # recent_revenue is not compared: the rollup counts whole days
+            assert abs(live.revenue - rollup.revenue) < 0.01 * max(live.revenue, 1)
+            assert [t.product_id for t in live.top_products] == [t.product_id for t in rollup.top_products]
+            print("  ✅ rollup matches live aggregates")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+# benchmarks/stock_benchmark.py
+#
+# Concurrent buyers on one hot SKU: N threads POST /orders/place/1 at the
+# same time against a product with limited stock. Reports throughput and
+# lock retries, and asserts zero oversell:
+#   units ordered == initial stock - final stock, and final stock >= 0.
+#
+# --naive runs the old read → check in Python → decrement → commit logic
+# in the same threads for comparison (expect oversell).
+#
+#   python -m benchmarks.stock_benchmark --threads 200 --stock 100
+
+import argparse
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.common import use_scratch_database, product_rows, summarize
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--threads", type=int, default=200)
+    parser.add_argument("--stock", type=int, default=100)
+    parser.add_argument("--buys", type=int, default=1, help="orders attempted per thread")
+    parser.add_argument("--naive", action="store_true", help="also run the old read-check-write path")
+    args = parser.parse_args()
+
+    use_scratch_database("stock")
+
+    from app import app
+    from migrations import upgrade
+    from models import db, User, Product, Order
+    from utils import inventory
+
+    app.config["PAGE_CACHE_ENABLED"] = False
+
+    with app.app_context():
+        upgrade(verbose=False)
+        buyer = User(name="Buyer", email="buyer@bench.local", role="customer")
+        buyer.set_password("bench123")
+        db.session.add(buyer)
+        db.session.execute(Product.__table__.insert(), list(product_rows(10)))
+        db.session.commit()
+        buyer_id = buyer.id
+
+    def reset_stock():
+        with app.app_context():
+            db.session.query(Order).delete()
+            db.session.query(Product).filter_by(id=1).update({"stock": args.stock})
+            db.session.commit()
+
+    def check(label, elapsed, latencies, errors):
+        with app.app_context():
+            final = db.session.get(Product, 1).stock
+            ordered = db.session.query(db.func.coalesce(db.func.sum(Order.quantity), 0)).scalar()
+
+        attempts = args.threads * args.buys
+        summarize(f"{label} ({attempts / elapsed:,.0f} req/s)", latencies)
+        print(f"           ordered {ordered} units, stock {args.stock} → {final}, {errors} errors")
+
+        oversold = ordered - (args.stock - final)
+        if final < 0 or oversold:
+            print(f"           ✖ OVERSOLD by {max(oversold, -final)} units")
+            return False
+        print("           ✅ no oversell")
+        return True
+
+    barrier = threading.Barrier(args.threads)
+
+    def run(buy):
+        latencies, errors = [], [0]
+
+        def worker(_):
+            local = []
+            barrier.wait()
+            for _ in range(args.buys):
+                start = time.perf_counter()
+                try:
+                    buy()
+                except Exception:
+                    errors[0] += 1
+                local.append((time.perf_counter() - start) * 1000)
+            return local
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(args.threads) as pool:
+            for result in pool.map(worker, range(args.threads)):
+                latencies.extend(result)
+        return time.perf_counter() - start, latencies, errors[0]
+
+    # ---------- reservation engine, through the real route ----------
+    def http_buy():
+        client = app.test_client()
+        with client.session_transaction() as s:
+            s.update(logged_in=True, user_id=buyer_id, role="customer")
+        client.post("/orders/place/1", data={"quantity": "1"})
+
+    reset_stock()
+    inventory.counters.update(placed=0, sold_out=0, retries=0, gave_up=0)
+    elapsed, latencies, errors = run(http_buy)
+    ok = check("conditional UPDATE", elapsed, latencies, errors)
+    print(f"           {inventory.counters}")
+
+    # ---------- old read-check-write, for comparison ----------
+    if args.naive:
+        def naive_buy():
+            with app.app_context():
+                product = db.session.get(Product, 1)
+                if product.stock >= 1:
+                    time.sleep(0)  # yield between check and write, as a request would
+                    product.stock -= 1
+                    db.session.add(Order(user_id=buyer_id, product_id=1, quantity=1, status="Pending"))
+                    db.session.commit()
+
+        reset_stock()
+        elapsed, latencies, errors = run(naive_buy)
+        check("naive read-check-write", elapsed, latencies, errors)
+
+    if not ok:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
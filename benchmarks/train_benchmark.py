@@ -0,0 +1,61 @@
+# benchmarks/train_benchmark.py
+#
+# Training time of ml/train_reco.py on synthetic interaction sets.
+#
+#   python -m benchmarks.train_benchmark --rows 1000000,10000000,50000000 --workers 4
+#
+# Product popularity is Zipf-like and basket sizes are skewed, which is
+# what makes the old pure-Python pairwise loop blow up.
+
+import argparse
+import resource
+import time
+
+import numpy as np
+
+
+def synthetic_interactions(rows: int, products: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    users = max(1, rows // 8)
+
+    # zipf(1.3) over product ranks, folded into the catalog size
+    product_ids = (rng.zipf(1.3, size=rows) - 1) % products + 1
+    # a few heavy buyers, many light ones
+    user_ids = (rng.pareto(1.5, size=rows) * users / 20).astype(np.int64) % users + 1
+
+    return user_ids.astype(np.int32), product_ids.astype(np.int32)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", default="1000000,10000000,50000000")
+    parser.add_argument("--products", type=int, default=200_000)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--block-size", type=int, default=4096)
+    parser.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args()
+
+    from ml.train_reco import build_neighbor_table
+
+    for rows in [int(r) for r in args.rows.split(",")]:
+        user_ids, product_ids = synthetic_interactions(rows, args.products)
+
+        start = time.perf_counter()
+        table = build_neighbor_table(
+            user_ids,
+            product_ids,
+            top_k=args.top_k,
+            block_size=args.block_size,
+            workers=args.workers,
+        )
+        elapsed = time.perf_counter() - start
+
+        peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        print(
+            f"rows={rows:>11,}  products_with_neighbours={len(table.product_ids):>8,}  "
+            f"time={elapsed:8.2f}s  rows/s={rows / elapsed:>12,.0f}  peak_rss={peak_mb:,.0f}MB"
+        )
+
+
+if __name__ == "__main__":
+    main()
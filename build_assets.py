@@ -0,0 +1,17 @@
+# build_assets.py
+#
+# Fingerprint static/css + static/js into static/dist/ and write the
+# manifest utils/assets.py reads at startup. Run on deploy, before the
+# app starts (see Procfile); re-run after changing CSS / JS.
+
+import os
+
+from utils.assets import build_manifest
+
+STATIC_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+
+print("🧩 Fingerprinting static assets...")
+manifest = build_manifest(STATIC_FOLDER)
+for logical, fingerprinted in sorted(manifest.items()):
+    print(f"   {logical} → {fingerprinted}")
+print(f"✅ {len(manifest)} assets in static/dist/manifest.json")
@@ -15,8 +15,156 @@ class Config:
 
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
+    # Engine tuning (see database.configure_engine). Development keeps
+    # SQLAlchemy's default pool; SQLite just waits on locks instead of
+    # failing straight away.
+    SQLALCHEMY_ENGINE_OPTIONS = {"pool_pre_ping": True}
+    SQLITE_PRAGMAS = {"busy_timeout": 5000}
+    # serialize this process's SQLite write transactions (utils/inventory.py)
+    SQLITE_WRITE_GATE = True
+
+    # Read replicas for catalog / recommendation reads (utils/replicas.py),
+    # comma-separated URLs. After a write, that visitor reads the primary
+    # for REPLICA_STICKY_SECONDS (read-your-writes).
+    REPLICA_URLS = [u.strip() for u in os.environ.get("DATABASE_REPLICA_URLS", "").split(",") if u.strip()]
+    SQLALCHEMY_BINDS = {f"replica_{i}": url for i, url in enumerate(REPLICA_URLS)}
+    REPLICA_STICKY_SECONDS = int(os.environ.get("REPLICA_STICKY_SECONDS", 10))
+
     # File uploads (product images)
     UPLOAD_FOLDER = os.path.join(BASE_DIR, "uploads", "images")
     MAX_CONTENT_LENGTH = 5 * 1024 * 1024  # 5 MB max per file
+    # WebP variants made by the job worker after upload (utils/image_handler.py)
+    IMAGE_VARIANT_WIDTHS = (200, 400, 800)
+    IMAGE_WEBP_QUALITY = 80
+
+    # Fingerprinted static files (build_assets.py, utils/assets.py) and
+    # write-once uploads are cached by browsers for a year
+    STATIC_FINGERPRINTS = os.environ.get("STATIC_FINGERPRINTS", "1") == "1"
+    STATIC_IMMUTABLE_MAX_AGE = 31536000
+
+    # Password hashing (utils/auth.py). New hashes use PASSWORD_HASH_METHOD;
+    # older hashes are upgraded on the next successful login. Hashing runs
+    # in PASSWORD_HASH_WORKERS low-priority processes per app worker (0 =
+    # inline); at most PASSWORD_HASH_QUEUE logins wait for them, the rest
+    # get a 503 after PASSWORD_HASH_WAIT seconds. PASSWORD_HASH_TIMEOUT caps
+    # the whole wait of one login; keep it below gunicorn's worker timeout
+    # (30 s, gunicorn.conf.py) or the worker is killed before the 503.
+    PASSWORD_HASH_METHOD = os.environ.get("PASSWORD_HASH_METHOD", "scrypt:32768:8:1")
+    PASSWORD_SALT_LENGTH = 16
+    PASSWORD_HASH_WORKERS = int(os.environ.get("PASSWORD_HASH_WORKERS", 1))
+    PASSWORD_HASH_QUEUE = int(os.environ.get("PASSWORD_HASH_QUEUE", 16))
+    PASSWORD_HASH_WAIT = float(os.environ.get("PASSWORD_HASH_WAIT", 2.0))
+    PASSWORD_HASH_TIMEOUT = float(os.environ.get("PASSWORD_HASH_TIMEOUT", 10.0))
+    PASSWORD_HASH_NICE = 10
+
+    # Background jobs (utils/jobs.py, run by `python -m worker`):
+    # task name → "module:function", called with the job payload as kwargs
+    JOB_TASKS = {
+        "images.process": "utils.image_handler:process_image",
+        "ml.update_recommender": "ml.incremental_reco:run_incremental",
+    }
+    JOB_MAX_ATTEMPTS = 5
+    JOB_RETRY_BACKOFF = 10                   # s, doubles per attempt (± jitter)
+    JOB_RETRY_MAX_BACKOFF = 3600
+    JOB_LEASE_SECONDS = 300                  # a job still running after this is re-queued
+    JOB_POLL_INTERVAL = float(os.environ.get("JOB_POLL_INTERVAL", 1.0))
+    JOB_KEEP_DONE_HOURS = 24
+    # orders → one incremental recommender update this many seconds later
+    # (debounced through the job dedup key); 0 = run ml.incremental_reco by hand
+    RECO_UPDATE_DELAY = int(os.environ.get("RECO_UPDATE_DELAY", 300))
+
+    # Page cache for anonymous catalog pages (see utils/cache.py)
+    PAGE_CACHE_ENABLED = os.environ.get("PAGE_CACHE_ENABLED", "1") == "1"
+    PAGE_CACHE_TTL = int(os.environ.get("PAGE_CACHE_TTL", 60))
+    PAGE_CACHE_MAX_ENTRIES = 1024
+    # File (relative → under the instance folder) that shares cached pages
+    # and, above all, invalidations across worker processes. Without it a
+    # product write only invalidates the worker that made it, so the cache
+    # switches itself off when WEB_CONCURRENCY > 1 (see utils/cache.py).
+    # ProductionConfig sets it by default.
+    PAGE_CACHE_SHARED_PATH = os.environ.get("PAGE_CACHE_SHARED_PATH")
+    # worker processes serving the app (gunicorn.conf.py exports it)
+    WEB_CONCURRENCY = int(os.environ.get("WEB_CONCURRENCY", 1))
+
+    # Maintain the order_stats rollup and serve seller dashboards from it
+    # (see utils/stats.py). Run rebuild_stats.py after switching it on.
+    STATS_ROLLUP_ENABLED = os.environ.get("STATS_ROLLUP_ENABLED", "1") == "1"
+
+    # Order placement retries on lock contention (see utils/inventory.py):
+    # attempt n sleeps ORDER_RETRY_BACKOFF * 2^n seconds (± jitter)
+    ORDER_RETRY_ATTEMPTS = 5
+    ORDER_RETRY_BACKOFF = 0.01
+
+    # Request timing, SQL / template time, slow-query log, GET /metrics and
+    # the Server-Timing header (utils/metrics.py)
+    METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "1") == "1"
+    METRICS_TOKEN = os.environ.get("METRICS_TOKEN")          # require "Authorization: Bearer <token>"
+    METRICS_ANONYMOUS = True                                 # no token → open (dev / tests only)
+    SERVER_TIMING_HEADER = os.environ.get("SERVER_TIMING_HEADER", "1") == "1"
+    SLOW_QUERY_MS = float(os.environ.get("SLOW_QUERY_MS", 100))
+    SLOW_QUERY_LOG_SIZE = 100                                # distinct statements kept
+
+    # Per-request SQL statement budget (see utils/query_budget.py).
+    # Routes over budget are logged; STRICT makes them fail (benchmarks/CI).
+    QUERY_BUDGET_ENABLED = os.environ.get("QUERY_BUDGET_ENABLED", "1") == "1"
+    QUERY_BUDGET_STRICT = os.environ.get("QUERY_BUDGET_STRICT", "0") == "1"
+    QUERY_BUDGET_DEFAULT = 12
+    QUERY_BUDGETS = {
+        "products.import_products": 200,     # a few statements per batch, not per row
+    }
+
+    # Seller bulk import (utils/catalog_import.py): rows per upsert transaction,
+    # and how many bad rows are reported back (all of them are counted).
+    # Web uploads are capped by MAX_CONTENT_LENGTH; import_products.py isn't.
+    IMPORT_BATCH_SIZE = int(os.environ.get("IMPORT_BATCH_SIZE", 5000))
+    IMPORT_MAX_ERRORS = 100
 
     # You can add more app-level config here later
+
+
+# -----------------------------------------------------------
+# DEPLOYMENT PROFILES  (APP_PROFILE=development | production)
+# -----------------------------------------------------------
+class DevelopmentConfig(Config):
+    pass
+
+
+class ProductionConfig(Config):
+    # /metrics shows SQL text, endpoints and checkout counters: token only
+    METRICS_ANONYMOUS = False
+
+    # several gunicorn workers → cached pages must be invalidated in all of them
+    PAGE_CACHE_SHARED_PATH = os.environ.get("PAGE_CACHE_SHARED_PATH", "page_cache.db")
+
+    # per gunicorn worker: pool_size steady connections + max_overflow burst
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        "pool_size": int(os.environ.get("DB_POOL_SIZE", 10)),
+        "max_overflow": int(os.environ.get("DB_MAX_OVERFLOW", 20)),
+        "pool_timeout": 10,
+        "pool_pre_ping": True,
+        "pool_recycle": 1800,        # drop connections older than 30 min
+    }
+
+    # WAL: readers never block on the writer (and vice versa);
+    # synchronous=NORMAL is durable across app crashes in WAL mode
+    SQLITE_PRAGMAS = {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "busy_timeout": 5000,        # ms to wait for the write lock
+        "mmap_size": 256 * 1024 * 1024,
+        "cache_size": -64000,        # negative = KiB → 64 MB page cache
+        "temp_store": "MEMORY",
+    }
+
+
+PROFILES = {
+    "development": DevelopmentConfig,
+    "production": ProductionConfig,
+}
+
+
+def get_config(profile: str = None):
+    profile = profile or os.environ.get("APP_PROFILE", "development")
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown APP_PROFILE {profile!r} (choose from {', '.join(PROFILES)})")
+    return PROFILES[profile]
@@ -1,7 +1,12 @@
 # create_db.py
+#
+#   python create_db.py           → create / upgrade schema, keeps data
+#   python create_db.py --reset   → drop everything first (dev only!)
+
+import sys
 
 from app import create_app
-from models import db
+from migrations import upgrade, reset
 
 # Import all models so SQLAlchemy knows them
 from models.user import User
@@ -11,10 +16,11 @@ from models.order import Order
 app = create_app()
 
 with app.app_context():
-    print("⛔ Dropping existing database tables...")
-    db.drop_all()
+    if "--reset" in sys.argv:
+        print("⛔ Dropping existing database tables...")
+        reset()
 
-    print("📦 Creating new database tables...")
-    db.create_all()
+    print("📦 Applying schema migrations...")
+    version = upgrade()
 
-    print("✅ Database reset successfully!")
+    print(f"✅ Database ready (schema version {version})")
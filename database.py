@@ -1,5 +1,99 @@
 # database.py
+import os
+import random
+import time
+import weakref
+
+from flask import g, has_app_context, has_request_context, session as http_session
 from flask_sqlalchemy import SQLAlchemy
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+
+REPLICA_PREFIX = "replica_"
+STICKY_KEY = "db_primary_until"
+
+
+class RoutingSession(Session):
+    """
+    Sends SELECTs to a read replica bind (SQLALCHEMY_BINDS "replica_*")
+    while replica reads are switched on for the current app context
+    (utils/replicas.replica_reads / read_replica), unless this visitor
+    wrote recently (read-your-writes, see `after_commit` below).
+    Flushes, DML and everything else go to the primary.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and not self._flushing:
+            if getattr(clause, "is_select", False) and _replica_reads_wanted():
+                replicas = [e for k, e in self._db.engines.items() if k and k.startswith(REPLICA_PREFIX)]
+                if replicas:
+                    return random.choice(replicas)
+            elif getattr(clause, "is_dml", False):
+                self.info["wrote"] = True
+        elif self._flushing:
+            self.info["wrote"] = True
+
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def _replica_reads_wanted() -> bool:
+    if not has_app_context() or not g.get("db_read_replica"):
+        return False
+    if has_request_context() and http_session.get(STICKY_KEY, 0) > time.time():
+        return False
+    return True
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _stick_to_primary(db_session):
+    """A committed write pins this visitor's reads to the primary for a while."""
+    from flask import current_app
+
+    if db_session.info.pop("wrote", False) and has_request_context():
+        seconds = current_app.config.get("REPLICA_STICKY_SECONDS", 0)
+        if seconds and current_app.config.get("SQLALCHEMY_BINDS"):
+            http_session[STICKY_KEY] = time.time() + seconds
+
+
+@event.listens_for(RoutingSession, "after_rollback")
+def _forget_write(db_session):
+    db_session.info.pop("wrote", None)
+
 
 # Single global SQLAlchemy instance used across models
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={"class_": RoutingSession})
+
+
+# every engine passed through configure_engine (see dispose_engines)
+_engines = weakref.WeakSet()
+
+
+def configure_engine(engine, pragmas: dict) -> None:
+    """
+    Apply SQLite PRAGMAs (config SQLITE_PRAGMAS) to every new DB-API
+    connection of `engine`. No-op for other databases.
+    """
+    _engines.add(engine)
+    if engine.dialect.name != "sqlite" or not pragmas:
+        return
+
+    @event.listens_for(engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+
+def dispose_engines() -> None:
+    """
+    Drop pooled connections inherited from a parent process. Runs in every
+    forked child (gunicorn workers after preload, the password hash pool):
+    close=False leaves the sockets / file handles to the parent that opened
+    them, the child just opens its own on first use.
+    """
+    for engine in list(_engines):
+        engine.dispose(close=False)
+
+
+os.register_at_fork(after_in_child=dispose_engines)
@@ -0,0 +1,66 @@
+# generate_data.py
+#
+# Fill the database with a synthetic marketplace (see utils/datagen.py for
+# the distributions) for benchmarks and recommender training.
+#
+#   python generate_data.py --customers 1000000 --sellers 5000 --products 500000 --orders 3000000
+#   python generate_data.py --reset ...        → drop everything first (dev only!)
+#
+# Rows are appended after the existing ones. Afterwards the category
+# facets, stats rollups and search index are rebuilt from scratch.
+
+import argparse
+import logging
+
+from app import create_app
+from migrations import upgrade, reset
+from models import db
+from utils.categories import rebuild_categories
+from utils.datagen import generate
+from utils.search import is_sqlite, rebuild_search_index
+from utils.stats import rebuild_order_stats
+
+parser = argparse.ArgumentParser(description="Generate and bulk-load a synthetic dataset")
+parser.add_argument("--customers", type=int, default=100_000)
+parser.add_argument("--sellers", type=int, default=1_000)
+parser.add_argument("--products", type=int, default=50_000)
+parser.add_argument("--orders", type=int, default=500_000, help="order lines")
+parser.add_argument("--batch", type=int, default=50_000, help="rows per transaction")
+parser.add_argument("--seed", type=int, default=1)
+parser.add_argument("--password", default="password123", help="password of every generated user")
+parser.add_argument("--keep-indexes", action="store_true", help="don't drop secondary indexes during the load")
+parser.add_argument("--reset", action="store_true")
+args = parser.parse_args()
+
+app = create_app()
+app.logger.setLevel(logging.ERROR)     # every batch would show up in the slow-query log
+
+with app.app_context():
+    if args.reset:
+        print("⛔ Dropping existing database tables...")
+        reset()
+    upgrade(verbose=False)
+
+    print("🏭 Generating synthetic data...")
+    result = generate(
+        db.engine,
+        customers=args.customers,
+        sellers=args.sellers,
+        products=args.products,
+        orders=args.orders,
+        seed=args.seed,
+        batch_size=args.batch,
+        password=args.password,
+        drop_indexes=not args.keep_indexes,
+    )
+    print(f"✅ Loaded in {result['seconds']}s — {result['rows_per_sec']:,} rows/s inserting "
+          f"({result['overall_rows_per_sec']:,} rows/s including generation)")
+
+    print("🔁 Rebuilding categories, stats rollups and search index...")
+    rebuild_categories(db.session.connection())
+    rebuild_order_stats(db.session.connection())
+    db.session.commit()
+    if is_sqlite():
+        rebuild_search_index()
+
+print("✅ Done. To retrain recommendations: python -m ml.data_preparation && python -m ml.train_reco")
@@ -0,0 +1,90 @@
+# gunicorn.conf.py
+#
+# Gunicorn settings (Procfile: gunicorn -c gunicorn.conf.py).
+#
+#   GUNICORN_PROFILE = gthread (default) | sync | gevent
+#   GUNICORN_WORKERS / GUNICORN_THREADS / GUNICORN_CONNECTIONS override the sizing
+#   GUNICORN_BIND (or PORT) sets the listen address
+#
+# Profiles, sized from the CPU count:
+#   sync     2 × CPU + 1 single-threaded workers. Every slow client or
+#            lock wait holds a whole process.
+#   gthread  CPU + 1 workers × 4 threads. The threads of a worker share its
+#            SQLite write gate (utils/inventory.py), so writers queue
+#            in-process instead of polling SQLite's file lock, and share one
+#            page cache / recommender.
+#   gevent   CPU + 1 workers × 200 greenlets (pip install gevent). Cheap
+#            idle / slow keep-alive clients; SQLite calls still block the
+#            event loop, so DB-bound routes gain nothing.
+#
+# SQLite has one writer at a time across ALL workers: more processes
+# mostly means more of them waiting on the lock. Run with
+# APP_PROFILE=production (WAL) so readers never wait for the writer.
+
+import multiprocessing
+import os
+
+CPUS = multiprocessing.cpu_count()
+
+PROFILES = {
+    "sync":    {"worker_class": "sync",    "workers": 2 * CPUS + 1, "threads": 1},
+    "gthread": {"worker_class": "gthread", "workers": CPUS + 1,     "threads": 4},
+    "gevent":  {"worker_class": "gevent",  "workers": CPUS + 1,     "worker_connections": 200},
+}
+
+profile_name = os.environ.get("GUNICORN_PROFILE", "gthread")
+if profile_name not in PROFILES:
+    raise SystemExit(f"GUNICORN_PROFILE must be one of {', '.join(PROFILES)}")
+profile = PROFILES[profile_name]
+
+bind = os.environ.get("GUNICORN_BIND") or f"0.0.0.0:{os.environ.get('PORT', 8000)}"
+
+worker_class = profile["worker_class"]
+workers = int(os.environ.get("GUNICORN_WORKERS", profile["workers"]))
+threads = int(os.environ.get("GUNICORN_THREADS", profile.get("threads", 1)))
+worker_connections = int(os.environ.get("GUNICORN_CONNECTIONS", profile.get("worker_connections", 1000)))
+
+# tell the app how many processes serve it: in-process caches that can't
+# be invalidated across workers turn themselves off (utils/cache.py)
+os.environ["WEB_CONCURRENCY"] = str(workers)
+
+# Build + warm the app once in the master, workers share it copy-on-write
+# (app.preload). Not under gevent: modules imported before the worker
+# monkey-patches would keep blocking locks / sockets.
+if worker_class == "gevent":
+    wsgi_app = "app:app"
+    preload_app = False
+else:
+    wsgi_app = "app:preload()"
+    preload_app = True
+
+# Recycle workers now and then (slow leaks, fragmentation); the jitter keeps
+# them from all restarting at once. gthread / gevent workers close the
+# connections they had accepted but not yet served when they recycle
+# (gunicorn 21): put a retrying proxy in front, or set 0 to turn it off.
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", 1000))
+max_requests_jitter = max_requests // 10
+
+# longer than SQLite's busy_timeout (5 s) and PASSWORD_HASH_TIMEOUT (10 s),
+# so a worker waiting on the write lock or a hash isn't killed for it
+timeout = 30
+graceful_timeout = 30
+keepalive = 5
+
+
+# -----------------------------------------------------------
+# HOOKS
+# -----------------------------------------------------------
+def when_ready(server):
+    server.log.info(
+        "🚀 profile=%s workers=%s threads=%s preload=%s",
+        profile_name, workers, threads if worker_class == "gthread" else "-", preload_app,
+    )
+
+
+def post_fork(server, worker):
+    # the master's pooled connections must never be used by a worker
+    # (database.py also does this for any fork; explicit here for clarity)
+    from database import dispose_engines
+
+    dispose_engines()
@@ -0,0 +1,52 @@
+# import_products.py
+#
+# Bulk import a seller's catalog from a CSV / NDJSON file (see
+# utils/catalog_import.py), without the web upload size limit.
+#
+#   python import_products.py products.csv --seller shop@example.com
+#   python import_products.py products.ndjson --seller 42 --batch-size 10000
+#   zcat feed.ndjson.gz | python import_products.py - --seller 42 --format ndjson
+#
+# Rows with a sku the seller already has update that product.
+
+import argparse
+import logging
+import sys
+
+from app import create_app
+from models import db, User
+from utils.catalog_import import FORMATS, detect_format, import_catalog
+
+parser = argparse.ArgumentParser(description="Bulk import products for one seller")
+parser.add_argument("file", help="CSV / NDJSON file, or - for stdin")
+parser.add_argument("--seller", required=True, help="seller id or email")
+parser.add_argument("--format", choices=FORMATS, help="default: from the file name (csv)")
+parser.add_argument("--batch-size", type=int, help="rows per transaction (IMPORT_BATCH_SIZE)")
+args = parser.parse_args()
+
+app = create_app()
+app.logger.setLevel(logging.ERROR)     # every batch would show up in the slow-query log
+
+with app.app_context():
+    if args.seller.isdigit():
+        seller = db.session.get(User, int(args.seller))
+    else:
+        seller = User.query.filter_by(email=args.seller).first()
+    if seller is None or seller.role not in ("seller", "admin"):
+        sys.exit(f"✖ No seller {args.seller!r}")
+
+    fmt = args.format or detect_format(args.file)
+    stream = sys.stdin.buffer if args.file == "-" else open(args.file, "rb")
+    print(f"📦 Importing {args.file} ({fmt}) for {seller.email}...")
+    with stream:
+        result = import_catalog(stream, fmt, seller.id, batch_size=args.batch_size, max_errors=20)
+
+    for error in result.errors:
+        print(f"  ✖ line {error.line}: {error.message}")
+    if result.failed > len(result.errors):
+        print(f"  … and {result.failed - len(result.errors)} more")
+
+    print(
+        f"✅ {result.rows} rows in {result.seconds:.1f}s ({result.rows_per_sec:,.0f} rows/s): "
+        f"{result.inserted} added, {result.updated} updated, {result.failed} skipped"
+    )
@@ -0,0 +1,201 @@
+# migrations.py
+#
+# Tiny forward-only schema migration layer.
+#
+# Each migration is a numbered function that receives a SQLAlchemy
+# connection. The highest applied number is stored in `schema_version`,
+# so running `upgrade()` again only applies what is new. Migrations must be
+# idempotent (checkfirst / IF NOT EXISTS) because migration 1 creates the
+# *current* model schema on a fresh database, which may already contain
+# what later migrations add.
+
+from sqlalchemy import inspect, text
+
+from database import db
+
+MIGRATIONS = []
+
+
+def migration(version: int, description: str):
+    def decorator(fn):
+        MIGRATIONS.append((version, description, fn))
+        MIGRATIONS.sort(key=lambda m: m[0])
+        return fn
+    return decorator
+
+
+# -----------------------------------------------------------
+# VERSION TABLE
+# -----------------------------------------------------------
+def _ensure_version_table(conn) -> None:
+    conn.execute(text(
+        "CREATE TABLE IF NOT EXISTS schema_version ("
+        "version INTEGER NOT NULL, "
+        "description VARCHAR(200), "
+        "applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)"
+    ))
+
+
+def current_version(conn) -> int:
+    _ensure_version_table(conn)
+    version = conn.execute(text("SELECT MAX(version) FROM schema_version")).scalar()
+    return version or 0
+
+
+def _create_indexes(conn, table) -> None:
+    # indexes come from the *current* model, which may reference columns a
+    # later migration adds — those are created by that migration instead
+    existing = {c["name"] for c in inspect(conn).get_columns(table.name)}
+    for index in table.indexes:
+        if all(c.name in existing for c in index.columns):
+            index.create(conn, checkfirst=True)
+
+
+def has_column(conn, table: str, column: str) -> bool:
+    return any(c["name"] == column for c in inspect(conn).get_columns(table))
+
+
+# -----------------------------------------------------------
+# MIGRATIONS (append new ones at the bottom, never renumber)
+# -----------------------------------------------------------
+@migration(1, "base tables")
+def _base_tables(conn):
+    db.metadata.create_all(conn)
+
+
+@migration(2, "composite indexes for hot query shapes")
+def _hot_path_indexes(conn):
+    from models.product import Product
+    from models.order import Order
+    from models.user import User
+
+    for model in (Product, Order, User):
+        _create_indexes(conn, model.__table__)
+
+
+@migration(3, "product full-text search index")
+def _search_index(conn):
+    from utils.search import CREATE_FTS_SQL, FTS_TABLE
+
+    if conn.dialect.name != "sqlite":
+        return
+
+    conn.execute(text(CREATE_FTS_SQL))
+    conn.execute(text(f"DELETE FROM {FTS_TABLE}"))
+    conn.execute(text(
+        f"INSERT INTO {FTS_TABLE} (rowid, name, category, description) "
+        "SELECT id, name, category, COALESCE(description, '') "
+        "FROM products WHERE is_active = 1"
+    ))
+
+
+@migration(4, "category facet table")
+def _category_facets(conn):
+    from models.category import Category
+    from utils.categories import rebuild_categories
+
+    Category.__table__.create(conn, checkfirst=True)
+    rebuild_categories(conn)
+
+
+@migration(5, "order stats rollup tables")
+def _order_stats(conn):
+    from models.order_stat import OrderStat, OrderDailyStat
+    from utils.stats import rebuild_order_stats
+
+    OrderStat.__table__.create(conn, checkfirst=True)
+    OrderDailyStat.__table__.create(conn, checkfirst=True)
+    rebuild_order_stats(conn)
+
+
+@migration(6, "checkouts + order line columns")
+def _checkouts(conn):
+    from models.checkout import Checkout
+    from models.order import Order
+
+    Checkout.__table__.create(conn, checkfirst=True)
+
+    for column in ("unit_price", "checkout_id"):
+        if not has_column(conn, "orders", column):
+            col = Order.__table__.c[column]
+            ddl = col.type.compile(dialect=conn.dialect)
+            conn.execute(text(f"ALTER TABLE orders ADD COLUMN {column} {ddl}"))
+
+    _create_indexes(conn, Order.__table__)
+
+
+@migration(7, "product image variants")
+def _image_variants(conn):
+    from models.product import Product
+
+    if not has_column(conn, "products", "image_variants"):
+        ddl = Product.__table__.c.image_variants.type.compile(dialect=conn.dialect)
+        conn.execute(text(f"ALTER TABLE products ADD COLUMN image_variants {ddl}"))
+
+
+@migration(8, "background job queue")
+def _jobs(conn):
+    from models.job import Job
+
+    Job.__table__.create(conn, checkfirst=True)
+    _create_indexes(conn, Job.__table__)
+
+
+@migration(9, "product sku for bulk import upserts")
+def _product_sku(conn):
+    from models.product import Product
+
+    if not has_column(conn, "products", "sku"):
+        ddl = Product.__table__.c.sku.type.compile(dialect=conn.dialect)
+        conn.execute(text(f"ALTER TABLE products ADD COLUMN sku {ddl}"))
+    _create_indexes(conn, Product.__table__)
+
+
+@migration(10, "category updated_at index (facet cache version)")
+def _category_version(conn):
+    from models.category import Category
+
+    _create_indexes(conn, Category.__table__)
+
+
+# -----------------------------------------------------------
+# RUNNER
+# -----------------------------------------------------------
+def upgrade(verbose: bool = True) -> int:
+    """Apply pending migrations (call inside an app context). Returns new version."""
+    engine = db.engine
+
+    with engine.begin() as conn:
+        version = current_version(conn)
+
+    for number, description, fn in MIGRATIONS:
+        if number <= version:
+            continue
+
+        if verbose:
+            print(f"⬆ Applying migration {number}: {description}")
+
+        # one transaction per migration: schema change + version bump
+        with engine.begin() as conn:
+            fn(conn)
+            conn.execute(
+                text("INSERT INTO schema_version (version, description) VALUES (:v, :d)"),
+                {"v": number, "d": description},
+            )
+
+        version = number
+
+    return version
+
+
+def reset() -> None:
+    """Drop every table (including the search index) — dev/test only."""
+    from utils.search import FTS_TABLE
+
+    with db.engine.begin() as conn:
+        if conn.dialect.name == "sqlite":
+            conn.execute(text(f"DROP TABLE IF EXISTS {FTS_TABLE}"))
+        conn.execute(text("DROP TABLE IF EXISTS schema_version"))
+
+    db.drop_all()
+
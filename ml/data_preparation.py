@@ -1,27 +1,154 @@
 # ml/data_preparation.py
+#
+#   python -m ml.data_preparation [--since ORDER_ID] [--chunk-size 100000]
+#
+# Streams (user_id, product_id) pairs out of the `orders` table in fixed-size
+# chunks (server-side cursor, never the whole table in memory) into two
+# int32 .npy arrays the trainer can np.load(..., mmap_mode="r"):
+#
+#   ml/interactions/
+#     user_ids.npy      int32 [rows]
+#     product_ids.npy   int32 [rows]
+#     meta.json         {"since": .., "max_order_id": .., "rows": ..}
+#
+# `--since N` exports only orders with id > N (max_order_id of the previous
+# export is the watermark to pass next time) into ml/interactions/since_N/,
+# never over the full export: ml.train_reco trains on ml/interactions/ and
+# refuses an export whose meta.json has since > 0.
 
+import argparse
+import itertools
+import json
 import os
-import sqlite3
-import pandas as pd
+import time
 
-BASE_DIR = os.path.dirname(os.path.dirname(__file__))  # project root
-DB_PATH = os.path.join(BASE_DIR, "ecommerce.db")
-INTERACTIONS_CSV = os.path.join(os.path.dirname(__file__), "interactions.csv")
+import numpy as np
+from sqlalchemy import create_engine, text
 
-def export_interactions():
-    if not os.path.exists(DB_PATH):
-        raise FileNotFoundError(f"Database not found at: {DB_PATH}")
+from config import Config
 
-    conn = sqlite3.connect(DB_PATH)
+INTERACTIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "interactions")
 
-    # "order" table name is reserved word, so quote it
-    query = 'SELECT customer_id, product_id FROM "order"'
-    df = pd.read_sql_query(query, conn)
-    conn.close()
+DEFAULT_CHUNK_SIZE = 100_000
+
+
+# -----------------------------------------------------------
+# STREAMING READ
+# -----------------------------------------------------------
+def iter_order_chunks(conn, since: int = 0, until: int = None, chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """
+    Yield (order_ids, user_ids, product_ids) int arrays of at most chunk_size
+    rows, ordered by orders.id, for since < id <= until.
+    """
+    sql = "SELECT id, user_id, product_id FROM orders WHERE id > :since"
+    params = {"since": since}
+    if until is not None:
+        sql += " AND id <= :until"
+        params["until"] = until
+    sql += " ORDER BY id"
+
+    result = conn.execution_options(
+        stream_results=True, max_row_buffer=chunk_size
+    ).execute(text(sql), params)
+
+    for rows in result.partitions(chunk_size):
+        flat = itertools.chain.from_iterable(rows)
+        chunk = np.fromiter(flat, dtype=np.int64, count=3 * len(rows)).reshape(-1, 3)
+        yield chunk[:, 0], chunk[:, 1], chunk[:, 2]
+
+
+def order_range(conn, since: int = 0):
+    """(row count, max id) of orders after the watermark — fixes the export size."""
+    count, max_id = conn.execute(
+        text("SELECT COUNT(*), MAX(id) FROM orders WHERE id > :since"),
+        {"since": since},
+    ).one()
+    return count, max_id
+
+
+# -----------------------------------------------------------
+# EXPORT
+# -----------------------------------------------------------
+def export_dir(since: int = 0) -> str:
+    """Full export → ml/interactions/, watermark export → ml/interactions/since_N/."""
+    return INTERACTIONS_DIR if not since else os.path.join(INTERACTIONS_DIR, f"since_{since}")
+
+
+def export_interactions(
+    since: int = 0,
+    out_dir: str = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    url: str = None,
+) -> dict:
+    out_dir = out_dir or export_dir(since)
+    engine = create_engine(url or Config.SQLALCHEMY_DATABASE_URI)
+    os.makedirs(out_dir, exist_ok=True)
+
+    start = time.perf_counter()
+
+    with engine.connect() as conn:
+        count, max_id = order_range(conn, since)
+
+        # arrays are disk-backed; each chunk is written straight through
+        tmp_users = os.path.join(out_dir, "user_ids.tmp.npy")
+        tmp_products = os.path.join(out_dir, "product_ids.tmp.npy")
+        users = np.lib.format.open_memmap(tmp_users, mode="w+", dtype=np.int32, shape=(count,))
+        products = np.lib.format.open_memmap(tmp_products, mode="w+", dtype=np.int32, shape=(count,))
+
+        written = 0
+        for _, chunk_users, chunk_products in iter_order_chunks(conn, since, max_id, chunk_size):
+            n = min(len(chunk_users), count - written)
+            users[written:written + n] = chunk_users[:n]
+            products[written:written + n] = chunk_products[:n]
+            written += n
+
+    users.flush()
+    products.flush()
+    del users, products
+
+    if written < count:
+        # orders deleted mid-export → trim (rare, so a copy is fine)
+        for path in (tmp_users, tmp_products):
+            trimmed = np.array(np.load(path, mmap_mode="r")[:written])
+            np.save(path, trimmed)
+
+    os.replace(tmp_users, os.path.join(out_dir, "user_ids.npy"))
+    os.replace(tmp_products, os.path.join(out_dir, "product_ids.npy"))
+
+    meta = {"since": since, "max_order_id": max_id or since, "rows": written}
+    with open(os.path.join(out_dir, "meta.json"), "w") as f:
+        json.dump(meta, f)
+
+    elapsed = time.perf_counter() - start
+    print(
+        f"[ML] Exported {written} interactions (orders {since + 1}..{meta['max_order_id']}) "
+        f"to {out_dir} in {elapsed:.2f}s ({written / max(elapsed, 1e-9):,.0f} rows/s)"
+    )
+    return meta
+
+
+def load_meta(out_dir: str = INTERACTIONS_DIR) -> dict:
+    """meta.json of an export ({} for exports made before it existed)."""
+    path = os.path.join(out_dir, "meta.json")
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def load_interactions(out_dir: str = INTERACTIONS_DIR, mmap: bool = True):
+    """(user_ids, product_ids) memory-mapped from the last export."""
+    mode = "r" if mmap else None
+    return (
+        np.load(os.path.join(out_dir, "user_ids.npy"), mmap_mode=mode),
+        np.load(os.path.join(out_dir, "product_ids.npy"), mmap_mode=mode),
+    )
 
-    df.to_csv(INTERACTIONS_CSV, index=False)
-    print(f"[ML] Exported interactions to {INTERACTIONS_CSV}")
-    print(df.head())
 
 if __name__ == "__main__":
-    export_interactions()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Export order interactions for training")
+    parser.add_argument("--since", type=int, default=0, help="only orders with id > SINCE")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    export_interactions(since=args.since, chunk_size=args.chunk_size)
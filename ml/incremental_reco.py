@@ -0,0 +1,321 @@
+# ml/incremental_reco.py
+#
+#   python -m ml.incremental_reco            → consume new orders, publish
+#   python -m ml.incremental_reco --verify   → also check == full retrain on
+#                                              a fresh read of the orders table
+#   python -m ml.incremental_reco --rebuild  → drop state, start from order 0
+#
+# Keeps the training state between runs:
+#   X  binary users × products incidence (indexed by the real ids)
+#   C  co-occurrence counts Xᵀ·X
+#   last_order_id  high-water mark on orders.id
+#
+# A run reads only orders with id > last_order_id, turns the genuinely new
+# (user, product) pairs into ΔX and updates
+#   C' = C + D + Dᵀ - ΔXᵀ·ΔX      with D = ΔXᵀ·(X + ΔX)
+# which equals (X + ΔX)ᵀ·(X + ΔX). Only rows of C' that changed get their
+# top-k recomputed; the rest are copied from the live model.
+#
+# Orders deleted after they were consumed are NOT unlearned — run with
+# --rebuild (or ml.train_reco) periodically if sellers delete orders.
+#
+# --verify publishes like a normal run. The side-effect-free equivalence
+# check (scratch DB, temp dirs, several batches) is
+# benchmarks/incremental_reco_benchmark.py.
+
+import argparse
+import json
+import os
+import time
+from contextlib import contextmanager
+
+import numpy as np
+from scipy import sparse
+from flask import has_app_context
+from sqlalchemy import create_engine
+
+from config import Config
+from ml.data_preparation import iter_order_chunks
+from ml.model_store import MODEL_DIR, NeighborTable, load_table, model_signature, save_table
+from ml.train_reco import build_neighbor_table, top_k_rows
+
+STATE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "reco_state.npz")
+
+
+# -----------------------------------------------------------
+# STATE
+# -----------------------------------------------------------
+def empty_state(top_k: int, min_cooccurrence: int) -> dict:
+    return {
+        "X": sparse.csr_matrix((0, 0), dtype=np.float32),
+        "C": sparse.csr_matrix((0, 0), dtype=np.float32),
+        "last_order_id": 0,
+        "top_k": top_k,
+        "min_cooccurrence": min_cooccurrence,
+        "model_version": None,
+    }
+
+
+def load_state(path: str = STATE_PATH):
+    if not os.path.exists(path):
+        return None
+
+    with np.load(path, allow_pickle=False) as f:
+        meta = json.loads(str(f["meta"]))
+        X = sparse.csr_matrix(
+            (f["X_data"], f["X_indices"], f["X_indptr"]), shape=tuple(f["X_shape"])
+        )
+        C = sparse.csr_matrix(
+            (f["C_data"], f["C_indices"], f["C_indptr"]), shape=tuple(f["C_shape"])
+        )
+
+    return dict(meta, X=X, C=C)
+
+
+def save_state(state: dict, path: str = STATE_PATH) -> None:
+    """Single-file write + os.replace → a crash never leaves half a state."""
+    meta = {k: v for k, v in state.items() if k not in ("X", "C")}
+    arrays = {"meta": np.array(json.dumps(meta))}
+
+    for name in ("X", "C"):
+        m = state[name]
+        arrays[f"{name}_data"] = m.data
+        arrays[f"{name}_indices"] = m.indices
+        arrays[f"{name}_indptr"] = m.indptr
+        arrays[f"{name}_shape"] = np.array(m.shape)
+
+    tmp = f"{path}.{os.getpid()}.tmp.npz"
+    np.savez(tmp, **arrays)
+    os.replace(tmp, path)
+
+
+# -----------------------------------------------------------
+# NEW ORDERS
+# -----------------------------------------------------------
+@contextmanager
+def _connect(url: str = None):
+    """
+    The app's engine when running as a job (inside app.app_context(), no
+    url) — its config, its pool. Otherwise a one-off engine on url, disposed
+    afterwards so a long-lived caller doesn't collect pools.
+    """
+    if url is None and has_app_context():
+        from models import db
+
+        with db.engine.connect() as conn:
+            yield conn
+        return
+
+    engine = create_engine(url or Config.SQLALCHEMY_DATABASE_URI)
+    try:
+        with engine.connect() as conn:
+            yield conn
+    finally:
+        engine.dispose()
+
+
+def fetch_orders_since(last_order_id: int, url: str = None):
+    """(user_ids, product_ids, max_order_id) of orders after the mark."""
+    users, products = [], []
+    max_id = last_order_id
+
+    with _connect(url) as conn:
+        for order_ids, chunk_users, chunk_products in iter_order_chunks(conn, since=last_order_id):
+            users.append(chunk_users)
+            products.append(chunk_products)
+            max_id = int(order_ids[-1])
+
+    if not users:
+        return np.zeros(0, np.int64), np.zeros(0, np.int64), max_id
+
+    return np.concatenate(users), np.concatenate(products), max_id
+
+
+# -----------------------------------------------------------
+# UPDATE
+# -----------------------------------------------------------
+def _grow(m, shape):
+    m = m.tocsr(copy=True)
+    m.resize(shape)
+    return m
+
+
+def apply_interactions(state: dict, user_ids, product_ids):
+    """Fold new (user, product) pairs into X and C. Returns changed product ids."""
+    X, C = state["X"], state["C"]
+    if len(user_ids) == 0:
+        return np.zeros(0, np.int64)
+
+    n_users = max(X.shape[0], int(user_ids.max()) + 1)
+    n_products = max(X.shape[1], int(product_ids.max()) + 1)
+    X = _grow(X, (n_users, n_products))
+    C = _grow(C, (n_products, n_products))
+
+    delta = sparse.csr_matrix(
+        (np.ones(len(user_ids), dtype=np.float32), (user_ids, product_ids)),
+        shape=(n_users, n_products),
+    )
+    delta.sum_duplicates()
+    delta.data[:] = 1.0
+    # pairs the user already bought before contribute nothing new
+    delta = (delta - delta.multiply(X)).tocsr()
+    delta.eliminate_zeros()
+
+    if delta.nnz == 0:
+        state["X"], state["C"] = X, C
+        return np.zeros(0, np.int64)
+
+    X_new = (X + delta).tocsr()
+    delta_T = delta.T.tocsr()
+    D = (delta_T @ X_new).tocsr()
+    C_new = (C + D + D.T - delta_T @ delta).tocsr()
+    C_new.eliminate_zeros()
+
+    # rows that changed: the newly bought products and everything they co-occur with
+    changed = np.unique(D.indices)
+
+    state["X"], state["C"] = X_new, C_new
+    return changed
+
+
+def recompute_rows(state: dict, product_ids):
+    """Top-k rows for the given products, straight from C."""
+    product_ids = np.asarray(product_ids, dtype=np.int64)
+    block = state["C"][product_ids].tocsr()
+    return top_k_rows(block, state["top_k"], state["min_cooccurrence"], product_ids)
+
+
+def merge_rows(table: NeighborTable, product_ids, counts, cols, scores) -> NeighborTable:
+    """Replace the rows for product_ids in `table` (rows with 0 neighbours vanish)."""
+    if table is None:
+        old_pids = np.zeros(0, np.int32)
+        old_lens = np.zeros(0, np.int64)
+        old_neighbors = np.zeros(0, np.int32)
+        old_scores = np.zeros(0, np.float32)
+    else:
+        keep = ~np.isin(table.product_ids, product_ids)
+        lens = np.diff(table.offsets)
+        entry_keep = np.repeat(keep, lens)
+        old_pids = np.asarray(table.product_ids)[keep]
+        old_lens = lens[keep]
+        old_neighbors = np.asarray(table.neighbors)[entry_keep]
+        old_scores = np.asarray(table.scores)[entry_keep]
+
+    has = counts > 0
+    pids = np.concatenate([old_pids, np.asarray(product_ids)[has]]).astype(np.int32)
+    lens = np.concatenate([old_lens, counts[has]]).astype(np.int64)
+    neighbors = np.concatenate([old_neighbors, cols]).astype(np.int32)
+    all_scores = np.concatenate([old_scores, scores]).astype(np.float32)
+
+    # reorder whole segments by product id
+    order = np.argsort(pids, kind="stable")
+    starts = np.concatenate(([0], np.cumsum(lens)[:-1]))
+    lens_sorted = lens[order]
+    offsets = np.zeros(len(pids) + 1, dtype=np.int64)
+    np.cumsum(lens_sorted, out=offsets[1:])
+    gather = np.repeat(starts[order] - offsets[:-1], lens_sorted) + np.arange(offsets[-1])
+
+    return NeighborTable(
+        product_ids=pids[order],
+        offsets=offsets,
+        neighbors=neighbors[gather],
+        scores=all_scores[gather],
+    )
+
+
+# -----------------------------------------------------------
+# RUN
+# -----------------------------------------------------------
+def run_incremental(
+    top_k: int = 10,
+    min_cooccurrence: int = 1,
+    rebuild: bool = False,
+    url: str = None,
+    state_path: str = STATE_PATH,
+    model_dir: str = MODEL_DIR,
+):
+    state = None if rebuild else load_state(state_path)
+    live = None
+
+    if state is None:
+        state = empty_state(top_k, min_cooccurrence)
+    elif model_signature(model_dir):
+        live = load_table(model_dir, mmap=False)
+        # someone published a model we did not build (e.g. ml.train_reco)
+        if live.version != state.get("model_version"):
+            live = None
+
+    params_changed = (state["top_k"], state["min_cooccurrence"]) != (top_k, min_cooccurrence)
+    state["top_k"], state["min_cooccurrence"] = top_k, min_cooccurrence
+
+    start = time.perf_counter()
+    users, products, max_id = fetch_orders_since(state["last_order_id"], url)
+    changed = apply_interactions(state, users, products)
+
+    if params_changed or live is None:
+        # nothing reusable → recompute every row (still no pairwise loop)
+        changed = np.unique(state["C"].tocoo().row)
+        live = None
+
+    if len(users) == 0 and live is not None:
+        print(f"[ML] No new orders since #{state['last_order_id']}.")
+        return None
+
+    counts, cols, scores = recompute_rows(state, changed)
+    table = merge_rows(live, changed, counts, cols, scores)
+
+    state["last_order_id"] = int(max_id)
+
+    # publish model first: if we crash before saving state, the next run
+    # simply re-applies the same orders to the old state
+    version = save_table(table, model_dir)
+    state["model_version"] = version
+    save_state(state, state_path)
+
+    print(
+        f"[ML] Consumed {len(users)} orders (up to #{state['last_order_id']}), "
+        f"updated {len(changed)} products in {time.perf_counter() - start:.2f}s → {version}"
+    )
+    return table
+
+
+def verify_against_full(table: NeighborTable, state: dict, url: str = None) -> bool:
+    """
+    A full retrain on every order up to the watermark, read again from the
+    database (not from the state's X), must match exactly: a missed order or
+    a wrong watermark shows up as a mismatch.
+    """
+    users, products = [np.zeros(0, np.int64)], [np.zeros(0, np.int64)]
+    with _connect(url) as conn:
+        for _, chunk_users, chunk_products in iter_order_chunks(conn, 0, state["last_order_id"]):
+            users.append(chunk_users)
+            products.append(chunk_products)
+
+    full = build_neighbor_table(
+        np.concatenate(users), np.concatenate(products),
+        top_k=state["top_k"], min_cooccurrence=state["min_cooccurrence"],
+    )
+
+    same = all(
+        np.array_equal(np.asarray(getattr(table, name)), np.asarray(getattr(full, name)))
+        for name in ("product_ids", "offsets", "neighbors", "scores")
+    )
+    print("[ML] Incremental == full retrain:", "✅ identical" if same else "✖ MISMATCH")
+    return same
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Incremental recommender training")
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--min-cooccurrence", type=int, default=1)
+    parser.add_argument("--rebuild", action="store_true")
+    parser.add_argument("--verify", action="store_true")
+    args = parser.parse_args()
+
+    url = Config.SQLALCHEMY_DATABASE_URI
+    result = run_incremental(args.top_k, args.min_cooccurrence, rebuild=args.rebuild, url=url)
+
+    if args.verify:
+        table = result if result is not None else load_table(mmap=False)
+        ok = verify_against_full(table, load_state(), url=url)
+        raise SystemExit(0 if ok else 1)
@@ -0,0 +1,162 @@
+# ml/model_store.py
+#
+# On-disk format for the recommender: a CSR-style neighbour table stored as
+# plain .npy arrays so workers can np.load(..., mmap_mode="r") them and share
+# the pages through the OS page cache.
+#
+#   reco_model/
+#     CURRENT              → name of the live version dir (swapped atomically)
+#     v20250101T120000_123/
+#       product_ids.npy    int32  [n]     sorted source product ids
+#       offsets.npy        int64  [n + 1] row i = neighbors[offsets[i]:offsets[i+1]]
+#       neighbors.npy      int32  [nnz]   neighbour product ids, best first
+#       scores.npy         float32[nnz]   co-occurrence score per neighbour
+#
+# The legacy pickle (dict: product_id → [similar ids]) is still readable.
+
+import os
+import pickle
+import shutil
+import time
+from typing import NamedTuple
+
+import numpy as np
+
+ML_DIR = os.path.dirname(os.path.abspath(__file__))
+MODEL_DIR = os.path.join(ML_DIR, "reco_model")
+LEGACY_PICKLE = os.path.join(ML_DIR, "reco_model.pkl")
+
+ARRAYS = ("product_ids", "offsets", "neighbors", "scores")
+KEEP_VERSIONS = 3
+
+
+class NeighborTable(NamedTuple):
+    product_ids: np.ndarray
+    offsets: np.ndarray
+    neighbors: np.ndarray
+    scores: np.ndarray
+    version: str = None
+
+    def row(self, product_id: int):
+        """(neighbour ids, scores) for one product — empty arrays if unknown."""
+        i = np.searchsorted(self.product_ids, product_id)
+        if i >= len(self.product_ids) or self.product_ids[i] != product_id:
+            return self.neighbors[:0], self.scores[:0]
+
+        start, end = self.offsets[i], self.offsets[i + 1]
+        return self.neighbors[start:end], self.scores[start:end]
+
+    def as_dict(self) -> dict:
+        return {
+            int(pid): [int(n) for n in self.row(pid)[0]]
+            for pid in self.product_ids
+        }
+
+
+# -----------------------------------------------------------
+# BUILD
+# -----------------------------------------------------------
+def table_from_dict(similar: dict, scores: dict = None) -> NeighborTable:
+    """
+    similar : {product_id: [neighbour ids, best first]}
+    scores  : optional {product_id: [score per neighbour]}; defaults to
+              rank-based scores (1.0, 0.5, 0.33, ...)
+    """
+    product_ids = np.array(sorted(similar), dtype=np.int32)
+    offsets = np.zeros(len(product_ids) + 1, dtype=np.int64)
+
+    neighbor_rows, score_rows = [], []
+    for i, pid in enumerate(product_ids):
+        row = list(similar[int(pid)])
+        neighbor_rows.append(np.asarray(row, dtype=np.int32))
+
+        if scores is not None:
+            score_rows.append(np.asarray(scores[int(pid)], dtype=np.float32))
+        else:
+            score_rows.append(1.0 / np.arange(1, len(row) + 1, dtype=np.float32))
+
+        offsets[i + 1] = offsets[i] + len(row)
+
+    empty_i = np.zeros(0, dtype=np.int32)
+    empty_f = np.zeros(0, dtype=np.float32)
+
+    return NeighborTable(
+        product_ids=product_ids,
+        offsets=offsets,
+        neighbors=np.concatenate(neighbor_rows) if neighbor_rows else empty_i,
+        scores=np.concatenate(score_rows) if score_rows else empty_f,
+    )
+
+
+# -----------------------------------------------------------
+# SAVE (atomic publish)
+# -----------------------------------------------------------
+def save_table(table: NeighborTable, model_dir: str = MODEL_DIR) -> str:
+    """
+    Write a new version dir, then atomically point CURRENT at it.
+    Readers either see the old version or the complete new one.
+    """
+    ns = time.time_ns()
+    version = time.strftime("v%Y%m%dT%H%M%S", time.gmtime(ns // 10**9)) + f"_{ns // 1000 % 10**6:06d}"
+    target = os.path.join(model_dir, version)
+    os.makedirs(target)
+
+    for name in ARRAYS:
+        np.save(os.path.join(target, f"{name}.npy"), getattr(table, name))
+
+    tmp = os.path.join(model_dir, f"CURRENT.{os.getpid()}.tmp")
+    with open(tmp, "w") as f:
+        f.write(version)
+    os.replace(tmp, os.path.join(model_dir, "CURRENT"))
+
+    _prune_old_versions(model_dir, keep=version)
+    return version
+
+
+def _prune_old_versions(model_dir: str, keep: str) -> None:
+    versions = sorted(
+        d for d in os.listdir(model_dir)
+        if d.startswith("v") and os.path.isdir(os.path.join(model_dir, d))
+    )
+    # never delete the live one; old mmaps stay valid until the reader drops them
+    stale = [v for v in versions if v != keep][: max(0, len(versions) - KEEP_VERSIONS)]
+    for version in stale:
+        shutil.rmtree(os.path.join(model_dir, version), ignore_errors=True)
+
+
+# -----------------------------------------------------------
+# LOAD
+# -----------------------------------------------------------
+def model_signature(model_dir: str = MODEL_DIR):
+    """Cheap fingerprint of whatever model is on disk (None → no model)."""
+    for path in (os.path.join(model_dir, "CURRENT"), LEGACY_PICKLE):
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            continue
+        if st.st_size > 0:
+            return path, st.st_mtime_ns, st.st_size
+    return None
+
+
+def load_table(model_dir: str = MODEL_DIR, mmap: bool = True) -> NeighborTable:
+    """Load the live version (memory-mapped) or convert the legacy pickle."""
+    current = os.path.join(model_dir, "CURRENT")
+
+    if os.path.exists(current):
+        with open(current) as f:
+            version = f.read().strip()
+
+        arrays = {
+            name: np.load(
+                os.path.join(model_dir, version, f"{name}.npy"),
+                mmap_mode="r" if mmap else None,
+            )
+            for name in ARRAYS
+        }
+        return NeighborTable(version=version, **arrays)
+
+    with open(LEGACY_PICKLE, "rb") as f:
+        similar = pickle.load(f)
+
+    return table_from_dict(similar)._replace(version="legacy-pickle")
@@ -1,45 +1,161 @@
 # ml/recommender.py
 
-import pickle
+import threading
+import time
 
-# Load ML model if available
-try:
-    model = pickle.load(open("ml/reco_model.pkl", "rb"))
-except:
-    print("⚠ ML model not found. Using fallback recommender.")
-    model = None
+import numpy as np
+
+from ml.model_store import MODEL_DIR, load_table, model_signature
+
+# how often (seconds) to stat the model file / refresh the active-id set
+RELOAD_CHECK_INTERVAL = 5.0
+ACTIVE_REFRESH_INTERVAL = 60.0
+
+
+class Recommender:
+    """
+    In-memory "customers also bought" service.
+
+    - neighbour table is array-backed (see ml/model_store.py) and mmapped
+    - hot-reloads when the model on disk changes (checked every few seconds,
+      no worker restart needed)
+    - keeps a sorted array of active product ids so inactive neighbours are
+      dropped BEFORE touching the DB → one batched product fetch per call
+    """
+
+    def __init__(self, model_dir: str = MODEL_DIR):
+        self.model_dir = model_dir
+        self._table = None
+        self._signature = None
+        self._next_check = 0.0
+
+        self._active_ids = None
+        self._active_expires = 0.0
+
+        self._lock = threading.Lock()
+
+    # -------------------------------------------------------
+    # MODEL (hot reload)
+    # -------------------------------------------------------
+    def _current_table(self):
+        now = time.monotonic()
+        if now < self._next_check:
+            return self._table
+
+        with self._lock:
+            if now < self._next_check:
+                return self._table
+
+            signature = model_signature(self.model_dir)
+            if signature != self._signature:
+                try:
+                    self._table = load_table(self.model_dir) if signature else None
+                except Exception as e:
+                    print("⚠ ML model load failed, keeping previous model:", e)
+                self._signature = signature
+
+            self._next_check = now + RELOAD_CHECK_INTERVAL
+
+        return self._table
+
+    def load(self) -> bool:
+        """Map the model now instead of on the first request; True if one exists."""
+        return self._current_table() is not None
+
+    def reload(self) -> None:
+        """Force a model re-check on the next call."""
+        self._next_check = 0.0
+        self._signature = None
+
+    # -------------------------------------------------------
+    # ACTIVE PRODUCT SET
+    # -------------------------------------------------------
+    def _active(self) -> np.ndarray:
+        now = time.monotonic()
+        if self._active_ids is not None and now < self._active_expires:
+            return self._active_ids
+
+        from models import db
+        from models.product import Product
+
+        ids = db.session.execute(
+            db.select(Product.id).filter_by(is_active=True)
+        ).scalars().all()
+
+        self._active_ids = np.array(sorted(ids), dtype=np.int32)
+        self._active_expires = now + ACTIVE_REFRESH_INTERVAL
+        return self._active_ids
+
+    def invalidate_active(self) -> None:
+        self._active_expires = 0.0
+
+    # -------------------------------------------------------
+    # QUERIES
+    # -------------------------------------------------------
+    def top_k_ids(self, product_id: int, k: int = 6) -> list:
+        """Best k active neighbour ids (no DB product fetch)."""
+        table = self._current_table()
+        if table is None:
+            return []
+
+        neighbors, _ = table.row(product_id)
+        if len(neighbors) == 0:
+            return []
+
+        active = self._active()
+        pos = np.searchsorted(active, neighbors)
+        pos[pos >= len(active)] = 0
+        keep = (len(active) > 0) & (active[pos] == neighbors)
+
+        return [int(n) for n in neighbors[keep][:k]]
+
+    def top_k(self, product_id: int, k: int = 6) -> list:
+        """Best k active neighbour Products, in score order (one query)."""
+        from models.product import Product
+
+        ids = self.top_k_ids(product_id, k)
+        if not ids:
+            return []
+
+        # primary-key lookup only: adding is_active to the WHERE lets SQLite
+        # pick an is_active index and walk most of the table instead
+        products = Product.query.filter(Product.id.in_(ids)).all()
+
+        by_id = {p.id: p for p in products if p.is_active}
+        return [by_id[i] for i in ids if i in by_id]
+
+
+# Module-level service (one per worker process; mmapped pages are shared)
+recommender = Recommender()
 
 
 def get_recommendations(product, limit=6):
     """
-    Returns recommended products:
+    Returns recommended products (read from a replica, if configured):
     1. ML-based recommendations (if model exists)
     2. Fallback: category-based recommendations
+    3. Fallback: trending products
     """
 
-    from models.product import Product
+    from utils.replicas import read_replica
 
     if not product:
         return []
 
+    with read_replica():
+        return _recommend(product, limit)
+
+
+def _recommend(product, limit):
+    from models.product import Product
+
     # ---------------------------------------------
     # 1️⃣ ML MODEL RECOMMENDATIONS
     # ---------------------------------------------
     try:
-        if model and hasattr(model, "get"):
-            recommended_ids = model.get(product.id, [])
-
-            if recommended_ids:
-                recos = (
-                    Product.query
-                    .filter(Product.id.in_(recommended_ids))
-                    .filter_by(is_active=True)
-                    .all()
-                )
-
-                if len(recos) >= 3:   # enough results?
-                    return recos[:limit]
-
+        recos = recommender.top_k(product.id, limit)
+        if len(recos) >= 3:   # enough results?
+            return recos
     except Exception as e:
         print("⚠ ML Model Error:", e)
 
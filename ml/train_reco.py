@@ -1,62 +1,194 @@
 # ml/train_reco.py
+#
+#   python -m ml.train_reco [--top-k 10] [--min-cooccurrence 1] [--workers 4]
+#
+# Item-item co-occurrence on a sparse user × product incidence matrix X:
+#   C = Xᵀ·X   (C[i, j] = number of customers who bought both i and j)
+# computed one block of product rows at a time so memory stays bounded,
+# then the top-k neighbours of every row are kept.
 
+import argparse
 import os
-import itertools
-import pickle
-import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
 
-BASE_DIR = os.path.dirname(os.path.dirname(__file__))  # project root
-INTERACTIONS_CSV = os.path.join(os.path.dirname(__file__), "interactions.csv")
-MODEL_PATH = os.path.join(os.path.dirname(__file__), "reco_model.pkl")
+import numpy as np
+from scipy import sparse
 
-def train_recommender(min_cooccurrence: int = 1, top_k: int = 10):
-    if not os.path.exists(INTERACTIONS_CSV):
-        raise FileNotFoundError(
-            f"Interactions file not found at: {INTERACTIONS_CSV}. "
-            f"Run data_preparation.py first."
-        )
+from ml.data_preparation import INTERACTIONS_DIR, load_interactions, load_meta
+from ml.model_store import MODEL_DIR, NeighborTable, save_table
 
-    df = pd.read_csv(INTERACTIONS_CSV)
+DEFAULT_BLOCK_SIZE = 4096
 
-    if df.empty:
-        print("[ML] No interactions found. Train after some orders are placed.")
-        return
 
-    # group products per customer
-    user_products = (
-        df.groupby("customer_id")["product_id"]
-        .apply(list)
-        .reset_index()
+# -----------------------------------------------------------
+# INCIDENCE MATRIX
+# -----------------------------------------------------------
+def build_incidence(user_ids, product_ids):
+    """
+    Binary users × products CSR matrix (repeat purchases count once).
+    Returns (X, product_index) where product_index[col] = real product id.
+    """
+    user_ids = np.asarray(user_ids)
+    product_ids = np.asarray(product_ids)
+
+    user_index, user_col = np.unique(user_ids, return_inverse=True)
+    product_index, product_col = np.unique(product_ids, return_inverse=True)
+
+    X = sparse.csr_matrix(
+        (np.ones(len(user_col), dtype=np.float32), (user_col, product_col)),
+        shape=(len(user_index), len(product_index)),
     )
+    X.sum_duplicates()
+    X.data[:] = 1.0
+
+    return X, product_index.astype(np.int32)
+
+
+# -----------------------------------------------------------
+# BLOCK WORKER
+# -----------------------------------------------------------
+_X = None
+_XT = None
+
+
+def _init_worker(X, XT):
+    global _X, _XT
+    _X, _XT = X, XT
+
+
+def top_k_rows(C, top_k: int, min_cooccurrence: int, row_ids):
+    """
+    Top-k entries of every row of a sparse CSR block C whose row i is
+    product column row_ids[i] (that diagonal entry is dropped: a product is
+    not its own neighbour). Ties go to the lower product index so results
+    are deterministic. Returns (row_counts, cols, scores), best first per row.
+    """
+    rows = np.repeat(np.arange(C.shape[0]), np.diff(C.indptr))
+    cols, data = C.indices, C.data
+
+    keep = (cols != np.asarray(row_ids)[rows]) & (data >= max(min_cooccurrence, 1))
+    rows, cols, data = rows[keep], cols[keep], data[keep]
+
+    # sort by row, then score desc, then neighbour asc
+    order = np.lexsort((cols, -data, rows))
+    rows, cols, data = rows[order], cols[order], data[order]
+
+    row_counts = np.bincount(rows, minlength=C.shape[0])
+    row_starts = np.concatenate(([0], np.cumsum(row_counts)[:-1]))
+    rank = np.arange(len(rows)) - row_starts[rows]
+
+    keep = rank < top_k
+    return np.minimum(row_counts, top_k), cols[keep], data[keep]
+
+
+def _train_block(args):
+    start, stop, top_k, min_cooccurrence = args
 
-    co_counts = {}
+    C = (_XT[start:stop] @ _X).tocsr()    # (stop - start) × products
+    return (start,) + top_k_rows(C, top_k, min_cooccurrence, np.arange(start, stop))
 
-    for _, row in user_products.iterrows():
-        products = list(set(row["product_id"]))
-        if len(products) < 2:
-            continue
 
-        for p1, p2 in itertools.combinations(sorted(products), 2):
-            co_counts.setdefault(p1, {})
-            co_counts.setdefault(p2, {})
+# -----------------------------------------------------------
+# TRAIN
+# -----------------------------------------------------------
+def build_neighbor_table(
+    user_ids,
+    product_ids,
+    top_k: int = 10,
+    min_cooccurrence: int = 1,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+    workers: int = 1,
+) -> NeighborTable:
+    X, product_index = build_incidence(user_ids, product_ids)
+    XT = X.T.tocsr()
 
-            co_counts[p1][p2] = co_counts[p1].get(p2, 0) + 1
-            co_counts[p2][p1] = co_counts[p2].get(p1, 0) + 1
+    n_products = X.shape[1]
+    blocks = [
+        (start, min(start + block_size, n_products), top_k, min_cooccurrence)
+        for start in range(0, n_products, block_size)
+    ]
 
-    similar_products = {}
+    if workers > 1 and len(blocks) > 1:
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(X, XT)) as pool:
+            results = list(pool.map(_train_block, blocks))
+    else:
+        _init_worker(X, XT)
+        results = [_train_block(b) for b in blocks]
 
-    for p, neighbors in co_counts.items():
-        filtered = [(q, c) for q, c in neighbors.items() if c >= min_cooccurrence]
-        filtered.sort(key=lambda x: x[1], reverse=True)
-        similar_products[p] = [q for q, _ in filtered[:top_k]]
+    results.sort(key=lambda r: r[0])
+    counts = np.concatenate([r[1] for r in results]) if results else np.zeros(0, np.int64)
+    cols = np.concatenate([r[2] for r in results]) if results else np.zeros(0, np.int32)
+    scores = np.concatenate([r[3] for r in results]) if results else np.zeros(0, np.float32)
 
-    with open(MODEL_PATH, "wb") as f:
-        pickle.dump(similar_products, f)
+    # only products that have at least one neighbour get a row
+    has_row = counts > 0
+    offsets = np.zeros(int(has_row.sum()) + 1, dtype=np.int64)
+    np.cumsum(counts[has_row], out=offsets[1:])
 
-    print(f"[ML] Saved recommender model to {MODEL_PATH}")
+    return NeighborTable(
+        product_ids=product_index[has_row],
+        offsets=offsets,
+        neighbors=product_index[cols],
+        scores=scores.astype(np.float32),
+    )
+
+
+def train_recommender(
+    min_cooccurrence: int = 1,
+    top_k: int = 10,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+    workers: int = 1,
+):
+    if not os.path.exists(os.path.join(INTERACTIONS_DIR, "user_ids.npy")):
+        raise FileNotFoundError(
+            f"Interactions not found in: {INTERACTIONS_DIR}. "
+            f"Run `python -m ml.data_preparation` first."
+        )
+
+    # a watermark export holds only the orders after `since`: training on it
+    # would silently publish a model of the delta
+    since = load_meta(INTERACTIONS_DIR).get("since", 0)
+    if since:
+        raise ValueError(
+            f"{INTERACTIONS_DIR} holds a partial export (orders after #{since}). "
+            f"Run `python -m ml.data_preparation` without --since first."
+        )
+
+    user_ids, product_ids = load_interactions(INTERACTIONS_DIR)
+
+    if len(user_ids) == 0:
+        print("[ML] No interactions found. Train after some orders are placed.")
+        return
+
+    table = build_neighbor_table(
+        user_ids,
+        product_ids,
+        top_k=top_k,
+        min_cooccurrence=min_cooccurrence,
+        block_size=block_size,
+        workers=workers,
+    )
+
+    # running workers pick the new version up on their next reload check
+    version = save_table(table)
+
+    print(f"[ML] Saved recommender model {version} to {MODEL_DIR}")
     # print few examples
-    for k, v in list(similar_products.items())[:5]:
-        print(f"Product {k} → similar: {v}")
+    for pid in table.product_ids[:5]:
+        print(f"Product {pid} → similar: {table.row(pid)[0].tolist()}")
+
 
 if __name__ == "__main__":
-    train_recommender()
+    parser = argparse.ArgumentParser(description="Train the co-occurrence recommender")
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--min-cooccurrence", type=int, default=1)
+    parser.add_argument("--block-size", type=int, default=DEFAULT_BLOCK_SIZE)
+    parser.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args()
+
+    train_recommender(
+        min_cooccurrence=args.min_cooccurrence,
+        top_k=args.top_k,
+        block_size=args.block_size,
+        workers=args.workers,
+    )
@@ -6,5 +6,9 @@ from database import db
 from .user import User
 from .product import Product
 from .order import Order
+from .checkout import Checkout
+from .category import Category
+from .order_stat import OrderStat, OrderDailyStat
+from .job import Job
 
-__all__ = ["db", "User", "Product", "Order"]
+__all__ = ["db", "User", "Product", "Order", "Checkout", "Category", "OrderStat", "OrderDailyStat", "Job"]
@@ -0,0 +1,24 @@
+# models/category.py
+from datetime import datetime
+from database import db
+
+
+class Category(db.Model):
+    """
+    Per-category aggregate of ACTIVE products (facet list on /products).
+    Not edited directly: utils/categories.refresh_categories() recomputes a
+    row in the same transaction as every product create / edit / delete.
+    """
+    __tablename__ = "categories"
+
+    name = db.Column(db.String(100), primary_key=True)
+
+    active_count = db.Column(db.Integer, default=0, nullable=False)
+    min_price = db.Column(db.Float)
+    max_price = db.Column(db.Float)
+
+    # MAX(updated_at) versions the facet cache of every worker (utils/categories.py)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
+
+    def __repr__(self):
+        return f"<Category {self.name} ({self.active_count})>"
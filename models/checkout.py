@@ -0,0 +1,37 @@
+# models/checkout.py
+from datetime import datetime
+from database import db
+
+
+class Checkout(db.Model):
+    """
+    One purchase: the header for the order lines (`orders` rows) bought
+    together in a single checkout. Every `orders` row stays one product
+    line, so per-product queries (seller orders, stats, recommender) are
+    unchanged.
+    """
+    __tablename__ = "checkouts"
+
+    __table_args__ = (
+        db.Index("ix_checkouts_user_created", "user_id", "created_at"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
+
+    item_count = db.Column(db.Integer, default=0, nullable=False)   # units
+    total = db.Column(db.Float, default=0.0, nullable=False)
+
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    # --------------- RELATIONSHIPS ----------------
+
+    # Order lines bought in this checkout
+    orders = db.relationship(
+        "Order",
+        back_populates="checkout",
+        lazy=True
+    )
+
+    def __repr__(self):
+        return f"<Checkout {self.id} user={self.user_id} items={self.item_count} total={self.total}>"
@@ -0,0 +1,50 @@
+# models/job.py
+from datetime import datetime
+from database import db
+
+
+class Job(db.Model):
+    """
+    One unit of deferred work for the background worker (utils/jobs.py).
+    Rows are written by enqueue() inside the caller's transaction and
+    claimed by `python -m worker`; see utils/jobs.py for the life cycle.
+    """
+    __tablename__ = "jobs"
+
+    #   claim  → WHERE status = 'queued' AND run_at <= now ORDER BY priority DESC, run_at
+    #   leases → WHERE status = 'running' AND locked_until < now
+    #   dedup  → at most one QUEUED job per dedup_key
+    __table_args__ = (
+        db.Index("ix_jobs_ready", "status", "priority", "run_at"),
+        db.Index("ix_jobs_lease", "status", "locked_until"),
+        db.Index(
+            "ux_jobs_dedup", "dedup_key", unique=True,
+            sqlite_where=db.text("status = 'queued'"),
+            postgresql_where=db.text("status = 'queued'"),
+        ),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+
+    # task name, resolved through config JOB_TASKS
+    name = db.Column(db.String(100), nullable=False)
+    payload = db.Column(db.JSON, nullable=False, default=dict)     # task keyword arguments
+
+    priority = db.Column(db.Integer, default=0, nullable=False)    # higher runs first
+    dedup_key = db.Column(db.String(200))
+
+    # 'queued' | 'running' | 'done' | 'failed'
+    status = db.Column(db.String(20), default="queued", nullable=False)
+    attempts = db.Column(db.Integer, default=0, nullable=False)
+    max_attempts = db.Column(db.Integer, default=5, nullable=False)
+    last_error = db.Column(db.Text)
+
+    run_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    locked_until = db.Column(db.DateTime)      # lease of the worker running it
+    locked_by = db.Column(db.String(100))
+
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    finished_at = db.Column(db.DateTime)
+
+    def __repr__(self):
+        return f"<Job {self.id} {self.name} ({self.status}, attempt {self.attempts})>"
@@ -6,6 +6,16 @@ from database import db
 class Order(db.Model):
     __tablename__ = "orders"
 
+    #   my orders     → WHERE user_id = ? ORDER BY created_at
+    #   seller orders → JOIN products ON product_id (seller filter on products)
+    #   admin orders  → ORDER BY created_at
+    __table_args__ = (
+        db.Index("ix_orders_user_created", "user_id", "created_at"),
+        db.Index("ix_orders_product", "product_id"),
+        db.Index("ix_orders_created", "created_at"),
+        db.Index("ix_orders_checkout", "checkout_id"),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
 
     # FK to product & buyer user
@@ -14,6 +24,12 @@ class Order(db.Model):
 
     quantity = db.Column(db.Integer, default=1, nullable=False)
 
+    # price per unit when ordered (NULL for orders placed before checkouts)
+    unit_price = db.Column(db.Float)
+
+    # checkout this line belongs to (NULL for orders placed before checkouts)
+    checkout_id = db.Column(db.Integer, db.ForeignKey("checkouts.id"), nullable=True)
+
     # Shipping / order status
     # Examples: "Pending", "Shipped", "Delivered", "Cancelled"
     status = db.Column(db.String(20), default="Pending", nullable=False)
@@ -36,5 +52,12 @@ class Order(db.Model):
         lazy=True
     )
 
+    # Checkout (purchase) this line was bought in
+    checkout = db.relationship(
+        "Checkout",
+        back_populates="orders",
+        lazy=True
+    )
+
     def __repr__(self):
         return f"<Order {self.id} user={self.user_id} product={self.product_id} qty={self.quantity}>"
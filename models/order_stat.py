@@ -0,0 +1,42 @@
+# models/order_stat.py
+from database import db
+
+
+# Order rollups. Not edited directly: utils/stats.py adjusts both tables in
+# the same transaction as every order placement / status change / delete,
+# so dashboard reads cost O(products), not O(orders). Revenue is
+# price × quantity at the time the order was placed. Orders for products
+# without a seller are not rolled up.
+
+
+class OrderStat(db.Model):
+    """All-time totals per (seller, product, status) — dashboard totals."""
+    __tablename__ = "order_stats"
+
+    seller_id = db.Column(db.Integer, primary_key=True)
+    product_id = db.Column(db.Integer, primary_key=True)
+    status = db.Column(db.String(20), primary_key=True)
+
+    orders = db.Column(db.Integer, default=0, nullable=False)
+    units = db.Column(db.Integer, default=0, nullable=False)
+    revenue = db.Column(db.Float, default=0.0, nullable=False)
+
+    def __repr__(self):
+        return f"<OrderStat seller={self.seller_id} product={self.product_id} {self.status}>"
+
+
+class OrderDailyStat(db.Model):
+    """Per-day totals per (seller, day, product, status) — time windows."""
+    __tablename__ = "order_daily_stats"
+
+    seller_id = db.Column(db.Integer, primary_key=True)
+    day = db.Column(db.Date, primary_key=True)
+    product_id = db.Column(db.Integer, primary_key=True)
+    status = db.Column(db.String(20), primary_key=True)
+
+    orders = db.Column(db.Integer, default=0, nullable=False)
+    units = db.Column(db.Integer, default=0, nullable=False)
+    revenue = db.Column(db.Float, default=0.0, nullable=False)
+
+    def __repr__(self):
+        return f"<OrderDailyStat seller={self.seller_id} {self.day} product={self.product_id} {self.status}>"
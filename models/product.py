@@ -6,9 +6,28 @@ from database import db
 class Product(db.Model):
     __tablename__ = "products"
 
+    # Hot query shapes (all listing pages filter on is_active first):
+    #   newest      → WHERE is_active ORDER BY created_at, id
+    #   by category → WHERE is_active AND category = ? ORDER BY created_at | price
+    #   by price    → WHERE is_active ORDER BY price, id
+    #   seller pages→ WHERE seller_id = ?
+    #   admin list  → ORDER BY created_at, id (no is_active filter)
+    #   bulk import → upsert ON CONFLICT (seller_id, sku)
+    __table_args__ = (
+        db.Index("ix_products_created", "created_at"),
+        db.Index("ix_products_active_created", "is_active", "created_at"),
+        db.Index("ix_products_active_category_created", "is_active", "category", "created_at"),
+        db.Index("ix_products_active_category_price", "is_active", "category", "price"),
+        db.Index("ix_products_active_price", "is_active", "price"),
+        db.Index("ix_products_seller", "seller_id"),
+        db.Index("ux_products_seller_sku", "seller_id", "sku", unique=True),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
 
     name = db.Column(db.String(200), nullable=False)
+    # seller's own product code (optional); bulk imports update by it
+    sku = db.Column(db.String(64))
     category = db.Column(db.String(100), nullable=False)
 
     price = db.Column(db.Float, nullable=False)
@@ -16,6 +35,8 @@ class Product(db.Model):
 
     description = db.Column(db.Text)
     image_filename = db.Column(db.String(255))
+    # {width: "<hash>_w<width>.webp"}, filled in by utils/image_handler.process_image
+    image_variants = db.Column(db.JSON(none_as_null=True))
 
     is_active = db.Column(db.Boolean, default=True)   # for soft delete
 
@@ -40,5 +61,14 @@ class Product(db.Model):
         cascade="all, delete-orphan"   # deleting product ⇒ delete its orders
     )
 
+    def image_for(self, width: int):
+        """Smallest WebP variant at least `width` px wide (else the largest), or the original."""
+        variants = {int(w): name for w, name in (self.image_variants or {}).items()}
+        if not variants:
+            return self.image_filename
+
+        wide_enough = [w for w in variants if w >= width]
+        return variants[min(wide_enough) if wide_enough else max(variants)]
+
     def __repr__(self):
         return f"<Product {self.id} {self.name} (₹{self.price})>"
@@ -1,12 +1,17 @@
 # models/user.py
 from datetime import datetime
 from database import db
-from werkzeug.security import generate_password_hash, check_password_hash
+from utils.auth import hash_password, verify_password, needs_rehash
 
 
 class User(db.Model):
     __tablename__ = "users"
 
+    # admin user list → ORDER BY created_at, id
+    __table_args__ = (
+        db.Index("ix_users_created", "created_at"),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
 
     name = db.Column(db.String(120), nullable=False)
@@ -22,10 +27,13 @@ class User(db.Model):
 
     # ---------- PASSWORD HELPERS ----------
     def set_password(self, password: str) -> None:
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = hash_password(password)
 
     def check_password(self, password: str) -> bool:
-        return check_password_hash(self.password_hash, password)
+        return verify_password(self.password_hash, password)
+
+    def password_needs_rehash(self) -> bool:
+        return needs_rehash(self.password_hash)
 
     # ---------- RELATIONSHIPS ----------
     products = db.relationship("Product", back_populates="seller", lazy=True)
@@ -0,0 +1,30 @@
+# rebuild_images.py
+#
+# Generate WebP variants for product images that don't have them yet
+# (images uploaded before the variant pipeline, or after changing
+# IMAGE_VARIANT_WIDTHS — pass --all to redo every image).
+#
+#   python rebuild_images.py [--all]
+
+import sys
+
+from app import app
+from models import db
+from models.product import Product
+from utils.image_handler import process_image      # inline, one image at a time
+
+with app.app_context():
+    query = db.session.query(Product.image_filename).filter(Product.image_filename.isnot(None))
+    if "--all" not in sys.argv:
+        query = query.filter(Product.image_variants.is_(None))
+    filenames = [name for (name,) in query.distinct()]
+
+    print(f"🖼  Processing {len(filenames)} product images...")
+    done = 0
+    for name in filenames:
+        try:
+            done += bool(process_image(name))
+        except (OSError, ValueError) as e:      # unreadable / corrupt: report, go on
+            db.session.rollback()
+            print(f"  ✖ {name}: {e}")
+    print(f"✅ {done} images have variants ({len(filenames) - done} failed).")
@@ -0,0 +1,16 @@
+# rebuild_search.py
+#
+# (Re)build the FTS5 product search index from the products table.
+# Run after create_db.py, after restoring a DB backup, or whenever
+# products were written without going through routes/products.py.
+
+from app import app
+from utils.search import rebuild_search_index, is_sqlite
+
+with app.app_context():
+    if not is_sqlite():
+        print("⚠ Full-text index needs SQLite FTS5. Search will use the ilike fallback.")
+    else:
+        print("🔎 Rebuilding product search index...")
+        count = rebuild_search_index()
+        print(f"✅ Indexed {count} active products.")
@@ -0,0 +1,15 @@
+# rebuild_stats.py
+#
+# (Re)build the order_stats rollup from the orders table.
+# Run after turning STATS_ROLLUP_ENABLED on, after restoring a DB backup, or
+# whenever orders were written without going through routes/orders.py.
+
+from app import app
+from models import db, OrderStat
+from utils.stats import rebuild_order_stats
+
+with app.app_context():
+    print("📊 Rebuilding order stats rollup...")
+    with db.engine.begin() as conn:
+        rebuild_order_stats(conn)
+    print(f"✅ {OrderStat.query.count()} rollup rows.")
@@ -1,12 +1,17 @@
 # routes/admin.py
 
 from flask import Blueprint, render_template, redirect, url_for, flash, request, session
+from sqlalchemy.orm import joinedload
 
 from models import db
 from models.user import User
 from models.product import Product
 from models.order import Order
 from utils.decorators import login_required, role_required
+from utils.pagination import SortKey, paginate, get_per_page
+from utils.stats import admin_counts
+
+ADMIN_PER_PAGE = 50
 
 admin_bp = Blueprint("admin", __name__)
 
@@ -18,16 +23,7 @@ admin_bp = Blueprint("admin", __name__)
 @login_required
 @role_required("admin")
 def admin_dashboard():
-    total_users = User.query.count()
-    total_products = Product.query.count()
-    total_orders = Order.query.count()
-
-    return render_template(
-        "dashboards/admin_dashboard.html",
-        total_users=total_users,
-        total_products=total_products,
-        total_orders=total_orders,
-    )
+    return render_template("dashboards/admin_dashboard.html", **admin_counts())
 
 
 # -----------------------------------------------------------
@@ -37,8 +33,13 @@ def admin_dashboard():
 @login_required
 @role_required("admin")
 def admin_users():
-    users = User.query.order_by(User.created_at.desc()).all()
-    return render_template("products/admin_users.html", users=users)
+    page = paginate(
+        User.query,
+        [SortKey(User.created_at, descending=True), SortKey(User.id, descending=True)],
+        cursor=request.args.get("cursor"),
+        per_page=get_per_page(request.args, ADMIN_PER_PAGE),
+    )
+    return render_template("products/admin_users.html", users=page.items, page=page)
 
 
 # change role (customer/seller/admin)
@@ -95,8 +96,14 @@ def admin_delete_user(user_id):
 @login_required
 @role_required("admin")
 def admin_products():
-    products = Product.query.order_by(Product.created_at.desc()).all()
-    return render_template("products/admin_products.html", products=products)
+    # seller name comes back in the same query
+    page = paginate(
+        Product.query.options(joinedload(Product.seller)),
+        [SortKey(Product.created_at, descending=True), SortKey(Product.id, descending=True)],
+        cursor=request.args.get("cursor"),
+        per_page=get_per_page(request.args, ADMIN_PER_PAGE),
+    )
+    return render_template("products/admin_products.html", products=page.items, page=page)
 
 
 # -----------------------------------------------------------
@@ -106,13 +113,14 @@ def admin_products():
 @login_required
 @role_required("admin")
 def admin_orders():
-    orders = Order.query.order_by(Order.created_at.desc()).all()
-    products = {p.id: p for p in Product.query.all()}
-    users = {u.id: u for u in User.query.all()}
-
-    return render_template(
-        "products/admin_orders.html",
-        orders=orders,
-        products=products,
-        users=users,
+    # customer + product + seller labels come back in the same query
+    page = paginate(
+        Order.query.options(
+            joinedload(Order.user),
+            joinedload(Order.product).joinedload(Product.seller),
+        ),
+        [SortKey(Order.created_at, descending=True), SortKey(Order.id, descending=True)],
+        cursor=request.args.get("cursor"),
+        per_page=get_per_page(request.args, ADMIN_PER_PAGE),
     )
+    return render_template("products/admin_orders.html", orders=page.items, page=page)
@@ -1,16 +1,29 @@
 # routes/orders.py
 
 from flask import Blueprint, render_template, request, redirect, url_for, flash, session
+from sqlalchemy.orm import contains_eager, joinedload
 
 from models import db
 from models.order import Order
 from models.product import Product
 from models.user import User
 from utils.decorators import login_required, role_required
+from utils.cache import invalidate_catalog
+from utils.stats import move_order_status, remove_order
+from utils import inventory
+from utils.cart import get_cart, add_item, set_quantity, remove_item, clear_cart
 
 orders_bp = Blueprint("orders", __name__)
 
 
+def _form_quantity(default: int = 1) -> int:
+    try:
+        quantity = int(request.form.get("quantity", default))
+    except ValueError:
+        quantity = default
+    return quantity
+
+
 # -----------------------------------------------------------
 # CUSTOMER: PLACE ORDER
 # -----------------------------------------------------------
@@ -25,35 +38,119 @@ def place_order(product_id):
 
     user_id = session.get("user_id")
 
-    try:
-        quantity = int(request.form.get("quantity", 1))
-    except ValueError:
-        quantity = 1
-
+    quantity = _form_quantity()
     if quantity <= 0:
         quantity = 1
 
+    # fast path for the obvious case; the real check is the atomic
+    # conditional UPDATE in inventory.place_order
     if product.stock is not None and product.stock < quantity:
         flash("Not enough stock available.", "danger")
         return redirect(url_for("products.product_details", product_id=product_id))
 
-    order = Order(
-        user_id=user_id,
-        product_id=product_id,
-        quantity=quantity,
-        status="Pending",
-    )
+    checkout_id, remaining = inventory.place_order(user_id, product_id, quantity)
 
-    if product.stock is not None:
-        product.stock -= quantity
+    if checkout_id is None:
+        flash("Not enough stock available.", "danger")
+        return redirect(url_for("products.product_details", product_id=product_id))
 
-    db.session.add(order)
-    db.session.commit()
+    # cached catalog pages don't show stock counts, so only a sell-out
+    # (availability change) needs to drop them — not every single order
+    if remaining is not None and remaining <= 0:
+        invalidate_catalog()
 
     flash("Order placed successfully!", "success")
     return redirect(url_for("orders.my_orders"))
 
 
+# -----------------------------------------------------------
+# CUSTOMER: CART (session) + CHECKOUT
+# -----------------------------------------------------------
+@orders_bp.route("/cart")
+@login_required
+def view_cart():
+    cart = get_cart()
+    products = {
+        p.id: p
+        for p in Product.query.filter(Product.id.in_(list(cart))).all()
+    } if cart else {}
+
+    lines = []
+    for product_id, quantity in cart.items():
+        product = products.get(product_id)
+        available = (
+            product is not None and product.is_active
+            and (product.stock is None or product.stock >= quantity)
+        )
+        lines.append({
+            "product_id": product_id,
+            "product": product,
+            "quantity": quantity,
+            "subtotal": product.price * quantity if product else 0,
+            "available": available,
+        })
+
+    total = sum(line["subtotal"] for line in lines)
+    return render_template("orders/cart.html", lines=lines, total=total)
+
+
+@orders_bp.route("/cart/add/<int:product_id>", methods=["POST"])
+@login_required
+def add_to_cart(product_id):
+    product = Product.query.get_or_404(product_id)
+
+    if not product.is_active:
+        flash("This product is not available.", "danger")
+        return redirect(url_for("products.product_details", product_id=product_id))
+
+    if not add_item(product_id, max(_form_quantity(), 1)):
+        flash("Your cart is full.", "warning")
+    else:
+        flash(f"Added {product.name} to your cart.", "success")
+
+    return redirect(url_for("orders.view_cart"))
+
+
+@orders_bp.route("/cart/update/<int:product_id>", methods=["POST"])
+@login_required
+def update_cart(product_id):
+    set_quantity(product_id, _form_quantity(0))
+    return redirect(url_for("orders.view_cart"))
+
+
+@orders_bp.route("/cart/remove/<int:product_id>", methods=["POST"])
+@login_required
+def remove_from_cart(product_id):
+    remove_item(product_id)
+    return redirect(url_for("orders.view_cart"))
+
+
+@orders_bp.route("/checkout", methods=["POST"])
+@login_required
+def checkout():
+    cart = get_cart()
+    if not cart:
+        flash("Your cart is empty.", "warning")
+        return redirect(url_for("orders.view_cart"))
+
+    result = inventory.checkout(session.get("user_id"), cart)
+
+    if result.checkout_id is None:
+        names = [
+            p.name for p in Product.query.filter(Product.id.in_(result.unavailable)).all()
+        ] or ["Some items"]
+        flash(f"Not enough stock for: {', '.join(names)}. Nothing was ordered.", "danger")
+        return redirect(url_for("orders.view_cart"))
+
+    clear_cart()
+
+    if any(stock is not None and stock <= 0 for stock in result.remaining.values()):
+        invalidate_catalog()
+
+    flash(f"Order placed for {result.lines} item(s)!", "success")
+    return redirect(url_for("orders.my_orders"))
+
+
 # -----------------------------------------------------------
 # CUSTOMER: VIEW OWN ORDERS
 # -----------------------------------------------------------
@@ -64,6 +161,7 @@ def my_orders():
 
     orders = (
         Order.query
+        .options(joinedload(Order.product))
         .filter_by(user_id=user_id)
         .order_by(Order.created_at.desc())
         .all()
@@ -83,7 +181,8 @@ def seller_orders():
 
     orders = (
         Order.query
-        .join(Product)
+        .join(Order.product)
+        .options(contains_eager(Order.product), joinedload(Order.user))
         .filter(Product.seller_id == seller_id)
         .order_by(Order.created_at.desc())
         .all()
@@ -111,7 +210,9 @@ def update_order_status(order_id):
     if status not in ["Pending", "Shipped", "Delivered"]:
         status = "Pending"
 
+    old_status = order.status
     order.status = status
+    move_order_status(order, old_status)
     db.session.commit()
 
     flash("Order status updated!", "success")
@@ -132,6 +233,7 @@ def delete_seller_order(order_id):
         flash("You cannot delete another seller's order.", "danger")
         return redirect(url_for("orders.seller_orders"))
 
+    remove_order(order)
     db.session.delete(order)
     db.session.commit()
 
@@ -8,10 +8,13 @@ from models.order import Order
 from models.user import User
 
 from utils.decorators import login_required, role_required
-from utils.image_handler import save_image
-
-# ML recommendations
-from ml.recommender import get_recommendations
+from utils.image_handler import save_image, queue_image
+from utils.cache import cached_page, invalidate_catalog
+from utils.replicas import replica_reads
+from utils.categories import category_facets, refresh_categories
+from utils.search import apply_search, index_product
+from utils.catalog_import import detect_format, import_catalog
+from utils.pagination import SortKey, paginate, get_per_page
 
 products_bp = Blueprint("products", __name__)
 
@@ -20,37 +23,44 @@ products_bp = Blueprint("products", __name__)
 # PUBLIC: PRODUCT LIST PAGE (Flipkart-style)
 # -----------------------------------------------------------
 @products_bp.route("/products")
+@cached_page
+@replica_reads
 def product_list():
     q = request.args.get("q", "").strip()
     category = request.args.get("category", "").strip()
-    sort = request.args.get("sort", "newest")
+    sort = request.args.get("sort", "relevance" if q else "newest")
 
     query = Product.query.filter_by(is_active=True)
 
+    rank = None
     if q:
-        like = f"%{q}%"
-        query = query.filter(Product.name.ilike(like))
+        query, rank = apply_search(query, q)
 
     if category:
         query = query.filter(Product.category == category)
 
-    if sort == "price_low":
-        query = query.order_by(Product.price.asc())
+    # keyset pagination: every sort ends in id so the cursor is unique
+    if sort == "relevance" and rank is not None:
+        keys = [SortKey(rank), SortKey(Product.id)]
+    elif sort == "price_low":
+        keys = [SortKey(Product.price), SortKey(Product.id)]
     elif sort == "price_high":
-        query = query.order_by(Product.price.desc())
+        keys = [SortKey(Product.price, descending=True), SortKey(Product.id, descending=True)]
     else:
-        query = query.order_by(Product.created_at.desc())
-
-    products = query.all()
+        keys = [SortKey(Product.created_at, descending=True), SortKey(Product.id, descending=True)]
 
-    # All categories
-    categories_raw = db.session.query(Product.category).distinct().all()
-    categories = [c[0] for c in categories_raw]
+    page = paginate(
+        query,
+        keys,
+        cursor=request.args.get("cursor"),
+        per_page=get_per_page(request.args),
+    )
 
     return render_template(
         "products/product_list.html",
-        products=products,
-        categories=categories,
+        products=page.items,
+        page=page,
+        categories=category_facets(),
         q=q,
         current_category=category,
         sort=sort,
@@ -61,6 +71,8 @@ def product_list():
 # PUBLIC: PRODUCT DETAILS + ML RECOMMENDATIONS
 # -----------------------------------------------------------
 @products_bp.route("/product/<int:product_id>")
+@cached_page
+@replica_reads
 def product_details(product_id):
     product = Product.query.get_or_404(product_id)
 
@@ -69,7 +81,9 @@ def product_details(product_id):
         flash("This product is no longer available.", "warning")
         return redirect(url_for("products.product_list"))
 
-    # ML recommendations
+    # ML recommendations (numpy + model load on first use, or in app.warm_up)
+    from ml.recommender import get_recommendations
+
     recos = get_recommendations(product, limit=6)
 
     return render_template(
@@ -124,7 +138,12 @@ def add_product():
         )
 
         db.session.add(product)
+        db.session.flush()          # need product.id for the search index
+        index_product(product)
+        refresh_categories(product.category)
+        queue_image(product.image_filename)     # WebP variants, by the job worker
         db.session.commit()
+        invalidate_catalog()
 
         flash("Product added successfully!", "success")
         return redirect(url_for("users.dashboard"))
@@ -149,6 +168,8 @@ def edit_product(product_id):
         return redirect(url_for("users.dashboard"))
 
     if request.method == "POST":
+        old_category = product.category
+
         product.name = request.form.get("name", "").strip()
         product.category = request.form.get("category", "").strip()
         product.description = request.form.get("description", "").strip()
@@ -165,19 +186,59 @@ def edit_product(product_id):
             product.stock = 0
 
         # New image?
+        new_image = None
         image_file = request.files.get("image")
         if image_file and image_file.filename:
             filename = save_image(image_file)
-            if filename:
+            if filename and filename != product.image_filename:
                 product.image_filename = filename
+                product.image_variants = None
+                new_image = filename
 
+        index_product(product)
+        refresh_categories(old_category, product.category)
+        queue_image(new_image)
         db.session.commit()
+        invalidate_catalog()
+
         flash("Product updated successfully!", "success")
         return redirect(url_for("products.product_details", product_id=product.id))
 
     return render_template("products/edit_product.html", product=product)
 
 
+# -----------------------------------------------------------
+# SELLER / ADMIN: BULK IMPORT (CSV / NDJSON, upsert by sku)
+# -----------------------------------------------------------
+@products_bp.route("/seller/products/import", methods=["GET", "POST"])
+@login_required
+@role_required("seller", "admin")
+def import_products():
+    result = None
+
+    if request.method == "POST":
+        upload = request.files.get("file")
+        if not upload or not upload.filename:
+            flash("Choose a CSV or NDJSON file to import.", "danger")
+            return redirect(url_for("products.import_products"))
+
+        # werkzeug spooled the upload to a temp file; it's parsed row by row
+        fmt = request.form.get("format") or detect_format(upload.filename, upload.mimetype)
+        try:
+            result = import_catalog(upload.stream, fmt, seller_id=session["user_id"])
+        except ValueError as e:
+            flash(str(e), "danger")
+            return redirect(url_for("products.import_products"))
+
+        flash(
+            f"Imported {result.inserted} new and {result.updated} updated products"
+            + (f", {result.failed} rows skipped." if result.failed else "."),
+            "warning" if result.failed else "success",
+        )
+
+    return render_template("products/import_products.html", result=result)
+
+
 # -----------------------------------------------------------
 # SELLER / ADMIN: DELETE (soft delete)
 # -----------------------------------------------------------
@@ -195,7 +256,10 @@ def seller_delete_product(product_id):
         return redirect(url_for("users.dashboard"))
 
     product.is_active = False
+    index_product(product)          # inactive → removed from search index
+    refresh_categories(product.category)
     db.session.commit()
+    invalidate_catalog()
 
     flash("Product removed (soft delete).", "success")
     return redirect(url_for("users.dashboard"))
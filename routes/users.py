@@ -2,6 +2,7 @@
 
 from flask import Blueprint, render_template, request, redirect, url_for, flash, session
 from datetime import datetime
+from sqlalchemy.orm import joinedload
 
 from models import db
 from models.user import User
@@ -9,6 +10,8 @@ from models.product import Product
 from models.order import Order
 
 from utils.decorators import login_required
+from utils.categories import category_facets
+from utils.stats import seller_stats, admin_counts
 from validators import is_valid_email, is_strong_password
 
 users_bp = Blueprint("users", __name__)
@@ -112,6 +115,11 @@ def login():
             flash("Invalid email or password", "danger")
             return redirect(url_for("users.login"))
 
+        # stored with older hash parameters → upgrade while we have the password
+        if user.password_needs_rehash():
+            user.set_password(password)
+            db.session.commit()
+
         # store session
         session["logged_in"] = True
         session["user_id"] = user.id
@@ -195,53 +203,36 @@ def dashboard():
 
     # ADMIN DASHBOARD
     if role == "admin":
-        user_count = User.query.count()
-        product_count = Product.query.count()
-        order_count = Order.query.count()
-
-        return render_template(
-            "dashboards/admin_dashboard.html",
-            user_count=user_count,
-            product_count=product_count,
-            order_count=order_count,
-        )
+        return render_template("dashboards/admin_dashboard.html", **admin_counts())
 
     # SELLER DASHBOARD
     if role == "seller":
         products = Product.query.filter_by(seller_id=user_id).all()
 
-        orders = (
-            Order.query
-            .join(Product)
-            .filter(Product.seller_id == user_id)
-            .all()
-        )
-
-        total_revenue = sum(
-            o.product.price * o.quantity
-            for o in orders
-            if o.product
-        )
+        stats = seller_stats(user_id)
 
         return render_template(
             "dashboards/seller_dashboard.html",
             products=products,
             product_count=len(products),
-            order_count=len(orders),
-            total_revenue=total_revenue,
+            order_count=stats.order_count,
+            total_revenue=stats.revenue,
+            stats=stats,
         )
 
     # CUSTOMER DASHBOARD
-    orders = (
+    total_orders = Order.query.filter_by(user_id=user_id).count()
+    recent_orders = (
         Order.query
+        .options(joinedload(Order.product))
         .filter_by(user_id=user_id)
         .order_by(Order.created_at.desc())
+        .limit(2)
         .all()
     )
-    recent_orders = orders[:2]
 
     total_products = Product.query.filter_by(is_active=True).count()
-    total_categories = db.session.query(Product.category).distinct().count()
+    total_categories = len(category_facets())
 
     latest_products = (
         Product.query
@@ -251,8 +242,8 @@ def dashboard():
         .all()
     )
 
-    if orders and orders[0].product:
-        last_cat = orders[0].product.category
+    if recent_orders and recent_orders[0].product:
+        last_cat = recent_orders[0].product.category
         recommended = (
             Product.query
             .filter_by(category=last_cat, is_active=True)
@@ -271,7 +262,7 @@ def dashboard():
     return render_template(
         "dashboards/customer_dashboard.html",
         recent_orders=recent_orders,
-        total_orders=len(orders),
+        total_orders=total_orders,
         total_products=total_products,
         total_categories=total_categories,
         latest_products=latest_products,
@@ -0,0 +1,15 @@
+# sync_replicas.py
+#
+# Refresh local SQLite read replicas (DATABASE_REPLICA_URLS) from the
+# primary database. Dev / test only — see utils/replicas.py.
+
+from app import app
+from utils.replicas import sync_sqlite_replicas
+
+with app.app_context():
+    paths = sync_sqlite_replicas(app)
+
+if paths:
+    print(f"✅ Synced {len(paths)} replica(s): {', '.join(paths)}")
+else:
+    print("⚠ No SQLite replicas configured (set DATABASE_REPLICA_URLS).")
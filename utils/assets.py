@@ -0,0 +1,122 @@
+# utils/assets.py
+#
+# Fingerprinted static assets.
+#
+# build_assets.py copies static/css and static/js to
+#   static/dist/css/style.<hash8>.css ...
+# and writes static/dist/manifest.json {"css/style.css": "dist/css/style.<hash8>.css"}.
+#
+# assets.init_app() loads that manifest and
+#   - rewrites url_for("static", filename="css/style.css") to the
+#     fingerprinted name (url_defaults hook, templates stay unchanged)
+#   - serves fingerprinted files and write-once uploads (hash / uuid names
+#     from utils/image_handler.py) with
+#       Cache-Control: public, max-age=31536000, immutable
+# Everything else under /static keeps Flask's ETag + no-cache, i.e. a
+# conditional GET answered with 304. Without a manifest (dev) URLs are
+# left alone; STATIC_FINGERPRINTS=0 turns all of it off.
+
+import hashlib
+import json
+import os
+import re
+import shutil
+
+from flask import request
+
+MANIFEST_NAME = "manifest.json"
+DIST_DIR = "dist"
+SOURCE_DIRS = ("css", "js")
+
+# uploads are never overwritten: every name is a content hash or a uuid
+WRITE_ONCE = re.compile(r"^uploads/images/[0-9a-f]{32}(_w\d+)?\.\w+$")
+
+
+def file_hash(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(64 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()[:8]
+
+
+def build_manifest(static_folder: str, source_dirs=SOURCE_DIRS) -> dict:
+    """
+    Copy every asset under `source_dirs` to dist/ under a content-hashed
+    name and write the manifest. Old fingerprinted copies are kept, so
+    pages rendered before a deploy still find their assets.
+    """
+    manifest = {}
+
+    for source_dir in source_dirs:
+        root = os.path.join(static_folder, source_dir)
+        for dirpath, _, files in os.walk(root):
+            for name in sorted(files):
+                path = os.path.join(dirpath, name)
+                logical = os.path.relpath(path, static_folder).replace(os.sep, "/")
+
+                stem, dot, ext = logical.rpartition(".")
+                if not dot:
+                    stem, ext = logical, ""
+                fingerprinted = f"{DIST_DIR}/{stem}.{file_hash(path)}" + (f".{ext}" if ext else "")
+
+                target = os.path.join(static_folder, fingerprinted)
+                if not os.path.exists(target):
+                    os.makedirs(os.path.dirname(target), exist_ok=True)
+                    shutil.copy2(path, target)
+                manifest[logical] = fingerprinted
+
+    manifest_path = os.path.join(static_folder, DIST_DIR, MANIFEST_NAME)
+    os.makedirs(os.path.dirname(manifest_path), exist_ok=True)
+    with open(manifest_path, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+    return manifest
+
+
+class Assets:
+    def __init__(self):
+        self.enabled = False
+        self.manifest = {}
+        self.fingerprinted = set()
+        self.max_age = 31536000
+
+    def init_app(self, app):
+        self.enabled = app.config.get("STATIC_FINGERPRINTS", True)
+        self.max_age = app.config.get("STATIC_IMMUTABLE_MAX_AGE", 31536000)
+        self.load(os.path.join(app.static_folder, DIST_DIR, MANIFEST_NAME))
+
+        app.url_defaults(self._fingerprint_url)
+        app.after_request(self._cache_headers)
+        app.extensions["assets"] = self
+
+    def load(self, path: str) -> None:
+        """(Re)load the manifest; a missing file means no fingerprinting."""
+        try:
+            with open(path) as f:
+                self.manifest = json.load(f)
+        except FileNotFoundError:
+            self.manifest = {}
+        self.fingerprinted = set(self.manifest.values())
+
+    def is_immutable(self, filename: str) -> bool:
+        return filename in self.fingerprinted or bool(WRITE_ONCE.match(filename))
+
+    # ---------- hooks ----------
+    def _fingerprint_url(self, endpoint, values):
+        if self.enabled and endpoint == "static" and values.get("filename") in self.manifest:
+            values["filename"] = self.manifest[values["filename"]]
+
+    def _cache_headers(self, response):
+        if not self.enabled or request.endpoint != "static" or response.status_code not in (200, 304):
+            return response
+
+        if self.is_immutable(request.view_args.get("filename", "")):
+            response.cache_control.no_cache = None
+            response.cache_control.public = True
+            response.cache_control.max_age = self.max_age
+            response.cache_control.immutable = True
+        return response
+
+
+assets = Assets()
@@ -1,10 +1,172 @@
 # utils/auth.py
+#
+# Password hashing service.
+#
+# Werkzeug's default scrypt hash is deliberately expensive (~100+ ms of
+# CPU). Run inline, a burst of logins occupies every worker and catalog
+# requests queue behind it. With PASSWORD_HASH_WORKERS > 0 the hashing
+# runs in a small process pool per worker, at lower CPU priority
+# (PASSWORD_HASH_NICE):
+#   - at most PASSWORD_HASH_QUEUE hashes are admitted (running + waiting)
+#     per worker process; a login that can't get a slot within
+#     PASSWORD_HASH_WAIT seconds gets HashingBusy (→ 503 + Retry-After)
+#   - the request thread just waits on the result, so browsing traffic in
+#     other threads / workers keeps the CPU
+#   - the whole wait (queue + hash) is bounded by PASSWORD_HASH_TIMEOUT, kept
+#     below gunicorn's worker timeout so the 503 fires before the worker kill
+#   - a pool whose child died (OOM killer, ...) is replaced and the hash
+#     retried once, instead of failing every later login in this worker
+#   - hashing processes come from a forkserver, never fork() of the worker:
+#     the pool starts on the first login, inside a threaded (gthread)
+#     worker, and a forked child could inherit a lock another thread held.
+#     Like spawn, the children import __main__ as __mp_main__, so an entry
+#     point that serves requests must keep its work under a __main__ guard.
+# Outside a request (scripts, seeding, migrations) hashing stays inline.
+#
+# PASSWORD_HASH_METHOD sets the parameters for new hashes. Hashes stored
+# with other parameters still verify; needs_rehash() tells the login
+# route to upgrade them while it has the plain password.
+
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import BrokenExecutor, ProcessPoolExecutor, TimeoutError as FutureTimeout
+from functools import lru_cache
+
+from flask import current_app, has_app_context, has_request_context
 from werkzeug.security import generate_password_hash, check_password_hash
 
+DEFAULTS = {
+    "PASSWORD_HASH_METHOD": "scrypt:32768:8:1",
+    "PASSWORD_SALT_LENGTH": 16,
+    "PASSWORD_HASH_WORKERS": 0,          # 0 → hash inline
+    "PASSWORD_HASH_QUEUE": 16,
+    "PASSWORD_HASH_WAIT": 2.0,
+    "PASSWORD_HASH_TIMEOUT": 10.0,
+    "PASSWORD_HASH_NICE": 10,
+}
+
+
+class HashingBusy(RuntimeError):
+    """Too many password hashes queued in this worker; retry shortly."""
+
+
+def _setting(name):
+    if has_app_context():
+        return current_app.config.get(name, DEFAULTS[name])
+    return DEFAULTS[name]
+
+
+# -----------------------------------------------------------
+# POOL
+# -----------------------------------------------------------
+_pool = None
+_pool_pid = None
+_admission = None
+_pool_lock = threading.Lock()
+
+
+def _lower_priority(nice: int) -> None:
+    try:
+        os.nice(nice)
+    except OSError:
+        pass
+
+
+def _mp_context():
+    """forkserver: a clean single-threaded parent that already imported us."""
+    context = multiprocessing.get_context("forkserver")
+    context.set_forkserver_preload([__name__])
+    return context
+
+
+def _executor():
+    """Per-process pool + admission semaphore (both rebuilt after a fork)."""
+    global _pool, _pool_pid, _admission
 
+    with _pool_lock:
+        if _pool_pid != os.getpid():
+            _pool = None
+            _pool_pid = os.getpid()
+            _admission = threading.BoundedSemaphore(_setting("PASSWORD_HASH_QUEUE"))
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=_setting("PASSWORD_HASH_WORKERS"),
+                mp_context=_mp_context(),
+                initializer=_lower_priority,
+                initargs=(_setting("PASSWORD_HASH_NICE"),),
+            )
+        return _pool, _admission
+
+
+def _replace_pool(broken) -> None:
+    """Drop a broken pool; the next _executor() call starts a fresh one."""
+    global _pool
+    with _pool_lock:
+        if _pool is broken:          # another thread may have replaced it already
+            _pool = None
+    broken.shutdown(wait=False, cancel_futures=True)
+
+
+def _run(fn, *args):
+    # scripts / seeding hash inline: only request handling needs isolating
+    if not has_request_context() or not _setting("PASSWORD_HASH_WORKERS"):
+        return fn(*args)
+
+    deadline = time.monotonic() + _setting("PASSWORD_HASH_TIMEOUT")
+    pool, admission = _executor()
+    if not admission.acquire(timeout=_setting("PASSWORD_HASH_WAIT")):
+        raise HashingBusy("password hashing queue is full")
+
+    try:
+        for attempt in (1, 2):
+            try:
+                future = pool.submit(fn, *args)
+                # bounds a stuck or overloaded pool, well inside the worker timeout
+                return future.result(timeout=max(0.0, deadline - time.monotonic()))
+            except FutureTimeout:
+                future.cancel()
+                raise HashingBusy("password hashing timed out")
+            except BrokenExecutor as e:
+                # a hashing child was killed: the pool is unusable, start another
+                _replace_pool(pool)
+                if attempt == 2:
+                    raise HashingBusy("password hashing pool keeps failing") from e
+                pool = _executor()[0]
+    finally:
+        admission.release()
+
+
+def shutdown_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None and _pool_pid == os.getpid():
+            _pool.shutdown(wait=True)
+        _pool = None
+
+
+# -----------------------------------------------------------
+# API
+# -----------------------------------------------------------
 def hash_password(password: str) -> str:
-    return generate_password_hash(password)
+    return _run(
+        generate_password_hash, password,
+        _setting("PASSWORD_HASH_METHOD"), _setting("PASSWORD_SALT_LENGTH"),
+    )
 
 
 def verify_password(hashed: str, plain: str) -> bool:
-    return check_password_hash(hashed, plain)
+    return _run(check_password_hash, hashed, plain)
+
+
+@lru_cache(maxsize=8)
+def _canonical_method(method: str) -> str:
+    # "scrypt" → "scrypt:32768:8:1": let werkzeug spell out the defaults
+    return generate_password_hash("", method, salt_length=1).split("$", 1)[0]
+
+
+def needs_rehash(hashed: str) -> bool:
+    """True if `hashed` was made with other parameters than PASSWORD_HASH_METHOD."""
+    stored = hashed.split("$", 1)[0]
+    return stored != _canonical_method(_setting("PASSWORD_HASH_METHOD"))
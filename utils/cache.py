@@ -0,0 +1,249 @@
+# utils/cache.py
+#
+# Page cache for anonymous catalog pages (/, /products, /product/<id>).
+#
+#   local  : in-process LRU with TTL (always on)
+#   shared : optional backend every worker sees (SQLite file here; a
+#            Redis/memcached backend only has to implement
+#            get / set / incr / generation / prune)
+#
+# Invalidation is generation based: every cache key starts with the current
+# catalog generation and a product write just bumps it, so all old entries
+# become unreachable at once (and age out of the LRU / TTL). With a shared
+# backend the generation lives there, so one worker's write invalidates
+# every worker's pages. Without one the generation is per process, so the
+# cache refuses to run with more than one worker (WEB_CONCURRENCY > 1):
+# the other workers would serve edited / deleted products until the TTL.
+
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from flask import request, session, make_response
+
+GENERATION_KEY = "catalog:generation"
+
+
+# -----------------------------------------------------------
+# BACKENDS
+# -----------------------------------------------------------
+class LRUBackend:
+    """Thread-safe in-process LRU with per-entry expiry."""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+
+            expires, value = entry
+            if expires < time.monotonic():
+                del self._data[key]
+                return None
+
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl: float):
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class SQLiteBackend:
+    """
+    Shared cache in a local SQLite file — a stand-in for Redis/memcached
+    when all workers run on one host. One connection per thread, opened
+    lazily and per process: init_app runs in the gunicorn master
+    (preload_app) and a SQLite connection must not cross fork().
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        conn = sqlite3.connect(self.path, timeout=5)
+        try:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "key TEXT PRIMARY KEY, value BLOB, expires REAL)"
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _conn(self):
+        # a fork copies threading.local too → check the pid it was opened in
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=OFF")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get(self, key):
+        row = self._conn().execute(
+            "SELECT value, expires FROM cache WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None or row[1] < time.time():
+            return None
+        return pickle.loads(row[0])
+
+    def set(self, key, value, ttl: float):
+        self._conn().execute(
+            "INSERT OR REPLACE INTO cache (key, value, expires) VALUES (?, ?, ?)",
+            (key, pickle.dumps(value), time.time() + ttl),
+        )
+
+    def incr(self, key) -> int:
+        conn = self._conn()
+        conn.execute(
+            "INSERT INTO cache (key, value, expires) VALUES (?, ?, 1e308) "
+            "ON CONFLICT(key) DO UPDATE SET value = CAST(value AS INTEGER) + 1",
+            (key, 1),
+        )
+        return int(conn.execute("SELECT value FROM cache WHERE key = ?", (key,)).fetchone()[0])
+
+    def generation(self, key) -> int:
+        row = self._conn().execute("SELECT value FROM cache WHERE key = ?", (key,)).fetchone()
+        return int(row[0]) if row else 0
+
+    def prune(self):
+        """Drop expired pages (old generations become unreachable, then expire)."""
+        self._conn().execute("DELETE FROM cache WHERE expires < ?", (time.time(),))
+
+
+# -----------------------------------------------------------
+# PAGE CACHE
+# -----------------------------------------------------------
+class PageCache:
+    def __init__(self):
+        self.enabled = False
+        self.ttl = 60
+        self.local = LRUBackend()
+        self.shared = None
+
+        self.hits = {}
+        self.misses = {}
+        self._local_generation = 0
+
+    def init_app(self, app):
+        self.enabled = app.config.get("PAGE_CACHE_ENABLED", True)
+        self.ttl = app.config.get("PAGE_CACHE_TTL", 60)
+        self.local = LRUBackend(app.config.get("PAGE_CACHE_MAX_ENTRIES", 1024))
+
+        shared_path = app.config.get("PAGE_CACHE_SHARED_PATH")
+        if shared_path and not os.path.isabs(shared_path):
+            os.makedirs(app.instance_path, exist_ok=True)
+            shared_path = os.path.join(app.instance_path, shared_path)
+        self.shared = SQLiteBackend(shared_path) if shared_path else None
+
+        if self.enabled and self.shared is None and app.config.get("WEB_CONCURRENCY", 1) > 1:
+            app.logger.warning(
+                "⚠ Page cache disabled: %s workers and no PAGE_CACHE_SHARED_PATH, "
+                "a product write would only invalidate one of them",
+                app.config["WEB_CONCURRENCY"],
+            )
+            self.enabled = False
+
+        app.extensions["page_cache"] = self
+
+    # ---------- generation / invalidation ----------
+    def generation(self) -> int:
+        if self.shared is not None:
+            return self.shared.generation(GENERATION_KEY)
+        return self._local_generation
+
+    def invalidate(self) -> None:
+        """Call AFTER commit of any write that changes what catalog pages show."""
+        if self.shared is not None:
+            self.shared.incr(GENERATION_KEY)
+            self.shared.prune()
+        else:
+            self._local_generation += 1
+        self.local.clear()
+
+    # ---------- lookups ----------
+    def _key(self) -> str:
+        args = "&".join(f"{k}={v}" for k, v in sorted(request.args.items(multi=True)))
+        return f"page:{self.generation()}:{request.path}?{args}"
+
+    def get(self, key):
+        value = self.local.get(key)
+        if value is None and self.shared is not None:
+            value = self.shared.get(key)
+            if value is not None:
+                self.local.set(key, value, self.ttl)
+        return value
+
+    def set(self, key, value):
+        self.local.set(key, value, self.ttl)
+        if self.shared is not None:
+            self.shared.set(key, value, self.ttl)
+
+    def _count(self, counter: dict) -> None:
+        counter[request.endpoint] = counter.get(request.endpoint, 0) + 1
+
+    def stats(self) -> dict:
+        return {
+            endpoint: {"hits": self.hits.get(endpoint, 0), "misses": self.misses.get(endpoint, 0)}
+            for endpoint in sorted(set(self.hits) | set(self.misses))
+        }
+
+
+page_cache = PageCache()
+
+
+def invalidate_catalog() -> None:
+    """Product / stock changed → drop cached catalog pages + recommender active set."""
+    from ml.recommender import recommender
+
+    page_cache.invalidate()
+    recommender.invalidate_active()
+
+
+def cached_page(view):
+    """Serve GET responses for anonymous visitors from the page cache."""
+
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if not page_cache.enabled or request.method != "GET" or "user_id" in session:
+            return view(*args, **kwargs)
+
+        key = page_cache._key()
+        cached = page_cache.get(key)
+
+        if cached is not None:
+            page_cache._count(page_cache.hits)
+            body, status, content_type = cached
+            response = make_response(body, status)
+            response.content_type = content_type
+            response.headers["X-Cache"] = "HIT"
+            return response
+
+        page_cache._count(page_cache.misses)
+        response = make_response(view(*args, **kwargs))
+
+        if response.status_code == 200 and not response.direct_passthrough:
+            page_cache.set(key, (response.get_data(), response.status_code, response.content_type))
+
+        response.headers["X-Cache"] = "MISS"
+        return response
+
+    return wrapper
@@ -0,0 +1,44 @@
+# utils/cart.py
+#
+# Shopping cart kept in the signed session cookie: {"<product_id>": qty}.
+# Nothing is reserved until checkout (utils/inventory.checkout), so the
+# cart costs no DB writes; it is re-validated against products at view
+# and checkout time.
+
+from flask import session
+
+MAX_LINES = 50
+MAX_QUANTITY = 99
+
+
+def get_cart() -> dict:
+    """{product_id (int): quantity}"""
+    return {int(pid): int(q) for pid, q in session.get("cart", {}).items()}
+
+
+def _save(cart: dict) -> None:
+    session["cart"] = {str(pid): q for pid, q in cart.items() if q > 0}
+
+
+def add_item(product_id: int, quantity: int = 1) -> bool:
+    cart = get_cart()
+    if product_id not in cart and len(cart) >= MAX_LINES:
+        return False
+    cart[product_id] = min(cart.get(product_id, 0) + quantity, MAX_QUANTITY)
+    _save(cart)
+    return True
+
+
+def set_quantity(product_id: int, quantity: int) -> None:
+    cart = get_cart()
+    if product_id in cart:
+        cart[product_id] = min(max(quantity, 0), MAX_QUANTITY)
+        _save(cart)
+
+
+def remove_item(product_id: int) -> None:
+    set_quantity(product_id, 0)
+
+
+def clear_cart() -> None:
+    session.pop("cart", None)
@@ -0,0 +1,257 @@
+# utils/catalog_import.py
+#
+# Streaming bulk product import (CSV or NDJSON) for one seller.
+#
+#   columns: sku, name, category, price, stock, description
+#            (CSV header row; NDJSON one object per line; sku optional)
+#
+# The file is read one record at a time, never as a whole. Each record is
+# validated with the same rules as the add-product form; bad rows are
+# skipped and reported by line number, good rows are written in batches
+# of IMPORT_BATCH_SIZE, one short transaction each:
+#   - one executemany upsert:
+#       INSERT ... ON CONFLICT (seller_id, sku) DO UPDATE
+#     rows with a sku the seller already has update that product (and
+#     re-activate it), rows without a sku are always new products
+#   - the search index rows of every touched product
+# After the last batch the touched categories are recomputed and the
+# catalog cache is dropped once.
+
+import csv
+import io
+import json
+import time
+from datetime import datetime
+from typing import NamedTuple
+
+from flask import current_app
+from sqlalchemy import bindparam, text
+
+from models import db
+from utils.cache import invalidate_catalog
+from utils.categories import refresh_categories
+from utils.inventory import write_gate
+from utils.search import FTS_TABLE, search_index_ready
+
+FIELDS = ("sku", "name", "category", "price", "stock", "description")
+FORMATS = ("csv", "ndjson")
+
+# column limits of models/product.py
+MAX_LENGTHS = {"sku": 64, "name": 200, "category": 100}
+
+UPSERT_COLUMNS = ("sku", "name", "category", "price", "stock", "description", "seller_id", "is_active", "created_at")
+UPDATE_COLUMNS = ("name", "category", "price", "stock", "description", "is_active")
+SKUS = bindparam("skus", expanding=True)
+
+
+class RowError(NamedTuple):
+    line: int
+    message: str
+
+
+class ImportResult(NamedTuple):
+    rows: int            # data records read
+    inserted: int
+    updated: int
+    failed: int
+    errors: list         # first IMPORT_MAX_ERRORS RowErrors
+    seconds: float
+
+    @property
+    def rows_per_sec(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+def detect_format(filename: str = "", content_type: str = "") -> str:
+    name = (filename or "").lower()
+    if name.endswith((".ndjson", ".jsonl")) or "ndjson" in (content_type or "") or "jsonl" in (content_type or ""):
+        return "ndjson"
+    return "csv"
+
+
+# -----------------------------------------------------------
+# PARSING + VALIDATION
+# -----------------------------------------------------------
+def iter_records(stream, fmt: str):
+    """(line number, dict) per record from a binary stream, or (line, error message)."""
+    text_stream = io.TextIOWrapper(stream, encoding="utf-8-sig", errors="replace", newline="")
+
+    if fmt == "ndjson":
+        for number, line in enumerate(text_stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                yield number, f"invalid JSON: {e}"
+                continue
+            yield number, record if isinstance(record, dict) else "expected a JSON object"
+        return
+
+    reader = csv.DictReader(text_stream)
+    missing = {"name", "category", "price"} - set(reader.fieldnames or ())
+    if missing:
+        yield 1, f"missing columns: {', '.join(sorted(missing))}"
+        return
+    for record in reader:
+        yield reader.line_num, record
+
+
+def validate(record: dict):
+    """Cleaned {field: value} or an error message (same rules as add_product)."""
+    values = {f: record.get(f) for f in FIELDS}
+    for field in ("sku", "name", "category", "description"):
+        values[field] = str(values[field]).strip() if values[field] not in (None, "") else None
+
+    if not values["name"] or not values["category"]:
+        return "name and category are required"
+
+    for field, limit in MAX_LENGTHS.items():
+        if values[field] and len(values[field]) > limit:
+            return f"{field} longer than {limit} characters"
+
+    try:
+        values["price"] = float(values["price"])
+    except (TypeError, ValueError):
+        return f"invalid price: {values['price']!r}"
+    if not values["price"] > 0 or values["price"] == float("inf"):
+        return "price must be positive"
+
+    stock = values["stock"]
+    try:
+        values["stock"] = int(stock) if stock not in (None, "") else 0
+    except (TypeError, ValueError):
+        return f"invalid stock: {stock!r}"
+    if values["stock"] < 0:
+        return "stock can't be negative"
+
+    return values
+
+
+# -----------------------------------------------------------
+# WRITING
+# -----------------------------------------------------------
+class _BatchWriter:
+    def __init__(self, seller_id: int):
+        self.seller_id = seller_id
+        self.fts = search_index_ready()
+        self.categories = set()
+        self.inserted = 0
+        self.updated = 0
+
+        self.sqlite = db.engine.dialect.name == "sqlite"
+        self.mark = mark = {"qmark": "?", "format": "%s", "pyformat": "%s"}.get(db.engine.dialect.paramstyle, "?")
+        self.upsert_sql = (
+            f"INSERT INTO products ({', '.join(UPSERT_COLUMNS)}) "
+            f"VALUES ({', '.join([mark] * len(UPSERT_COLUMNS))}) "
+            "ON CONFLICT (seller_id, sku) DO UPDATE SET "
+            + ", ".join(f"{c} = excluded.{c}" for c in UPDATE_COLUMNS)
+            # unchanged rows (a re-sent feed) cost no write / index update
+            + " WHERE " + " OR ".join(
+                f"products.{c} {'IS NOT' if self.sqlite else 'IS DISTINCT FROM'} excluded.{c}"
+                for c in UPDATE_COLUMNS
+            )
+        )
+
+    def write(self, batch: list) -> None:
+        if not batch:
+            return
+        conn = db.session.connection()
+        now = datetime.utcnow()
+        if self.sqlite:
+            now = now.strftime("%Y-%m-%d %H:%M:%S.%f")     # SQLAlchemy's SQLite DATETIME format
+
+        skus = {"seller": self.seller_id, "skus": [row["sku"] for row in batch if row["sku"]]}
+        batch_products = "seller_id = :seller AND sku IN :skus"
+
+        if self.fts:
+            # a write first: the transaction takes SQLite's write lock here,
+            # so nobody else can insert between MAX(id) below and the upsert
+            conn.execute(
+                text(f"DELETE FROM {FTS_TABLE} WHERE rowid IN (SELECT id FROM products WHERE {batch_products})")
+                .bindparams(SKUS),
+                skus,
+            )
+
+        # products this batch will update (by sku), with their old category
+        existing = {
+            sku: (pid, category) for pid, sku, category in conn.execute(
+                text(f"SELECT id, sku, category FROM products WHERE {batch_products}").bindparams(SKUS), skus
+            )
+        }
+        max_id = conn.execute(text("SELECT COALESCE(MAX(id), 0) FROM products")).scalar()
+
+        conn.exec_driver_sql(self.upsert_sql, [
+            (row["sku"], row["name"], row["category"], row["price"], row["stock"], row["description"],
+             self.seller_id, True, now)
+            for row in batch
+        ])
+
+        if self.fts:
+            # new rows got ids above the old maximum, updated ones are re-indexed
+            index_sql = (
+                f"INSERT INTO {FTS_TABLE} (rowid, name, category, description) "
+                "SELECT id, name, category, COALESCE(description, '') FROM products WHERE "
+            )
+            conn.execute(text(index_sql + "id > :max_id"), {"max_id": max_id})
+            if existing:
+                conn.execute(
+                    text(index_sql + "id IN :ids").bindparams(bindparam("ids", expanding=True)),
+                    {"ids": [pid for pid, _ in existing.values()]},
+                )
+
+        self.categories.update(row["category"] for row in batch)
+        self.categories.update(category for _, category in existing.values())
+        self.updated += len(existing)
+        self.inserted += len(batch) - len(existing)
+
+
+def import_catalog(stream, fmt: str, seller_id: int, batch_size: int = None, max_errors: int = None) -> ImportResult:
+    """Import a CSV / NDJSON byte stream for `seller_id` (call in an app context)."""
+    if fmt not in FORMATS:
+        raise ValueError(f"format must be one of {', '.join(FORMATS)}")
+
+    batch_size = batch_size or current_app.config.get("IMPORT_BATCH_SIZE", 5000)
+    max_errors = max_errors if max_errors is not None else current_app.config.get("IMPORT_MAX_ERRORS", 100)
+    started = time.perf_counter()
+
+    writer = _BatchWriter(seller_id)
+    errors, failed, rows = [], 0, 0
+    batch, batch_skus = [], set()
+
+    def flush():
+        # end the read transaction, write the batch in its own short one
+        db.session.commit()
+        with write_gate():
+            writer.write(batch)
+            db.session.commit()
+        batch.clear()
+        batch_skus.clear()
+
+    for line, record in iter_records(stream, fmt):
+        rows += 1
+        values = validate(record) if isinstance(record, dict) else record
+        if isinstance(values, str):
+            failed += 1
+            if len(errors) < max_errors:
+                errors.append(RowError(line, values))
+            continue
+
+        # the same sku twice in one batch: write the first one before
+        # the second, so the second counts (and indexes) as an update
+        if values["sku"] and values["sku"] in batch_skus:
+            flush()
+        batch.append(values)
+        if values["sku"]:
+            batch_skus.add(values["sku"])
+        if len(batch) >= batch_size:
+            flush()
+
+    flush()
+
+    if writer.inserted or writer.updated:
+        refresh_categories(*writer.categories)
+        db.session.commit()
+        invalidate_catalog()
+
+    return ImportResult(rows, writer.inserted, writer.updated, failed, errors, time.perf_counter() - started)
@@ -0,0 +1,111 @@
+# utils/categories.py
+#
+# Maintained category facets (name, active product count, price range).
+#
+# Writes: refresh_categories(old, new) recomputes just the touched rows with
+#         one indexed GROUP BY (is_active, category, price) — call it before
+#         the commit of a product write so both land in one transaction.
+# Reads : category_facets() is served from an in-process cache keyed on the
+#         newest categories.updated_at (one indexed MAX lookup). Every
+#         refresh that changes a row moves it, and the value lives in the
+#         database, so a product write in any worker makes every worker
+#         reload the facets on its next request.
+
+import threading
+import time
+from datetime import datetime
+from typing import NamedTuple
+
+from sqlalchemy import bindparam, func, text
+
+from models import db
+from models.category import Category
+from models.product import Product
+
+FACETS_TTL = 60.0        # safety net only, the version check catches writes
+
+
+class Facet(NamedTuple):
+    name: str
+    count: int
+    min_price: float
+    max_price: float
+
+
+_cache = {"version": None, "expires": 0.0, "facets": []}
+_lock = threading.Lock()
+
+
+# -----------------------------------------------------------
+# WRITE PATH
+# -----------------------------------------------------------
+def refresh_categories(*names) -> None:
+    """Recompute the aggregate rows for the given category names."""
+    names = {n for n in names if n}
+    if not names:
+        return
+
+    rows = (
+        db.session.query(
+            Product.category,
+            func.count(Product.id),
+            func.min(Product.price),
+            func.max(Product.price),
+        )
+        .filter(Product.is_active == True, Product.category.in_(names))  # noqa: E712
+        .group_by(Product.category)
+        .all()
+    )
+    stats = {name: (count, lo, hi) for name, count, lo, hi in rows}
+
+    for name in names:
+        count, lo, hi = stats.get(name, (0, None, None))
+        category = db.session.get(Category, name)
+        if category is None:
+            category = Category(name=name)
+            db.session.add(category)
+
+        category.active_count = count
+        category.min_price = lo
+        category.max_price = hi
+
+
+def rebuild_categories(conn) -> None:
+    """Full recompute from products (migrations / bulk loads)."""
+    conn.execute(text("DELETE FROM categories"))
+    # updated_at in the ORM's format, so it compares with refresh_categories'
+    conn.execute(
+        text(
+            "INSERT INTO categories (name, active_count, min_price, max_price, updated_at) "
+            "SELECT category, SUM(CASE WHEN is_active THEN 1 ELSE 0 END), "
+            "MIN(CASE WHEN is_active THEN price END), "
+            "MAX(CASE WHEN is_active THEN price END), :now "
+            "FROM products GROUP BY category"
+        ).bindparams(bindparam("now", type_=Category.updated_at.type)),
+        {"now": datetime.utcnow()},
+    )
+
+
+# -----------------------------------------------------------
+# READ PATH
+# -----------------------------------------------------------
+def category_facets() -> list:
+    """Categories that have active products, A→Z, as Facet tuples."""
+    version = db.session.query(func.max(Category.updated_at)).scalar()
+    now = time.monotonic()
+
+    if _cache["version"] == version and now < _cache["expires"]:
+        return _cache["facets"]
+
+    with _lock:
+        rows = (
+            Category.query
+            .filter(Category.active_count > 0)
+            .order_by(Category.name)
+            .all()
+        )
+        facets = [Facet(c.name, c.active_count, c.min_price, c.max_price) for c in rows]
+
+        _cache.update(version=version, expires=now + FACETS_TTL, facets=facets)
+
+    return facets
@@ -0,0 +1,295 @@
+# utils/datagen.py
+#
+# Synthetic marketplace data + bulk loader (generate_data.py is the CLI).
+#
+# Distributions:
+#   sellers    : catalog size per seller is Zipf-like (few big shops, long tail)
+#   categories : skewed shares (CATEGORY_TABLE weights), log-normal prices
+#                inside each category's range
+#   popularity : product demand is Zipf(POPULARITY_A) over a random ranking
+#   customers  : purchases per customer are Pareto (a few heavy buyers)
+#   baskets    : lines per checkout follow a power law (mostly 1-2, up to 20)
+#   status     : by age — Pending < 2 days, Shipped < 7 days, else Delivered
+#
+# Rows are generated with numpy in batches and written with one
+# executemany per batch (driver level, tuples), one transaction per batch.
+# IDs are assigned up front, continuing after the existing MAX(id), so
+# orders can reference users / products without reading them back.
+
+import random
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+from sqlalchemy import text
+
+# name, share of the catalog, price range (₹)
+CATEGORY_TABLE = [
+    ("Clothing",    0.22, (199, 4_999)),
+    ("Electronics", 0.14, (499, 49_999)),
+    ("Mobiles",     0.12, (4_999, 149_999)),
+    ("Home",        0.11, (149, 19_999)),
+    ("Shoes",       0.09, (399, 14_999)),
+    ("Beauty",      0.08, (99, 2_999)),
+    ("Books",       0.07, (99, 1_999)),
+    ("Laptops",     0.06, (24_999, 249_999)),
+    ("Sports",      0.05, (199, 24_999)),
+    ("Toys",        0.04, (149, 7_999)),
+    ("Appliances",  0.02, (1_999, 89_999)),
+]
+
+SYLLABLES = ["ka", "zo", "ri", "mu", "te", "lan", "vex", "or", "qui", "sa", "bel", "nox"]
+
+WORDS = [
+    "pro", "max", "ultra", "lite", "smart", "classic", "wireless", "cotton",
+    "running", "gaming", "steel", "slim", "sport", "premium", "mini", "plus",
+    "phone", "laptop", "shirt", "headphones", "sneakers", "lamp", "watch",
+    "charger", "backpack", "jacket", "speaker", "kettle", "mouse", "keyboard",
+]
+
+POPULARITY_A = 1.1      # Zipf exponent of product demand
+BASKET_A = 2.2          # power-law exponent of lines per checkout
+MAX_BASKET = 20
+HISTORY_DAYS = 365
+
+USER_COLUMNS = ("id", "name", "email", "password_hash", "role", "created_at")
+PRODUCT_COLUMNS = ("id", "name", "category", "price", "stock", "description",
+                   "image_filename", "is_active", "created_at", "seller_id")
+CHECKOUT_COLUMNS = ("id", "user_id", "item_count", "total", "created_at")
+ORDER_COLUMNS = ("id", "checkout_id", "user_id", "product_id", "quantity",
+                 "unit_price", "status", "created_at")
+
+
+def brand_names(count: int = 2000, seed: int = 1):
+    """Pronounceable fake brand words, so search terms are selective."""
+    rng = random.Random(seed)
+    names = set()
+    while len(names) < count:
+        names.add("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))))
+    return sorted(names)
+
+
+# -----------------------------------------------------------
+# LOADER
+# -----------------------------------------------------------
+class BulkLoader:
+    """executemany of row tuples, one transaction per batch."""
+
+    PLACEHOLDERS = {"qmark": "?", "format": "%s", "pyformat": "%s"}
+
+    def __init__(self, engine, batch_size: int = 50_000):
+        self.engine = engine
+        self.batch_size = batch_size
+        self.sqlite = engine.dialect.name == "sqlite"
+        self.rows = {}
+        self.seconds = 0.0
+
+    def next_id(self, table: str) -> int:
+        with self.engine.connect() as conn:
+            return (conn.execute(text(f"SELECT MAX(id) FROM {table}")).scalar() or 0) + 1
+
+    def timestamps(self, seconds_ago):
+        """numpy seconds-before-now → values the driver stores like SQLAlchemy does."""
+        now = np.datetime64(datetime.utcnow(), "us")
+        stamps = now - (np.asarray(seconds_ago) * 1_000_000).astype("timedelta64[us]")
+        if self.sqlite:
+            # SQLAlchemy's SQLite DATETIME storage format
+            return np.char.replace(np.datetime_as_string(stamps, unit="us"), "T", " ").tolist()
+        return stamps.astype(datetime).tolist()
+
+    def insert(self, table: str, columns, rows) -> None:
+        if not rows:
+            return
+        mark = self.PLACEHOLDERS.get(self.engine.dialect.paramstyle, "?")
+        sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join([mark] * len(columns))})"
+
+        start = time.perf_counter()
+        with self.engine.begin() as conn:
+            if self.sqlite:
+                # bulk load: don't fsync every batch (the file is still
+                # consistent, a crash just loses the last batches)
+                conn.exec_driver_sql("PRAGMA synchronous=OFF")
+            conn.exec_driver_sql(sql, rows)
+        self.seconds += time.perf_counter() - start
+        self.rows[table] = self.rows.get(table, 0) + len(rows)
+
+
+# -----------------------------------------------------------
+# GENERATORS (each yields lists of row tuples)
+# -----------------------------------------------------------
+def user_batches(loader, rng, first_id, count, role, password_hash, batch_size):
+    for start in range(0, count, batch_size):
+        n = min(batch_size, count - start)
+        ids = range(first_id + start, first_id + start + n)
+        created = loader.timestamps(rng.uniform(0, HISTORY_DAYS * 86400, n))
+        yield [
+            (uid, f"{role.title()} {uid}", f"{role}{uid}@example.com", password_hash, role, ts)
+            for uid, ts in zip(ids, created)
+        ]
+
+
+def product_arrays(rng, count, seller_ids):
+    """Per-product category, price and seller (used by both products and orders)."""
+    names = [c[0] for c in CATEGORY_TABLE]
+    shares = np.array([c[1] for c in CATEGORY_TABLE])
+    category = rng.choice(len(names), size=count, p=shares / shares.sum())
+
+    low = np.array([c[2][0] for c in CATEGORY_TABLE])[category]
+    high = np.array([c[2][1] for c in CATEGORY_TABLE])[category]
+    # log-normal around the geometric middle of the range, clipped to it
+    middle = np.sqrt(low * high)
+    price = np.clip(middle * rng.lognormal(0, 0.6, count), low, high).round(2)
+
+    # Zipf-ish shop sizes: seller rank drawn with P(rank) ~ 1/rank
+    seller = np.asarray(seller_ids)[(rng.zipf(1.6, count) - 1) % len(seller_ids)]
+    return np.array(names)[category], price, seller
+
+
+def product_batches(loader, rng, first_id, categories, prices, sellers, brands, batch_size):
+    count = len(prices)
+    for start in range(0, count, batch_size):
+        end = min(count, start + batch_size)
+        n = end - start
+        brand = rng.integers(0, len(brands), n)
+        word = rng.integers(0, len(WORDS), (n, 2))
+        stock = rng.integers(0, 500, n)
+        active = rng.random(n) > 0.05
+        created = loader.timestamps(rng.uniform(0, HISTORY_DAYS * 86400, n))
+
+        rows = []
+        for i in range(n):
+            name = f"{brands[brand[i]]} {WORDS[word[i, 0]]} {WORDS[word[i, 1]]}".title()
+            rows.append((
+                first_id + start + i, name, str(categories[start + i]), float(prices[start + i]),
+                int(stock[i]), f"{name} — {categories[start + i].lower()}", None,
+                bool(active[i]), created[i], int(sellers[start + i]),
+            ))
+        yield rows
+
+
+def order_batches(loader, rng, first_checkout, first_order, line_count, customer_ids,
+                  product_ids, prices, batch_size):
+    """Yield (checkout rows, order rows) until line_count order lines exist."""
+    customers = np.asarray(customer_ids)
+    # popularity: Zipf over a random ranking of the catalog
+    ranking = rng.permutation(len(product_ids))
+    # buyers: Pareto weights over a random ranking of customers
+    buyer_weights = rng.pareto(1.2, len(customers)) + 1
+    buyer_weights /= buyer_weights.sum()
+
+    checkout_id, order_id, written = first_checkout, first_order, 0
+    while written < line_count:
+        n = max(1, min(batch_size, line_count - written) // 2)      # checkouts this batch
+        sizes = np.minimum(rng.zipf(BASKET_A, n), MAX_BASKET)
+        total_lines = int(sizes.sum())
+        if written + total_lines > line_count:                      # trim the last batch
+            keep = np.searchsorted(np.cumsum(sizes), line_count - written, side="right")
+            sizes = sizes[:keep] if keep else np.array([line_count - written])
+            n, total_lines = len(sizes), int(sizes.sum())
+
+        buyers = customers[rng.choice(len(customers), size=n, p=buyer_weights)]
+        age = rng.uniform(0, HISTORY_DAYS * 86400, n)
+        created = loader.timestamps(age)
+        status = np.where(age < 2 * 86400, "Pending", np.where(age < 7 * 86400, "Shipped", "Delivered"))
+
+        rank = (rng.zipf(POPULARITY_A, total_lines) - 1) % len(product_ids)
+        line_products = ranking[rank]                                # index into product arrays
+        quantity = np.minimum(rng.geometric(0.7, total_lines), 5)
+        line_price = prices[line_products]
+        owner = np.repeat(np.arange(n), sizes)                       # checkout index per line
+
+        item_count = np.bincount(owner, weights=quantity, minlength=n).astype(int)
+        total = np.bincount(owner, weights=quantity * line_price, minlength=n).round(2)
+
+        checkouts = [
+            (checkout_id + i, int(buyers[i]), int(item_count[i]), float(total[i]), created[i])
+            for i in range(n)
+        ]
+        orders = [
+            (order_id + j, checkout_id + int(owner[j]), int(buyers[owner[j]]),
+             int(product_ids[line_products[j]]), int(quantity[j]), float(line_price[j]),
+             str(status[owner[j]]), created[owner[j]])
+            for j in range(total_lines)
+        ]
+        yield checkouts, orders
+
+        checkout_id += n
+        order_id += total_lines
+        written += total_lines
+
+
+# -----------------------------------------------------------
+# ENTRY POINT
+# -----------------------------------------------------------
+def generate(engine, customers: int, sellers: int, products: int, orders: int,
+             seed: int = 1, batch_size: int = 50_000, password: str = "password123",
+             drop_indexes: bool = True, log=print) -> dict:
+    """
+    Append a synthetic dataset to the database behind `engine` (schema must
+    exist). Returns {table: rows written} plus rows_per_sec. Derived tables
+    (search index, categories, stats rollups) are NOT rebuilt here.
+    """
+    from models import db
+    from utils.auth import hash_password
+
+    rng = np.random.default_rng(seed)
+    loader = BulkLoader(engine, batch_size)
+    tables = [db.metadata.tables[name] for name in ("users", "products", "checkouts", "orders")]
+    password_hash = hash_password(password)       # one hash shared by every user
+    started = time.perf_counter()
+
+    # secondary indexes are rebuilt once at the end: sorting all keys in one
+    # go beats updating every b-tree on every insert. Unique ones stay (the
+    # seller sku upsert needs them, and rows loaded without them could make
+    # the rebuild fail), and the rebuild runs even if the load fails.
+    dropped = [
+        index for table in tables for index in table.indexes if not index.unique
+    ] if drop_indexes else []
+    with engine.begin() as conn:
+        for index in dropped:
+            index.drop(conn, checkfirst=True)
+
+    try:
+        # ---------- users ----------
+        first_user = loader.next_id("users")
+        for role, count in (("seller", sellers), ("customer", customers)):
+            for rows in user_batches(loader, rng, loader.next_id("users"), count, role, password_hash, batch_size):
+                loader.insert("users", USER_COLUMNS, rows)
+        seller_ids = np.arange(first_user, first_user + sellers)
+        customer_ids = np.arange(first_user + sellers, first_user + sellers + customers)
+        log(f"   users     {sellers + customers:>12,}")
+
+        # ---------- products ----------
+        first_product = loader.next_id("products")
+        categories, prices, owners = product_arrays(rng, products, seller_ids)
+        brands = brand_names(max(100, min(20_000, products // 20)), seed)
+        for rows in product_batches(loader, rng, first_product, categories, prices, owners, brands, batch_size):
+            loader.insert("products", PRODUCT_COLUMNS, rows)
+        product_ids = np.arange(first_product, first_product + products)
+        log(f"   products  {products:>12,}")
+
+        # ---------- checkouts + order lines ----------
+        if orders and customers and products:
+            batches = order_batches(
+                loader, rng, loader.next_id("checkouts"), loader.next_id("orders"),
+                orders, customer_ids, product_ids, prices, batch_size,
+            )
+            for checkouts, lines in batches:
+                loader.insert("checkouts", CHECKOUT_COLUMNS, checkouts)
+                loader.insert("orders", ORDER_COLUMNS, lines)
+            log(f"   orders    {loader.rows.get('orders', 0):>12,}  ({loader.rows.get('checkouts', 0):,} checkouts)")
+    finally:
+        if dropped:
+            start = time.perf_counter()
+            with engine.begin() as conn:
+                for index in dropped:
+                    index.create(conn, checkfirst=True)
+            log(f"   indexes rebuilt in {time.perf_counter() - start:.1f}s")
+
+    total_rows = sum(loader.rows.values())
+    return {
+        **loader.rows,
+        "seconds": round(time.perf_counter() - started, 2),
+        "rows_per_sec": round(total_rows / max(loader.seconds, 1e-9)),
+        "overall_rows_per_sec": round(total_rows / (time.perf_counter() - started)),
+    }
@@ -1,12 +1,27 @@
 # utils/image_handler.py
+#
+# Product image uploads.
+#
+# save_image() streams the upload to disk under its content hash
+# (<sha256>.<ext>), so identical uploads share one file. queue_image()
+# then queues an "images.process" job (utils/jobs.py) and the worker runs
+# process_image(), which writes WebP variants at IMAGE_VARIANT_WIDTHS
+# (<hash>_w400.webp, ...), with EXIF / ICC metadata stripped, and records
+# them on every product using that image (Product.image_variants). Until
+# that finishes, pages fall back to the original (Product.image_for).
 
+import hashlib
 import os
 import uuid
+
+from flask import current_app
+from PIL import Image, ImageOps
 from werkzeug.utils import secure_filename
 
 # FINAL: store images inside static/uploads/images
-UPLOAD_FOLDER = os.path.join("static", "uploads", "images")
+UPLOAD_FOLDER = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "static", "uploads", "images")
 ALLOWED_EXTENSIONS = {"png", "jpg", "jpeg", "gif"}
+CHUNK_SIZE = 64 * 1024
 
 
 def allowed_file(filename):
@@ -23,11 +38,110 @@ def save_image(file):
     filename = secure_filename(file.filename)
     ext = filename.rsplit(".", 1)[1].lower()
 
-    new_filename = f"{uuid.uuid4().hex}.{ext}"
-
     os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
+    # stream to a temp file while hashing, then keep it under its hash
+    digest = hashlib.sha256()
+    tmp_path = os.path.join(UPLOAD_FOLDER, f".{uuid.uuid4().hex}.tmp")
+    with open(tmp_path, "wb") as out:
+        for chunk in iter(lambda: file.stream.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+            out.write(chunk)
+
+    new_filename = f"{digest.hexdigest()[:32]}.{ext}"
     filepath = os.path.join(UPLOAD_FOLDER, new_filename)
-    file.save(filepath)
+
+    if os.path.exists(filepath):
+        os.remove(tmp_path)          # duplicate upload → reuse stored copy
+    else:
+        os.replace(tmp_path, filepath)
 
     return new_filename
+
+
+# -----------------------------------------------------------
+# VARIANTS
+# -----------------------------------------------------------
+def variant_name(filename: str, width: int) -> str:
+    return f"{filename.rsplit('.', 1)[0]}_w{width}.webp"
+
+
+def make_variants(filename: str, widths, quality: int = 80) -> dict:
+    """
+    Write WebP variants of `filename` at each width (never upscaled) and
+    return {width: variant filename}. Variants already on disk (same
+    content hash) are reused.
+    """
+    source = os.path.join(UPLOAD_FOLDER, filename)
+
+    with Image.open(source) as img:
+        img = ImageOps.exif_transpose(img)          # bake in rotation before EXIF goes
+        img = img.convert("RGBA" if img.mode in ("RGBA", "LA", "P") else "RGB")
+
+        targets = sorted(w for w in widths if w < img.width)
+        if img.width <= max(widths):
+            targets.append(img.width)               # small image: one full-size WebP
+
+        variants = {}
+        for width in targets:
+            name = variant_name(filename, width)
+            path = os.path.join(UPLOAD_FOLDER, name)
+
+            if not os.path.exists(path):
+                height = max(1, round(img.height * width / img.width))
+                resized = img if width == img.width else img.resize((width, height), Image.LANCZOS)
+
+                tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+                # no exif= / icc_profile= → metadata is not copied
+                resized.save(tmp_path, "WEBP", quality=quality, method=4)
+                os.replace(tmp_path, path)
+
+            variants[width] = name
+
+    return variants
+
+
+# -----------------------------------------------------------
+# JOB
+# -----------------------------------------------------------
+def process_image(filename: str) -> dict:
+    """
+    Generate the variants and record them on the products (job task
+    "images.process"; rebuild_images.py calls it directly). Idempotent:
+    existing variant files are reused.
+
+    A source that is gone (product deleted, file cleaned up) is nothing to
+    do. Any other error propagates, so the job queue retries it with
+    backoff and keeps it in last_error.
+    """
+    from models import db
+    from models.product import Product
+    from utils.cache import invalidate_catalog
+
+    try:
+        variants = make_variants(
+            filename,
+            current_app.config.get("IMAGE_VARIANT_WIDTHS", (200, 400, 800)),
+            current_app.config.get("IMAGE_WEBP_QUALITY", 80),
+        )
+    except FileNotFoundError:
+        print(f"⚠ Image {filename} no longer exists, skipping")
+        return {}
+
+    # every product showing this (content-hashed) image gets the variants
+    (
+        Product.query
+        .filter_by(image_filename=filename)
+        .update({"image_variants": variants}, synchronize_session=False)
+    )
+    db.session.commit()
+    invalidate_catalog()
+    return variants
+
+
+def queue_image(filename: str) -> None:
+    """Queue variant generation; call BEFORE the product row is committed."""
+    from utils.jobs import enqueue
+
+    if filename:
+        enqueue("images.process", {"filename": filename}, priority=10, dedup_key=f"images.process:{filename}")
@@ -0,0 +1,206 @@
+# utils/inventory.py
+#
+# Stock reservation and checkout.
+#
+# reserve_lines() takes stock for a whole basket with one conditional UPDATE
+#   UPDATE products SET stock = stock - CASE id WHEN :id THEN :q ... END
+#   WHERE id IN (...) AND is_active AND (stock IS NULL OR stock >= <same CASE>)
+# so check and decrement are a single atomic statement: two buyers can never
+# both see "1 left". Fewer matched rows than lines means something is sold
+# out or inactive, and the transaction is rolled back (all-or-nothing).
+#
+# checkout() then writes the checkout row, one executemany INSERT of the order
+# lines and the stats rollup, and commits — a short write-first transaction,
+# so under SQLite the write lock is held for those few statements, not the
+# whole request. It retries with exponential backoff + jitter when the
+# database reports lock contention ("database is locked", Postgres
+# serialization failures). place_order() is the single-line case.
+
+import random
+import threading
+import time
+from contextlib import nullcontext
+from datetime import datetime
+from typing import NamedTuple
+
+from flask import current_app
+from sqlalchemy import case, insert, or_, update
+from sqlalchemy.exc import OperationalError, DBAPIError
+
+from models import db
+from models.checkout import Checkout
+from models.order import Order
+from models.product import Product
+from utils.jobs import enqueue
+from utils.stats import record_orders
+
+# Postgres: serialization_failure, deadlock_detected
+RETRYABLE_PGCODES = {"40001", "40P01"}
+
+
+class CheckoutResult(NamedTuple):
+    checkout_id: int         # None if nothing was bought
+    lines: int               # order rows written
+    remaining: dict          # product_id → stock left (None = unlimited)
+    unavailable: list        # product ids that blocked the checkout
+
+
+LINE_COLUMNS = ("checkout_id", "user_id", "product_id", "quantity", "unit_price", "status", "created_at")
+
+# process-wide counters (benchmarks / metrics)
+counters = {"placed": 0, "sold_out": 0, "retries": 0, "gave_up": 0}
+
+
+def is_lock_contention(exc: Exception) -> bool:
+    if isinstance(exc, OperationalError):
+        message = str(exc.orig).lower()
+        if "locked" in message or "busy" in message:
+            return True
+    return isinstance(exc, DBAPIError) and getattr(exc.orig, "pgcode", None) in RETRYABLE_PGCODES
+
+
+_sqlite_write_lock = threading.Lock()
+
+
+def write_gate():
+    """
+    SQLite allows one writer at a time. With SQLITE_WRITE_GATE, threads of
+    this process queue on a Python lock instead of SQLite's busy handler
+    (which polls with sleeps of up to 100 ms). Other processes still
+    contend through busy_timeout.
+    """
+    if current_app.config.get("SQLITE_WRITE_GATE") and db.engine.dialect.name == "sqlite":
+        return _sqlite_write_lock
+    return nullcontext()
+
+
+def with_retry(fn, attempts: int = None, backoff: float = None):
+    """
+    Call fn() until it succeeds, rolling back and sleeping
+    backoff * 2^n (± jitter) after each lock-contention error.
+    """
+    attempts = attempts or current_app.config.get("ORDER_RETRY_ATTEMPTS", 5)
+    backoff = backoff if backoff is not None else current_app.config.get("ORDER_RETRY_BACKOFF", 0.01)
+
+    for attempt in range(attempts):
+        try:
+            return fn()
+        except DBAPIError as exc:
+            db.session.rollback()
+            if not is_lock_contention(exc) or attempt == attempts - 1:
+                counters["gave_up"] += 1
+                raise
+            counters["retries"] += 1
+            time.sleep(backoff * (2 ** attempt) * random.uniform(0.5, 1.5))
+
+
+# -----------------------------------------------------------
+# RESERVATION
+# -----------------------------------------------------------
+def reserve_lines(lines: dict) -> int:
+    """
+    Take stock for every {product_id: quantity} line with ONE conditional
+    UPDATE (CASE on id). Returns how many lines were reserved; the caller
+    rolls back unless that is all of them.
+    """
+    quantity = case(lines, value=Product.id)
+    result = db.session.execute(
+        update(Product)
+        .where(
+            Product.id.in_(list(lines)),
+            Product.is_active == True,  # noqa: E712
+            or_(Product.stock.is_(None), Product.stock >= quantity),
+        )
+        .values(stock=Product.stock - quantity)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
+
+
+def checkout(user_id: int, lines: dict) -> CheckoutResult:
+    """
+    Buy every {product_id: quantity} line or nothing, in one short
+    transaction: one UPDATE reserves all lines, then the checkout row, one
+    executemany INSERT of the order lines and the stats rollup.
+    """
+    lines = {int(pid): int(q) for pid, q in lines.items() if int(q) > 0}
+    if not lines:
+        return CheckoutResult(None, 0, {}, [])
+
+    # end any read transaction from request validation, so the write
+    # transaction starts with the UPDATE (no SQLite read→write upgrade)
+    db.session.commit()
+
+    def attempt():
+        if reserve_lines(lines) != len(lines):
+            db.session.rollback()
+            products = Product.query.filter(Product.id.in_(list(lines))).all()
+            available = {
+                p.id for p in products
+                if p.is_active and (p.stock is None or p.stock >= lines[p.id])
+            }
+            return CheckoutResult(None, 0, {}, sorted(set(lines) - available))
+
+        products = {
+            p.id: p
+            for p in Product.query.filter(Product.id.in_(list(lines))).populate_existing()
+        }
+
+        header = Checkout(
+            user_id=user_id,
+            item_count=sum(lines.values()),
+            total=round(sum(q * products[pid].price for pid, q in lines.items()), 2),
+            created_at=datetime.utcnow(),
+        )
+        db.session.add(header)
+        db.session.flush()
+
+        # transient Order objects for the rollup; the rows go in with one
+        # executemany INSERT (ORM flush would issue one INSERT per line)
+        orders = [
+            Order(
+                checkout_id=header.id,
+                user_id=user_id,
+                product_id=pid,
+                quantity=q,
+                unit_price=products[pid].price,
+                status="Pending",
+                created_at=header.created_at,
+            )
+            for pid, q in lines.items()
+        ]
+        db.session.execute(insert(Order), [
+            {c: getattr(o, c) for c in LINE_COLUMNS} for o in orders
+        ])
+
+        record_orders((o, products[o.product_id]) for o in orders)
+
+        # new co-purchases → one debounced recommender update (utils/jobs.py)
+        delay = current_app.config.get("RECO_UPDATE_DELAY")
+        if delay:
+            enqueue("ml.update_recommender", priority=-10, delay=delay, dedup_key="ml.update_recommender")
+
+        result = CheckoutResult(
+            header.id,
+            len(orders),
+            {pid: p.stock for pid, p in products.items()},
+            [],
+        )
+        db.session.commit()
+        return result
+
+    with write_gate():
+        result = with_retry(attempt)
+    counters["placed" if result.checkout_id is not None else "sold_out"] += 1
+    return result
+
+
+def place_order(user_id: int, product_id: int, quantity: int):
+    """
+    Single-product checkout (Buy Now).
+    Returns (checkout_id, remaining_stock), or (None, None) if there is not enough stock.
+    """
+    result = checkout(user_id, {product_id: quantity})
+    if result.checkout_id is None:
+        return None, None
+    return result.checkout_id, result.remaining[product_id]
@@ -0,0 +1,260 @@
+# utils/jobs.py
+#
+# Durable background jobs in the app database (`jobs` table, models/job.py).
+#
+#   enqueue("images.process", {"filename": f}, dedup_key=..., priority=10)
+#
+# inserts the job in the CURRENT transaction: the worker only sees it once
+# the request commits, and never for a rolled-back one. Blueprints call it
+# before their db.session.commit().
+#
+# `python -m worker` (worker.py) runs them:
+#   - claims the highest-priority ready job with one UPDATE ... RETURNING
+#     (atomic, so any number of worker processes can share the table) and
+#     holds it under a lease of JOB_LEASE_SECONDS
+#   - runs JOB_TASKS[name](**payload) in an app context
+#   - success → 'done'; exception → back to 'queued' after
+#     JOB_RETRY_BACKOFF * 2^(attempt-1) seconds (± jitter, capped), or
+#     'failed' after max_attempts
+#   - a worker that dies mid-job leaves its lease to expire; the job is then
+#     queued again → at-least-once delivery, so tasks must be idempotent
+#   - a job that would go back to 'queued' while a twin with the same
+#     dedup_key is already queued is closed as superseded instead (the twin
+#     does the work; only one queued job per key is allowed)
+#
+# dedup_key: while a job with that key is still queued, enqueueing the same
+# key is a no-op (ON CONFLICT DO NOTHING on a partial unique index). With a
+# delay this debounces: a burst of orders → one model update.
+
+import importlib
+import os
+import random
+import signal
+import socket
+import time
+import traceback
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import delete, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+
+from models import db
+from models.job import Job
+
+DIALECT_INSERT = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+
+
+# -----------------------------------------------------------
+# ENQUEUE
+# -----------------------------------------------------------
+def enqueue(name: str, payload: dict = None, priority: int = 0, delay: float = 0,
+            dedup_key: str = None, max_attempts: int = None) -> None:
+    """Queue a job in the current transaction (the caller commits)."""
+    if name not in current_app.config.get("JOB_TASKS", {}):
+        raise ValueError(f"unknown job task: {name}")
+
+    now = datetime.utcnow()
+    values = {
+        "name": name,
+        "payload": payload or {},
+        "priority": priority,
+        "dedup_key": dedup_key,
+        "status": "queued",
+        "attempts": 0,
+        "max_attempts": max_attempts or current_app.config.get("JOB_MAX_ATTEMPTS", 5),
+        "run_at": now + timedelta(seconds=delay),
+        "created_at": now,
+    }
+
+    insert = DIALECT_INSERT[db.engine.dialect.name](Job).values(**values)
+    if dedup_key is not None:
+        insert = insert.on_conflict_do_nothing(
+            index_elements=[Job.dedup_key], index_where=Job.status == "queued"
+        )
+    db.session.execute(insert)
+
+
+def resolve(name: str):
+    """JOB_TASKS["images.process"] = "utils.image_handler:process_image" → the function."""
+    module, _, attr = current_app.config["JOB_TASKS"][name].partition(":")
+    return getattr(importlib.import_module(module), attr)
+
+
+def backoff_seconds(attempt: int) -> float:
+    base = current_app.config.get("JOB_RETRY_BACKOFF", 10)
+    cap = current_app.config.get("JOB_RETRY_MAX_BACKOFF", 3600)
+    return min(cap, base * 2 ** (attempt - 1)) * random.uniform(0.5, 1.5)
+
+
+# -----------------------------------------------------------
+# WORKER
+# -----------------------------------------------------------
+class Worker:
+    def __init__(self, app, name: str = None):
+        self.app = app
+        self.name = name or f"{socket.gethostname()}:{os.getpid()}"
+        self.lease = app.config.get("JOB_LEASE_SECONDS", 300)
+        self.poll_interval = app.config.get("JOB_POLL_INTERVAL", 1.0)
+        self.keep_done = timedelta(hours=app.config.get("JOB_KEEP_DONE_HOURS", 24))
+        self.stopping = False
+        self.counts = {"done": 0, "retried": 0, "superseded": 0, "failed": 0}
+
+    # ---------- queue operations (each its own short transaction) ----------
+    @staticmethod
+    def _queued_keys():
+        return select(Job.dedup_key).where(Job.status == "queued", Job.dedup_key.isnot(None))
+
+    def requeue_expired(self) -> int:
+        """Jobs whose worker died: back to 'queued' (or 'failed' when out of attempts)."""
+        now = datetime.utcnow()
+        queued_keys = self._queued_keys()
+        expired = (Job.status == "running") & (Job.locked_until < now)
+
+        # a queued twin already covers the same work
+        db.session.execute(
+            update(Job)
+            .where(expired, Job.dedup_key.in_(queued_keys))
+            .values(status="done", finished_at=now, last_error="lease expired, superseded by a queued duplicate")
+        )
+        result = db.session.execute(
+            update(Job)
+            .where(expired)
+            .values(
+                status=db.case((Job.attempts >= Job.max_attempts, "failed"), else_="queued"),
+                run_at=now, locked_until=None, locked_by=None,
+                last_error="lease expired (worker died or timed out)",
+            )
+        )
+        db.session.commit()
+        return result.rowcount
+
+    def claim(self):
+        """Take the next ready job, or None."""
+        now = datetime.utcnow()
+        next_id = (
+            select(Job.id)
+            .where(Job.status == "queued", Job.run_at <= now)
+            .order_by(Job.priority.desc(), Job.run_at, Job.id)
+            .limit(1)
+            .scalar_subquery()
+        )
+        row = db.session.execute(
+            update(Job)
+            .where(Job.id == next_id, Job.status == "queued")
+            .values(
+                status="running",
+                attempts=Job.attempts + 1,
+                locked_until=now + timedelta(seconds=self.lease),
+                locked_by=self.name,
+            )
+            .returning(Job.id, Job.name, Job.payload, Job.attempts, Job.max_attempts, Job.dedup_key)
+        ).first()
+        db.session.commit()
+        return row
+
+    def finish(self, job_id: int, error: str = None, attempts: int = 0, max_attempts: int = 0,
+               dedup_key: str = None) -> str:
+        """Close or re-queue a claimed job → 'done' | 'queued' | 'superseded' | 'failed'."""
+        now = datetime.utcnow()
+        if error is None:
+            status, values = "done", {"finished_at": now, "last_error": None}
+        elif attempts < max_attempts:
+            status, values = "queued", {"run_at": now + timedelta(seconds=backoff_seconds(attempts)), "last_error": error}
+        else:
+            status, values = "failed", {"finished_at": now, "last_error": error}
+
+        # only if we still hold the lease (it may have expired and been re-claimed)
+        ours = (Job.id == job_id) & (Job.status == "running") & (Job.locked_by == self.name)
+
+        # a retry while a twin was enqueued meanwhile: the twin covers it
+        # (same two steps as requeue_expired, in one transaction)
+        if status == "queued" and dedup_key is not None:
+            superseded = db.session.execute(
+                update(Job)
+                .where(ours, Job.dedup_key.in_(self._queued_keys()))
+                .values(status="done", finished_at=now, locked_until=None, locked_by=None,
+                        last_error=f"superseded by a queued duplicate after:\n{error}")
+            ).rowcount
+            if superseded:
+                db.session.commit()
+                return "superseded"
+
+        db.session.execute(
+            update(Job).where(ours).values(status=status, locked_until=None, locked_by=None, **values)
+        )
+        db.session.commit()
+        return status
+
+    def purge(self) -> int:
+        result = db.session.execute(
+            delete(Job).where(Job.status == "done", Job.finished_at < datetime.utcnow() - self.keep_done)
+        )
+        db.session.commit()
+        return result.rowcount
+
+    # ---------- running ----------
+    def run_one(self) -> bool:
+        """Claim and run one job. False if nothing was ready."""
+        with self.app.app_context():
+            job = self.claim()
+        if job is None:
+            return False
+
+        started = time.perf_counter()
+        error = None
+        with self.app.app_context():
+            try:
+                resolve(job.name)(**job.payload)
+            except Exception:
+                db.session.rollback()
+                error = traceback.format_exc(limit=5)
+
+        with self.app.app_context():
+            status = self.finish(job.id, error, job.attempts, job.max_attempts, job.dedup_key)
+
+        self.counts["retried" if status == "queued" else status] += 1
+        elapsed = (time.perf_counter() - started) * 1000
+        if error:
+            last_line = error.strip().splitlines()[-1]
+            self.app.logger.warning("✖ job %s %s attempt %s → %s: %s", job.id, job.name, job.attempts, status, last_line)
+        else:
+            self.app.logger.info("✅ job %s %s (%.0fms)", job.id, job.name, elapsed)
+        return True
+
+    def run_until_empty(self) -> dict:
+        """Drain every ready job (benchmarks, --once)."""
+        with self.app.app_context():
+            self.requeue_expired()
+        while not self.stopping and self.run_one():
+            pass
+        return self.counts
+
+    def run_forever(self) -> None:
+        # finish the current job on SIGTERM / Ctrl-C, then exit
+        def stop(signum, frame):
+            self.stopping = True
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, stop)
+
+        next_maintenance = 0.0
+        while not self.stopping:
+            try:
+                if time.monotonic() >= next_maintenance:
+                    with self.app.app_context():
+                        self.requeue_expired()
+                        self.purge()
+                    next_maintenance = time.monotonic() + 60
+
+                ran = self.run_one()
+            except Exception:
+                # a queue statement failed (database locked, constraint ...):
+                # log it and keep polling; a job left 'running' is re-queued
+                # when its lease expires
+                self.app.logger.exception("✖ job worker iteration failed")
+                with self.app.app_context():
+                    db.session.rollback()
+                ran = False
+
+            if not ran:
+                time.sleep(self.poll_interval)
@@ -0,0 +1,258 @@
+# utils/metrics.py
+#
+# Request-level instrumentation.
+#
+#   per request : wall time, SQL statement count + time (cursor execute
+#                 hooks), template render time (Flask template signals)
+#                 → Server-Timing: app;dur=.., db;dur=..;desc="N queries", tpl;dur=..
+#   per endpoint: latency histogram, status counts, SQL / template totals
+#   slow queries: statements slower than SLOW_QUERY_MS, grouped by
+#                 normalized SQL (literals → ?, IN lists collapsed) and logged
+#   GET /metrics: all of the above + page cache and checkout counters in
+#                 Prometheus text format (Bearer METRICS_TOKEN; without a
+#                 token it is open only where METRICS_ANONYMOUS — not in
+#                 production, where it answers 403)
+#
+# Numbers are per worker process (like utils/inventory.counters): scrape
+# every worker, or aggregate in Prometheus by instance.
+
+import re
+import threading
+import time
+
+from flask import Response, abort, g, has_request_context, request, template_rendered, before_render_template
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# request latency buckets (seconds)
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_SPACE = re.compile(r"\s+")
+
+
+def normalize_sql(statement: str) -> str:
+    """Same query shape → same string: literals become ?, IN lists collapse."""
+    sql = _STRING.sub("?", statement)
+    sql = _NUMBER.sub("?", sql)
+    sql = _IN_LIST.sub("(?, ...)", sql)
+    return _SPACE.sub(" ", sql).strip()
+
+
+def _label(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", " ")
+
+
+class Metrics:
+    def __init__(self):
+        self.enabled = False
+        self.slow_ms = 100
+        self.slow_log_size = 100
+        self.server_timing = True
+
+        self._lock = threading.Lock()
+        self.endpoints = {}       # endpoint → latency histogram + SQL / template totals
+        self.responses = {}       # (endpoint, method, status) → count
+        self.slow_queries = {}    # normalized SQL → {"count", "seconds", "max"}
+
+    def init_app(self, app):
+        self.enabled = app.config.get("METRICS_ENABLED", True)
+        if not self.enabled:
+            return
+
+        self.slow_ms = app.config.get("SLOW_QUERY_MS", 100)
+        self.slow_log_size = app.config.get("SLOW_QUERY_LOG_SIZE", 100)
+        self.server_timing = app.config.get("SERVER_TIMING_HEADER", True)
+        self.logger = app.logger
+        token = app.config.get("METRICS_TOKEN")
+        anonymous = app.config.get("METRICS_ANONYMOUS", False)
+        if not token and not anonymous:
+            app.logger.warning("METRICS_TOKEN is not set: GET /metrics will answer 403")
+
+        # class-level listeners: every engine (primary + replicas)
+        if not event.contains(Engine, "before_cursor_execute", _before_cursor):
+            event.listen(Engine, "before_cursor_execute", _before_cursor)
+            event.listen(Engine, "after_cursor_execute", _after_cursor)
+            event.listen(Engine, "handle_error", _cursor_failed)
+        before_render_template.connect(_before_render, app)
+        template_rendered.connect(_after_render, app)
+
+        app.before_request(_start_request)
+        app.after_request(self._finish_request)
+
+        def metrics_view():
+            if not token:
+                if not anonymous:
+                    abort(403)
+            elif request.headers.get("Authorization") != f"Bearer {token}":
+                abort(403)
+            return Response(self.render(), mimetype="text/plain; version=0.0.4")
+
+        app.add_url_rule("/metrics", "metrics", metrics_view)
+        app.extensions["metrics"] = self
+
+    # ---------- recording ----------
+    def _finish_request(self, response):
+        if "metrics_start" not in g:
+            return response
+
+        elapsed = time.perf_counter() - g.metrics_start
+        sql_count = g.get("metrics_sql_count", 0)
+        sql_seconds = g.get("metrics_sql_seconds", 0.0)
+        template_seconds = g.get("metrics_template_seconds", 0.0)
+        endpoint = request.endpoint or "unknown"
+
+        with self._lock:
+            stats = self.endpoints.get(endpoint)
+            if stats is None:
+                stats = self.endpoints[endpoint] = {
+                    "buckets": [0] * len(BUCKETS), "count": 0, "seconds": 0.0,
+                    "sql_count": 0, "sql_seconds": 0.0, "template_seconds": 0.0,
+                }
+            for i, bound in enumerate(BUCKETS):
+                if elapsed <= bound:
+                    stats["buckets"][i] += 1
+            stats["count"] += 1
+            stats["seconds"] += elapsed
+            stats["sql_count"] += sql_count
+            stats["sql_seconds"] += sql_seconds
+            stats["template_seconds"] += template_seconds
+
+            key = (endpoint, request.method, response.status_code)
+            self.responses[key] = self.responses.get(key, 0) + 1
+
+        if self.server_timing:
+            response.headers["Server-Timing"] = (
+                f"app;dur={elapsed * 1000:.1f}, "
+                f'db;dur={sql_seconds * 1000:.1f};desc="{sql_count} queries", '
+                f"tpl;dur={template_seconds * 1000:.1f}"
+            )
+        return response
+
+    def record_slow_query(self, statement: str, seconds: float) -> None:
+        sql = normalize_sql(statement)
+        endpoint = request.endpoint if has_request_context() else None
+
+        with self._lock:
+            entry = self.slow_queries.get(sql)
+            if entry is None:
+                if len(self.slow_queries) >= self.slow_log_size:
+                    entry = None          # log full: still logged below, not kept
+                else:
+                    entry = self.slow_queries[sql] = {"count": 0, "seconds": 0.0, "max": 0.0}
+            if entry is not None:
+                entry["count"] += 1
+                entry["seconds"] += seconds
+                entry["max"] = max(entry["max"], seconds)
+
+        self.logger.warning("🐢 Slow query %.1fms (%s): %s", seconds * 1000, endpoint or "-", sql)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.endpoints.clear()
+            self.responses.clear()
+            self.slow_queries.clear()
+
+    # ---------- /metrics ----------
+    def render(self) -> str:
+        from utils.cache import page_cache
+        from utils.inventory import counters
+
+        lines = []
+
+        def metric(name, kind, help_text, samples):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for suffix, labels, value in samples:
+                label_text = ",".join(f'{k}="{_label(v)}"' for k, v in labels.items())
+                lines.append(f"{name}{suffix}{{{label_text}}} {value}")
+
+        with self._lock:
+            endpoints = {name: dict(stats, buckets=list(stats["buckets"])) for name, stats in self.endpoints.items()}
+            responses = dict(self.responses)
+            slow = {sql: dict(entry) for sql, entry in self.slow_queries.items()}
+
+        histogram = []
+        for name, stats in sorted(endpoints.items()):
+            for bound, count in zip(BUCKETS, stats["buckets"]):
+                histogram.append(("_bucket", {"endpoint": name, "le": bound}, count))
+            histogram.append(("_bucket", {"endpoint": name, "le": "+Inf"}, stats["count"]))
+            histogram.append(("_sum", {"endpoint": name}, round(stats["seconds"], 6)))
+            histogram.append(("_count", {"endpoint": name}, stats["count"]))
+        metric("app_request_duration_seconds", "histogram", "Request wall time by endpoint.", histogram)
+
+        metric("app_requests_total", "counter", "Responses by endpoint, method and status.", [
+            ("", {"endpoint": e, "method": m, "status": s}, n) for (e, m, s), n in sorted(responses.items())
+        ])
+        metric("app_sql_statements_total", "counter", "SQL statements executed, by endpoint.", [
+            ("", {"endpoint": name}, stats["sql_count"]) for name, stats in sorted(endpoints.items())
+        ])
+        metric("app_sql_duration_seconds_total", "counter", "Time spent in SQL, by endpoint.", [
+            ("", {"endpoint": name}, round(stats["sql_seconds"], 6)) for name, stats in sorted(endpoints.items())
+        ])
+        metric("app_template_duration_seconds_total", "counter", "Time spent rendering templates, by endpoint.", [
+            ("", {"endpoint": name}, round(stats["template_seconds"], 6)) for name, stats in sorted(endpoints.items())
+        ])
+        metric("app_slow_queries_total", "counter", f"Statements slower than {self.slow_ms}ms, by normalized SQL.", [
+            ("", {"query": sql[:300]}, entry["count"]) for sql, entry in sorted(slow.items())
+        ])
+        metric("app_slow_query_seconds_max", "gauge", "Slowest run of each slow statement.", [
+            ("", {"query": sql[:300]}, round(entry["max"], 6)) for sql, entry in sorted(slow.items())
+        ])
+
+        cache_stats = page_cache.stats()
+        metric("app_page_cache_requests_total", "counter", "Page cache lookups by endpoint and result.", [
+            ("", {"endpoint": name, "result": result}, stats[key])
+            for name, stats in cache_stats.items() for result, key in (("hit", "hits"), ("miss", "misses"))
+        ])
+        metric("app_checkout_events_total", "counter", "Checkout outcomes and lock retries (utils/inventory).", [
+            ("", {"event": name}, value) for name, value in sorted(counters.items())
+        ])
+
+        return "\n".join(lines) + "\n"
+
+
+metrics = Metrics()
+
+
+# -----------------------------------------------------------
+# HOOKS
+# -----------------------------------------------------------
+def _start_request():
+    g.metrics_start = time.perf_counter()
+
+
+def _before_cursor(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("metrics_started", []).append(time.perf_counter())
+
+
+def _after_cursor(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.get("metrics_started")
+    if not started:
+        return
+    seconds = time.perf_counter() - started.pop()
+
+    if has_request_context():
+        g.metrics_sql_count = g.get("metrics_sql_count", 0) + 1
+        g.metrics_sql_seconds = g.get("metrics_sql_seconds", 0.0) + seconds
+
+    if metrics.enabled and seconds * 1000 >= metrics.slow_ms:
+        metrics.record_slow_query(statement, seconds)
+
+
+def _cursor_failed(context):
+    started = context.connection.info.get("metrics_started") if context.connection is not None else None
+    if started:
+        started.pop()
+
+
+def _before_render(sender, template, context, **extra):
+    g.setdefault("metrics_render_started", []).append(time.perf_counter())
+
+
+def _after_render(sender, template, context, **extra):
+    started = g.get("metrics_render_started")
+    if started:
+        g.metrics_template_seconds = g.get("metrics_template_seconds", 0.0) + time.perf_counter() - started.pop()
@@ -0,0 +1,160 @@
+# utils/pagination.py
+#
+# Keyset (cursor) pagination.
+# Instead of OFFSET (which still walks every skipped row), each page seeks
+# past the sort-key values of the last row shown:
+#   newest     → (created_at, id) < (:created_at, :id)
+#   price_low  → (price, id)      > (:price, :id)
+# so page N costs the same as page 1 once the sort columns are indexed.
+
+import base64
+import json
+from datetime import datetime
+from typing import NamedTuple
+
+from sqlalchemy import and_, or_
+
+DEFAULT_PER_PAGE = 24
+MAX_PER_PAGE = 100
+
+
+class SortKey(NamedTuple):
+    column: object
+    descending: bool = False
+
+
+class Page(NamedTuple):
+    items: list
+    per_page: int
+    next_cursor: str = None
+    prev_cursor: str = None
+
+    @property
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    @property
+    def has_prev(self) -> bool:
+        return self.prev_cursor is not None
+
+
+# -----------------------------------------------------------
+# REQUEST ARG HELPERS
+# -----------------------------------------------------------
+def get_per_page(args, default: int = DEFAULT_PER_PAGE) -> int:
+    try:
+        per_page = int(args.get("per_page", default))
+    except (TypeError, ValueError):
+        per_page = default
+
+    return max(1, min(per_page, MAX_PER_PAGE))
+
+
+# -----------------------------------------------------------
+# CURSOR ENCODING  (opaque, url-safe)
+# -----------------------------------------------------------
+def encode_cursor(values, direction: str) -> str:
+    raw = [v.isoformat() if isinstance(v, datetime) else v for v in values]
+    payload = json.dumps({"d": direction, "v": raw}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, keys):
+    """Returns (direction, values) or (None, None) for a missing/bad cursor."""
+    if not cursor:
+        return None, None
+
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        direction = payload["d"]
+        raw = payload["v"]
+
+        if direction not in ("next", "prev") or len(raw) != len(keys):
+            return None, None
+
+        values = []
+        for key, value in zip(keys, raw):
+            if key.column.type.python_type is datetime and value is not None:
+                value = datetime.fromisoformat(value)
+            values.append(value)
+
+        return direction, values
+    except (ValueError, KeyError, TypeError, NotImplementedError):
+        return None, None
+
+
+# -----------------------------------------------------------
+# SEEK PREDICATE
+# -----------------------------------------------------------
+def _seek_predicate(keys, values, forward: bool):
+    """
+    Lexicographic "row comes after (values)" in the given sort order:
+      k1 > v1 OR (k1 = v1 AND k2 > v2) OR ...
+    plus a redundant k1 >= v1 so SQLite can use it as an index range.
+    """
+    def after(key, value):
+        ascending = (not key.descending) == forward
+        return key.column > value if ascending else key.column < value
+
+    def after_or_equal(key, value):
+        ascending = (not key.descending) == forward
+        return key.column >= value if ascending else key.column <= value
+
+    clauses = []
+    for i, (key, value) in enumerate(zip(keys, values)):
+        equal_prefix = [k.column == v for k, v in zip(keys[:i], values[:i])]
+        clauses.append(and_(*equal_prefix, after(key, value)))
+
+    return and_(after_or_equal(keys[0], values[0]), or_(*clauses))
+
+
+def _order_by(keys, forward: bool):
+    clauses = []
+    for key in keys:
+        descending = key.descending if forward else not key.descending
+        clauses.append(key.column.desc() if descending else key.column.asc())
+    return clauses
+
+
+# -----------------------------------------------------------
+# PAGINATE
+# -----------------------------------------------------------
+def paginate(query, keys, cursor: str = None, per_page: int = DEFAULT_PER_PAGE) -> Page:
+    """
+    query  : un-ordered ORM query (filters already applied)
+    keys   : list[SortKey], must end in a unique column (usually the id)
+    cursor : value from a previous Page.next_cursor / prev_cursor
+    """
+    direction, values = decode_cursor(cursor, keys)
+    forward = direction != "prev"
+
+    # select the key values alongside the entity so the cursor can be built
+    # from the row itself (works for computed keys like a search rank)
+    query = query.add_columns(*[k.column for k in keys])
+
+    if values is not None:
+        query = query.filter(_seek_predicate(keys, values, forward))
+
+    rows = query.order_by(*_order_by(keys, forward)).limit(per_page + 1).all()
+
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+
+    if not forward:
+        rows.reverse()
+
+    items = [row[0] for row in rows]
+
+    next_cursor = prev_cursor = None
+    if rows:
+        first_values = list(rows[0][1:])
+        last_values = list(rows[-1][1:])
+
+        # going forward: more rows ahead → next; arrived via a cursor → prev
+        if (forward and has_more) or (not forward and values is not None):
+            next_cursor = encode_cursor(last_values, "next")
+        if (not forward and has_more) or (forward and values is not None):
+            prev_cursor = encode_cursor(first_values, "prev")
+
+    return Page(items=items, per_page=per_page, next_cursor=next_cursor, prev_cursor=prev_cursor)
@@ -0,0 +1,51 @@
+# utils/query_budget.py
+#
+# Counts SQL statements per request and enforces a per-endpoint budget so
+# N+1 regressions (a lazy relationship touched in a loop) are caught.
+#
+#   QUERY_BUDGET_ENABLED = True       count + log routes over budget
+#   QUERY_BUDGET_STRICT  = True       raise QueryBudgetExceeded instead
+#   QUERY_BUDGET_DEFAULT = 12
+#   QUERY_BUDGETS        = {"admin.admin_orders": 5, ...}
+#
+# benchmarks/query_counts.py runs every route in strict mode against a
+# dataset large enough that any per-row query blows the budget.
+
+from flask import g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+class QueryBudgetExceeded(RuntimeError):
+    pass
+
+
+def _count_statement(conn, cursor, statement, parameters, context, executemany):
+    if has_request_context():
+        g.sql_statements = g.get("sql_statements", 0) + 1
+
+
+def init_query_budget(app):
+    if not app.config.get("QUERY_BUDGET_ENABLED"):
+        return
+
+    # class-level listener: covers every engine the app creates
+    if not event.contains(Engine, "before_cursor_execute", _count_statement):
+        event.listen(Engine, "before_cursor_execute", _count_statement)
+
+    default = app.config.get("QUERY_BUDGET_DEFAULT", 12)
+    budgets = app.config.get("QUERY_BUDGETS", {})
+    strict = app.config.get("QUERY_BUDGET_STRICT", False)
+
+    @app.after_request
+    def check_query_budget(response):
+        count = g.get("sql_statements", 0)
+        budget = budgets.get(request.endpoint, default)
+
+        if count > budget:
+            message = f"{request.endpoint} ran {count} SQL statements (budget {budget}) for {request.full_path}"
+            if strict:
+                raise QueryBudgetExceeded(message)
+            app.logger.warning("⚠ Query budget exceeded: %s", message)
+
+        return response
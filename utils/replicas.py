@@ -0,0 +1,80 @@
+# utils/replicas.py
+#
+# Read-replica routing (database.RoutingSession does the actual routing).
+#
+#   DATABASE_REPLICA_URLS=sqlite:///replica1.db,sqlite:///replica2.db
+#
+# Replica reads are opt-in per code path: catalog views use @replica_reads,
+# the recommender wraps its queries in `with read_replica():`. Everything
+# else (auth, cart, checkout, seller/admin pages) reads the primary.
+# After a visitor commits a write, their reads stay on the primary for
+# REPLICA_STICKY_SECONDS so they always see their own changes.
+#
+# sync_sqlite_replicas() refreshes local SQLite replica files from the
+# primary with the online backup API (dev / test setups; a real replica is
+# kept up to date by the database's own replication).
+
+import sqlite3
+from contextlib import contextmanager
+from functools import wraps
+
+from flask import g
+
+from database import REPLICA_PREFIX
+from utils.cache import invalidate_catalog
+
+
+@contextmanager
+def read_replica():
+    """Route SELECTs in this block to a replica (if configured and not sticky)."""
+    previous = g.get("db_read_replica", False)
+    g.db_read_replica = True
+    try:
+        yield
+    finally:
+        g.db_read_replica = previous
+
+
+def replica_reads(view):
+    """View decorator: the whole view reads from a replica."""
+
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        with read_replica():
+            return view(*args, **kwargs)
+
+    return wrapper
+
+
+def sqlite_path(url: str) -> str:
+    return url.split("sqlite:///", 1)[1]
+
+
+def sync_sqlite_replicas(app) -> list:
+    """
+    Copy the primary SQLite DB over every SQLite replica. Returns the paths.
+    Drops cached catalog pages too: pages rendered from the stale replica
+    after a write would otherwise outlive the sync.
+    """
+    primary = app.config["SQLALCHEMY_DATABASE_URI"]
+    if not primary.startswith("sqlite:///"):
+        raise ValueError("sync_sqlite_replicas only works with a SQLite primary")
+
+    synced = []
+    source = sqlite3.connect(sqlite_path(primary))
+    try:
+        for key, url in app.config.get("SQLALCHEMY_BINDS", {}).items():
+            if not key.startswith(REPLICA_PREFIX) or not url.startswith("sqlite:///"):
+                continue
+            target = sqlite3.connect(sqlite_path(url))
+            try:
+                source.backup(target)
+            finally:
+                target.close()
+            synced.append(sqlite_path(url))
+    finally:
+        source.close()
+
+    if synced:
+        invalidate_catalog()
+    return synced
@@ -0,0 +1,152 @@
+# utils/search.py
+#
+# Full-text product search backed by an SQLite FTS5 index.
+# The index stores name / category / description of ACTIVE products only,
+# keyed by rowid = products.id. Other databases (or an old DB where the
+# index was never built) fall back to the plain ilike search.
+
+import re
+
+from sqlalchemy import text
+
+from models import db
+from models.product import Product
+
+FTS_TABLE = "products_fts"
+
+# prefix='2 3' → extra index entries so "la*" / "lap*" stay cheap
+CREATE_FTS_SQL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} "
+    "USING fts5(name, category, description, "
+    "tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+)
+
+TOKEN_REGEX = re.compile(r"\w+", re.UNICODE)
+
+_index_ready = False
+
+
+# -----------------------------------------------------------
+# INDEX STATE
+# -----------------------------------------------------------
+def is_sqlite() -> bool:
+    return db.engine.dialect.name == "sqlite"
+
+
+def search_index_ready() -> bool:
+    """True when the FTS table exists (only positive results are cached)."""
+    global _index_ready
+
+    if _index_ready:
+        return True
+
+    if not is_sqlite():
+        return False
+
+    found = db.session.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+        {"name": FTS_TABLE},
+    ).first()
+
+    _index_ready = found is not None
+    return _index_ready
+
+
+def create_search_index() -> None:
+    db.session.execute(text(CREATE_FTS_SQL))
+
+
+def rebuild_search_index() -> int:
+    """Drop + refill the index from the products table. Returns rows indexed."""
+    global _index_ready
+
+    db.session.execute(text(f"DROP TABLE IF EXISTS {FTS_TABLE}"))
+    create_search_index()
+    result = db.session.execute(text(
+        f"INSERT INTO {FTS_TABLE} (rowid, name, category, description) "
+        "SELECT id, name, category, COALESCE(description, '') "
+        "FROM products WHERE is_active = 1"
+    ))
+    # merge b-tree segments once after the bulk load
+    db.session.execute(text(f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}) VALUES ('optimize')"))
+    db.session.commit()
+
+    _index_ready = True
+    return result.rowcount
+
+
+# -----------------------------------------------------------
+# SYNC HELPERS (call before commit, product must have an id)
+# -----------------------------------------------------------
+def index_product(product) -> None:
+    if not search_index_ready():
+        return
+
+    remove_product(product)
+
+    if not product.is_active:
+        return
+
+    db.session.execute(
+        text(
+            f"INSERT INTO {FTS_TABLE} (rowid, name, category, description) "
+            "VALUES (:id, :name, :category, :description)"
+        ),
+        {
+            "id": product.id,
+            "name": product.name or "",
+            "category": product.category or "",
+            "description": product.description or "",
+        },
+    )
+
+
+def remove_product(product) -> None:
+    if not search_index_ready():
+        return
+
+    db.session.execute(
+        text(f"DELETE FROM {FTS_TABLE} WHERE rowid = :id"),
+        {"id": product.id},
+    )
+
+
+# -----------------------------------------------------------
+# QUERYING
+# -----------------------------------------------------------
+def build_match_expression(q: str) -> str:
+    """
+    'Lap pro' → '"lap"* "pro"*'
+    Every word is quoted (so user input can't inject FTS syntax) and
+    prefix-matched; words are AND-ed together.
+    """
+    tokens = TOKEN_REGEX.findall(q.lower())
+    return " ".join(f'"{t}"*' for t in tokens)
+
+
+def search_subquery(q: str):
+    """(rowid, rank) of matching products, rank = bm25 (lower is better)."""
+    match = build_match_expression(q)
+
+    return (
+        text(
+            f"SELECT rowid, bm25({FTS_TABLE}, 10.0, 2.0, 1.0) AS rank "
+            f"FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH :match"
+        )
+        .bindparams(match=match)
+        .columns(rowid=db.Integer, rank=db.Float)
+        .subquery("search")
+    )
+
+
+def apply_search(query, q: str):
+    """
+    Restrict a Product query to matches for `q`.
+    Returns (query, rank_column) — rank_column is None on the ilike fallback.
+    """
+    if search_index_ready() and build_match_expression(q):
+        hits = search_subquery(q)
+        return query.join(hits, hits.c.rowid == Product.id), hits.c.rank
+
+    like = f"%{q}%"
+    return query.filter(Product.name.ilike(like)), None
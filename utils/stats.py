@@ -0,0 +1,259 @@
+# utils/stats.py
+#
+# Dashboard statistics.
+#
+# Reads : seller_stats() returns revenue, order counts by status, units
+#         sold, top products and recent (last N days) revenue using one
+#         GROUP BY query per figure. With STATS_ROLLUP_ENABLED they read the
+#         order_stats / order_daily_stats rollups, so the cost depends on
+#         the seller's catalog size, not their order history. Without it
+#         they group the live orders ⋈ products tables.
+#         admin_counts() returns the three admin counters in one statement.
+# Writes: record_order(s) / move_order_status / remove_order keep the rollups
+#         in step. Call them before the commit of the order write, so both
+#         land in one transaction.
+#
+# Revenue uses orders.unit_price (price at order time), falling back to the
+# current product price for orders placed before that column existed.
+# Re-run rebuild_stats.py after turning the rollup on, or after writing
+# orders outside routes/orders.py.
+
+from datetime import datetime, timedelta
+from typing import NamedTuple
+
+from flask import current_app
+from sqlalchemy import delete, func, inspect, select, text, update
+from sqlalchemy.dialects import postgresql, sqlite
+
+from models import db
+from models.order import Order
+from models.order_stat import OrderStat, OrderDailyStat
+from models.product import Product
+from models.user import User
+
+TOP_PRODUCTS = 5
+RECENT_DAYS = 30
+
+
+class TopProduct(NamedTuple):
+    product_id: int
+    name: str
+    units: int
+    revenue: float
+
+
+class SellerStats(NamedTuple):
+    revenue: float
+    order_count: int
+    units: int
+    by_status: dict          # status → order count
+    top_products: list       # [TopProduct], most units first
+    recent_revenue: float    # last RECENT_DAYS days (rollup: whole days)
+
+
+def rollup_enabled() -> bool:
+    return current_app.config.get("STATS_ROLLUP_ENABLED", False)
+
+
+# -----------------------------------------------------------
+# WRITE PATH (rollup maintenance)
+# -----------------------------------------------------------
+def _bump(table, deltas: dict) -> None:
+    """
+    Atomically add deltas to rollup rows (creating / dropping them as needed).
+    deltas: {key tuple of (column, value) pairs: {orders, units, revenue}}
+    """
+    if not deltas:
+        return
+
+    rows = [{**dict(key), **values} for key, values in deltas.items()]
+    key_columns = [c for c, _ in next(iter(deltas))]
+    value_columns = ["orders", "units", "revenue"]
+    dialect = db.session.get_bind().dialect.name
+
+    if dialect in ("sqlite", "postgresql"):
+        # one executemany upsert for every touched row
+        insert = (sqlite if dialect == "sqlite" else postgresql).insert(table)
+        stmt = insert.on_conflict_do_update(
+            index_elements=key_columns,
+            set_={c: table.c[c] + insert.excluded[c] for c in value_columns},
+        )
+        db.session.execute(stmt, rows)
+    else:
+        for row in rows:
+            result = db.session.execute(
+                update(table)
+                .where(*(table.c[k] == row[k] for k in key_columns))
+                .values({c: table.c[c] + row[c] for c in value_columns})
+            )
+            if result.rowcount == 0:
+                db.session.execute(table.insert().values(**row))
+
+    # status moves / deletes leave empty rows behind — drop them
+    for row in rows:
+        if row["orders"] < 0:
+            db.session.execute(
+                delete(table)
+                .where(*(table.c[k] == row[k] for k in key_columns))
+                .where(table.c.orders <= 0)
+            )
+
+
+def _apply(changes) -> None:
+    """changes: iterable of (order, product, status, sign)."""
+    if not rollup_enabled():
+        return
+
+    totals, daily = {}, {}
+
+    for order, product, status, sign in changes:
+        if product is None or product.seller_id is None:
+            continue
+
+        price = order.unit_price if order.unit_price is not None else product.price
+        key = (("seller_id", product.seller_id), ("product_id", product.id), ("status", status))
+        day = (order.created_at or datetime.utcnow()).date()
+
+        for bucket, k in ((totals, key), (daily, key + (("day", day),))):
+            values = bucket.setdefault(k, {"orders": 0, "units": 0, "revenue": 0.0})
+            values["orders"] += sign
+            values["units"] += sign * order.quantity
+            values["revenue"] += sign * order.quantity * price
+
+    _bump(OrderStat.__table__, totals)
+    _bump(OrderDailyStat.__table__, daily)
+
+
+def record_orders(lines) -> None:
+    """New orders were added to the session. lines: iterable of (order, product)."""
+    changes = []
+    for order, product in lines:
+        if order.created_at is None:
+            order.created_at = datetime.utcnow()
+        changes.append((order, product, order.status or "Pending", +1))
+    _apply(changes)
+
+
+def record_order(order, product) -> None:
+    """A new order was added to the session."""
+    record_orders([(order, product)])
+
+
+def move_order_status(order, old_status: str) -> None:
+    """order.status was changed from old_status."""
+    if old_status == order.status:
+        return
+    _apply([
+        (order, order.product, old_status, -1),
+        (order, order.product, order.status, +1),
+    ])
+
+
+def remove_order(order) -> None:
+    """order is about to be deleted."""
+    _apply([(order, order.product, order.status, -1)])
+
+
+def rebuild_order_stats(conn) -> None:
+    """Full recompute of both rollups from orders (migrations / bulk loads)."""
+    # migration 5 runs before orders.unit_price exists (migration 6)
+    columns = {c["name"] for c in inspect(conn).get_columns("orders")}
+    price = "COALESCE(o.unit_price, p.price)" if "unit_price" in columns else "p.price"
+
+    conn.execute(text("DELETE FROM order_daily_stats"))
+    conn.execute(text(
+        "INSERT INTO order_daily_stats (seller_id, day, product_id, status, orders, units, revenue) "
+        "SELECT p.seller_id, date(o.created_at), p.id, o.status, "
+        f"COUNT(*), SUM(o.quantity), SUM(o.quantity * {price}) "
+        "FROM orders o JOIN products p ON p.id = o.product_id "
+        "WHERE p.seller_id IS NOT NULL AND o.created_at IS NOT NULL "
+        "GROUP BY p.seller_id, date(o.created_at), p.id, o.status"
+    ))
+
+    conn.execute(text("DELETE FROM order_stats"))
+    conn.execute(text(
+        "INSERT INTO order_stats (seller_id, product_id, status, orders, units, revenue) "
+        "SELECT seller_id, product_id, status, SUM(orders), SUM(units), SUM(revenue) "
+        "FROM order_daily_stats GROUP BY seller_id, product_id, status"
+    ))
+
+
+# -----------------------------------------------------------
+# READ PATH
+# -----------------------------------------------------------
+def _source(model, seller_id):
+    """Aggregate columns + base query for a rollup model, or the live tables (model=None)."""
+    if model is not None:
+        columns = {
+            "product_id": model.product_id,
+            "status": model.status,
+            "orders": func.sum(model.orders),
+            "units": func.sum(model.units),
+            "revenue": func.sum(model.revenue),
+            "created": getattr(model, "day", None),
+        }
+        return columns, lambda *cols: db.session.query(*cols).filter(model.seller_id == seller_id)
+
+    columns = {
+        "product_id": Order.product_id,
+        "status": Order.status,
+        "orders": func.count(Order.id),
+        "units": func.sum(Order.quantity),
+        "revenue": func.sum(Order.quantity * func.coalesce(Order.unit_price, Product.price)),
+        "created": Order.created_at,
+    }
+    return columns, lambda *cols: (
+        db.session.query(*cols).select_from(Order).join(Order.product).filter(Product.seller_id == seller_id)
+    )
+
+
+def seller_stats(seller_id: int, top: int = TOP_PRODUCTS, recent_days: int = RECENT_DAYS) -> SellerStats:
+    rollup = rollup_enabled()
+    c, query = _source(OrderStat if rollup else None, seller_id)
+
+    # 1) totals by status
+    rows = query(c["status"], c["orders"], c["units"], c["revenue"]).group_by(c["status"]).all()
+
+    by_status = {s: int(n or 0) for s, n, _, _ in rows}
+    total_units = sum(int(u or 0) for _, _, u, _ in rows)
+    total_revenue = sum(float(r or 0) for _, _, _, r in rows)
+
+    # 2) best sellers by units
+    grouped = (
+        query(c["product_id"].label("product_id"), c["units"].label("units"), c["revenue"].label("revenue"))
+        .group_by(c["product_id"])
+        .order_by(c["units"].desc(), c["product_id"])
+        .limit(top)
+        .subquery()
+    )
+    top_rows = (
+        db.session.query(grouped.c.product_id, Product.name, grouped.c.units, grouped.c.revenue)
+        .join(Product, Product.id == grouped.c.product_id)
+        .order_by(grouped.c.units.desc(), grouped.c.product_id)
+        .all()
+    )
+
+    # 3) revenue over the last `recent_days` days (rollup: day-range scan)
+    since = datetime.utcnow() - timedelta(days=recent_days)
+    d, daily = _source(OrderDailyStat if rollup else None, seller_id)
+    cutoff = since.date() if rollup else since
+    recent = daily(d["revenue"]).filter(d["created"] >= cutoff).scalar()
+
+    return SellerStats(
+        revenue=round(total_revenue, 2),
+        order_count=sum(by_status.values()),
+        units=total_units,
+        by_status=by_status,
+        top_products=[TopProduct(pid, name, int(u or 0), float(r or 0)) for pid, name, u, r in top_rows],
+        recent_revenue=round(float(recent or 0), 2),
+    )
+
+
+def admin_counts() -> dict:
+    """Users / products / orders totals in one round trip."""
+    users, products, orders = db.session.execute(select(
+        select(func.count(User.id)).scalar_subquery(),
+        select(func.count(Product.id)).scalar_subquery(),
+        select(func.count(Order.id)).scalar_subquery(),
+    )).one()
+    return {"total_users": users, "total_products": products, "total_orders": orders}
@@ -0,0 +1,32 @@
+# worker.py
+#
+# Background job worker (see utils/jobs.py).
+#
+#   python -m worker            → run until SIGTERM / Ctrl-C
+#   python -m worker --once     → run every ready job, then exit (cron / CI)
+#
+# Run one or more next to the web workers (Procfile `worker:`); they share
+# the jobs table safely, every claim is a single atomic UPDATE.
+
+import argparse
+import logging
+
+from app import create_app
+from utils.jobs import Worker
+
+parser = argparse.ArgumentParser(description="Background job worker")
+parser.add_argument("--once", action="store_true", help="drain the ready jobs and exit")
+args = parser.parse_args()
+
+app = create_app()
+app.logger.setLevel(logging.INFO)
+worker = Worker(app)
+
+if args.once:
+    counts = worker.run_until_empty()
+    print(f"✅ Jobs: {counts['done']} done, {counts['retried']} retried, "
+          f"{counts['superseded']} superseded, {counts['failed']} failed")
+else:
+    print(f"👷 Job worker {worker.name} polling every {worker.poll_interval}s")
+    worker.run_forever()
+    print("👋 Job worker stopped")